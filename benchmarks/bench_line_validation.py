@@ -0,0 +1,97 @@
+# benchmarks/bench_line_validation.py
+"""
+Compara la validación de líneas por celdas (implementación anterior del
+ValidationWorker) con `validate_line_limits` sobre un guion completo.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_line_validation [filas ...]
+"""
+import sys
+import time
+from typing import Dict, List, Set
+
+import numpy as np
+import pandas as pd
+
+from guion_editor import constants_logic as C
+from guion_editor.models.validation_status import validate_line_limits
+
+DEFAULT_SIZES = (1_000, 10_000, 50_000)
+
+
+def make_script(num_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Guion sintético: bloques de 1-4 intervenciones simultáneas con 1-4 líneas cada una."""
+    rng = np.random.default_rng(seed)
+    group_of_row = np.cumsum(rng.random(num_rows) < 0.4)
+    frames_in = group_of_row * 50
+    to_tc = lambda f: f"{f // 90000:02d}:{f // 1500 % 60:02d}:{f // 25 % 60:02d}:{f % 25:02d}"
+    in_tc = [to_tc(int(f)) for f in frames_in]
+    out_tc = [to_tc(int(f) + 40) for f in frames_in]
+    characters = rng.choice(["ANA", "JON", "MIREN", "PELLO"], num_rows)
+    lines = rng.integers(1, 5, num_rows)
+    dialogo = ["\n".join(["texto"] * int(n)) for n in lines]
+    euskera = ["" if n == 1 else "\n".join(["testua"] * int(n - 1)) for n in lines]
+    return pd.DataFrame({C.COL_IN: in_tc, C.COL_OUT: out_tc, C.COL_PERSONAJE: characters,
+                         C.COL_DIALOGO: dialogo, C.COL_EUSKERA: euskera})
+
+
+def legacy_errors(df: pd.DataFrame, col_to_check: str) -> np.ndarray:
+    """Implementación anterior: groupby en Python y lectura celda a celda con df.at."""
+    errors = np.zeros(len(df), dtype=bool)
+    timed = df[(df[C.COL_IN] != C.DEFAULT_TIMECODE) | (df[C.COL_OUT] != C.DEFAULT_TIMECODE)]
+    for _, group_df in timed.groupby([C.COL_IN, C.COL_OUT]):
+        group_indices = group_df.index.tolist()
+        total_lines = 0
+        lines_per_char: Dict[str, int] = {}
+        rows_per_char: Dict[str, List[int]] = {}
+        group_errors: Set[int] = set()
+        for idx in group_indices:
+            text = str(df.at[idx, col_to_check])
+            char = str(df.at[idx, C.COL_PERSONAJE])
+            line_count = (text.count('\n') + 1) if text.strip() else 0
+            total_lines += line_count
+            lines_per_char[char] = lines_per_char.get(char, 0) + line_count
+            rows_per_char.setdefault(char, []).append(idx)
+        character_error = False
+        for char, count in lines_per_char.items():
+            if count >= 6:
+                character_error = True
+                group_errors.update(rows_per_char[char])
+        if not character_error and total_lines >= 11:
+            group_errors.update(group_indices)
+        errors[list(group_errors)] = True
+    return errors
+
+
+def vectorized_errors(df: pd.DataFrame, col_to_check: str) -> np.ndarray:
+    errors = np.zeros(len(df), dtype=bool)
+    timed = ((df[C.COL_IN] != C.DEFAULT_TIMECODE) | (df[C.COL_OUT] != C.DEFAULT_TIMECODE)).to_numpy()
+    group_codes = df.groupby([C.COL_IN, C.COL_OUT], sort=False).ngroup().to_numpy()[timed]
+    errors[timed] = validate_line_limits(group_codes, df[C.COL_PERSONAJE].to_numpy()[timed],
+                                         df[col_to_check].to_numpy()[timed])
+    return errors
+
+
+def best_time(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes) -> None:
+    print(f"{'filas':>8} {'anterior (s)':>14} {'vectorizada (s)':>16} {'x':>7}")
+    for num_rows in sizes:
+        df = make_script(num_rows)
+        for col in (C.COL_DIALOGO, C.COL_EUSKERA):
+            assert np.array_equal(legacy_errors(df, col), vectorized_errors(df, col)), col
+        run = lambda fn: [fn(df, col) for col in (C.COL_DIALOGO, C.COL_EUSKERA)]
+        legacy = best_time(lambda: run(legacy_errors), repeat=1 if num_rows > 10_000 else 3)
+        vectorized = best_time(lambda: run(vectorized_errors))
+        print(f"{num_rows:>8} {legacy:>14.3f} {vectorized:>16.3f} {legacy / vectorized:>7.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Any, List, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from PyQt6.QtCore import Qt, QModelIndex
 from PyQt6.QtGui import QUndoCommand
@@ -11,7 +12,7 @@ from PyQt6.QtWidgets import QAbstractItemView, QMessageBox
 if TYPE_CHECKING:
     from guion_editor.widgets.table_window import TableWindow
 
-from guion_editor.utils.dialog_utils import tc_to_frames, frames_to_tc
+from guion_editor.utils.timecode import frames_to_tc, frames_to_tc_array, parse_tc_array
 from guion_editor import constants_logic as C
 
 class EditCommand(QUndoCommand):
@@ -26,9 +27,7 @@ class EditCommand(QUndoCommand):
         self.setText(f"Editar '{df_col_name}' en fila {self.df_row_idx + 1}")
 
     def _apply_value(self, value_to_apply: Any):
-        model_idx = self.tw.pandas_model.index(self.df_row_idx, self.view_col_idx)
-        if model_idx.isValid():
-            self.tw.pandas_model.setData(model_idx, value_to_apply, Qt.ItemDataRole.EditRole)
+        self.tw.pandas_model.set_cell_data(self.df_row_idx, self.view_col_idx, value_to_apply)
 
     def undo(self):
         self._apply_value(self.old_value)
@@ -39,6 +38,48 @@ class EditCommand(QUndoCommand):
         self.tw.set_unsaved_changes(True)
 
 
+class BulkColumnEditCommand(QUndoCommand):
+    """
+    Edición en bloque de una o varias columnas. Por columna guarda las filas tocadas y sus
+    valores antiguos y nuevos; redo/undo asignan cada columna de una vez (set_column_values)
+    dentro de un único lote de notificaciones.
+    """
+    def __init__(self, table_window: 'TableWindow', changes: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]], text: str):
+        super().__init__(text)
+        self.tw = table_window
+        self.changes = changes
+
+    @classmethod
+    def from_new_values(cls, table_window: 'TableWindow', new_columns: Dict[str, Any], text: str) -> Optional['BulkColumnEditCommand']:
+        """Compara columnas completas con los valores actuales y se queda solo con las filas que cambian (None si ninguna)."""
+        changes = {}
+        for df_col_name, new_values in new_columns.items():
+            old_values = table_window.pandas_model.get_column_values(df_col_name)
+            new_values = np.asarray(new_values, dtype=object)
+            rows = np.flatnonzero(old_values != new_values)
+            if rows.size:
+                changes[df_col_name] = (rows, old_values[rows].copy(), new_values[rows])
+        return cls(table_window, changes, text) if changes else None
+
+    def changed_cell_count(self) -> int:
+        return sum(len(rows) for rows, _, _ in self.changes.values())
+
+    def _apply(self, use_new: bool):
+        model = self.tw.pandas_model
+        with model.batch_changes():
+            for df_col_name, (rows, old_values, new_values) in self.changes.items():
+                model.set_column_values(df_col_name, new_values if use_new else old_values, rows)
+        self.tw.set_unsaved_changes(True)
+        if C.COL_PERSONAJE in self.changes:
+            self.tw.update_character_completer_and_notify()
+
+    def redo(self):
+        self._apply(True)
+
+    def undo(self):
+        self._apply(False)
+
+
 class AddRowCommand(QUndoCommand):
     def __init__(self, table_window: 'TableWindow', view_row_insert_at: int, df_row_insert_at: int):
         super().__init__()
@@ -50,20 +91,18 @@ class AddRowCommand(QUndoCommand):
         self.setText("Agregar fila")
 
     def redo(self):
-        self.new_row_id = self.tw.pandas_model.get_next_id()
-        current_df = self.tw.pandas_model.dataframe()
+        model = self.tw.pandas_model
+        self.new_row_id = model.get_next_id()
+        num_rows = model.df_row_count()
         scene, char = ("1" if not self.tw.has_scene_numbers() else ""), ""
-        if 0 < self.df_row_insert_at <= len(current_df):
+        if 0 < self.df_row_insert_at <= num_rows:
             prev_df_idx = self.df_row_insert_at - 1
-            scene = str(current_df.at[prev_df_idx, C.COL_SCENE])
-            char = str(current_df.at[prev_df_idx, C.COL_PERSONAJE])
-        elif not current_df.empty and self.df_row_insert_at == len(current_df):
-            last_df_idx = len(current_df) - 1
-            scene = str(current_df.at[last_df_idx, C.COL_SCENE])
-            char = str(current_df.at[last_df_idx, C.COL_PERSONAJE])
+            scene = model.get_value(prev_df_idx, C.COL_SCENE)
+            char = model.get_value(prev_df_idx, C.COL_PERSONAJE)
 
         self.new_row_data = {C.COL_ID: self.new_row_id, C.COL_SCENE: scene, C.COL_IN: C.DEFAULT_TIMECODE, C.COL_OUT: C.DEFAULT_TIMECODE, C.COL_PERSONAJE: char, C.COL_DIALOGO: '', C.COL_EUSKERA: ''}
         self.tw.pandas_model.insert_row_data(self.df_row_insert_at, self.new_row_data)
+        self.tw.pandas_model.ensure_rows_fetched(self.view_row_insert_at)
         self.tw.table_view.selectRow(self.view_row_insert_at)
         idx_to_scroll = self.tw.pandas_model.index(self.view_row_insert_at, 0)
         if idx_to_scroll.isValid():
@@ -78,7 +117,7 @@ class AddRowCommand(QUndoCommand):
         idx_to_remove = self.tw.pandas_model.find_df_index_by_id(self.new_row_id)
         if idx_to_remove is None:
             idx_to_remove = self.df_row_insert_at
-        if idx_to_remove is not None and 0 <= idx_to_remove < self.tw.pandas_model.rowCount():
+        if idx_to_remove is not None and 0 <= idx_to_remove < self.tw.pandas_model.df_row_count():
             self.tw.pandas_model.remove_row_by_df_index(idx_to_remove)
         self.tw.set_unsaved_changes(True)
         self.tw.update_character_completer_and_notify()
@@ -89,21 +128,18 @@ class RemoveRowsCommand(QUndoCommand):
         super().__init__()
         self.tw = table_window
         self.df_indices = sorted(df_indices_to_remove)
-        self.removed_data_list: List[Tuple[int, pd.Series]] = []
+        self.removed_data_list: List[Tuple[int, Dict[str, Any]]] = []
         self.setText(f"Eliminar {len(self.df_indices)} fila(s)")
 
     def redo(self):
-        self.removed_data_list.clear()
-        for df_idx in sorted(self.df_indices, reverse=True):
-            removed_series = self.tw.pandas_model.remove_row_by_df_index(df_idx)
-            if removed_series is not None:
-                self.removed_data_list.insert(0, (df_idx, removed_series))
+        self.removed_data_list = self.tw.pandas_model.remove_rows(self.df_indices)
         self.tw.set_unsaved_changes(True)
         self.tw.update_character_completer_and_notify()
 
     def undo(self):
-        for original_df_idx, row_data_series in sorted(self.removed_data_list, key=lambda x: x[0]):
-            self.tw.pandas_model.insert_row_data(original_df_idx, row_data_series.to_dict())
+        if self.removed_data_list:
+            positions, rows = zip(*self.removed_data_list)
+            self.tw.pandas_model.insert_rows(list(positions), list(rows))
         self.tw.set_unsaved_changes(True)
         self.tw.update_character_completer_and_notify()
 
@@ -145,9 +181,9 @@ class SplitInterventionCommand(QUndoCommand):
         self.setText(f"Separar '{self.df_column_name_to_split}' en fila {df_idx_split + 1}")
 
     def redo(self):
-        current_df = self.tw.pandas_model.dataframe()
-        if not (0 <= self.df_idx_split < len(current_df)):
-            logging.warning(f"SplitInterventionCommand.redo: df_idx_split ({self.df_idx_split}) out of bounds for df len ({len(current_df)})")
+        num_rows = self.tw.pandas_model.df_row_count()
+        if not (0 <= self.df_idx_split < num_rows):
+            logging.warning(f"SplitInterventionCommand.redo: df_idx_split ({self.df_idx_split}) out of bounds for df len ({num_rows})")
             return
 
         self.new_row_id = self.tw.pandas_model.get_next_id()
@@ -157,7 +193,7 @@ class SplitInterventionCommand(QUndoCommand):
             logging.warning(f"SplitInterventionCommand.redo: Columna '{self.df_column_name_to_split}' no encontrada en el mapeo del modelo.")
             return
 
-        original_row_data_for_new_row = current_df.iloc[self.df_idx_split].copy().to_dict()
+        original_row_data_for_new_row = self.tw.pandas_model.get_row_data(self.df_idx_split)
 
         self.tw.pandas_model.setData(
             self.tw.pandas_model.index(self.df_idx_split, target_col_view_idx),
@@ -207,7 +243,7 @@ class SplitInterventionCommand(QUndoCommand):
             idx_to_remove = self.df_idx_split + 1
             logging.warning(f"SplitInterventionCommand.undo: Could not find row by ID {self.new_row_id}, attempting to remove at index {idx_to_remove}.")
 
-        if idx_to_remove is not None and 0 <= idx_to_remove < self.tw.pandas_model.rowCount():
+        if idx_to_remove is not None and 0 <= idx_to_remove < self.tw.pandas_model.df_row_count():
             self.tw.pandas_model.remove_row_by_df_index(idx_to_remove)
         else:
             logging.warning(f"SplitInterventionCommand.undo: Row to remove (ID {self.new_row_id} or index {idx_to_remove}) not found or index invalid.")
@@ -242,21 +278,22 @@ class MergeInterventionsCommand(QUndoCommand):
         self.setText(f"Juntar filas {df_idx_first_row + 1} y {df_idx_first_row + 2}")
 
     def redo(self):
-        current_df = self.tw.pandas_model.dataframe()
+        model = self.tw.pandas_model
+        num_rows = model.df_row_count()
         df_idx_actual_second_row_to_merge = self.df_idx1 + 1
 
-        if not (0 <= self.df_idx1 < len(current_df) and \
-                0 <= df_idx_actual_second_row_to_merge < len(current_df)):
-            logging.warning(f"MergeCommand.redo: Indices out of bounds. df_idx1={self.df_idx1}, actual_second_idx={df_idx_actual_second_row_to_merge}, df_len={len(current_df)}")
+        if not (0 <= self.df_idx1 < num_rows and \
+                0 <= df_idx_actual_second_row_to_merge < num_rows):
+            logging.warning(f"MergeCommand.redo: Indices out of bounds. df_idx1={self.df_idx1}, actual_second_idx={df_idx_actual_second_row_to_merge}, df_len={num_rows}")
             return
 
         if self.orig_dlg1 is None:
-            self.orig_dlg1 = str(current_df.at[self.df_idx1, C.COL_DIALOGO])
+            self.orig_dlg1 = model.get_value(self.df_idx1, C.COL_DIALOGO)
         if self.orig_eusk1 is None:
-            self.orig_eusk1 = str(current_df.at[self.df_idx1, C.COL_EUSKERA])
+            self.orig_eusk1 = model.get_value(self.df_idx1, C.COL_EUSKERA)
 
         if self.data_df_idx2 is None:
-            self.data_df_idx2 = current_df.iloc[df_idx_actual_second_row_to_merge].copy()
+            self.data_df_idx2 = pd.Series(model.get_row_data(df_idx_actual_second_row_to_merge), dtype=object)
 
         view_col_dlg = self.tw.pandas_model.get_view_column_index(C.COL_DIALOGO)
         view_col_eusk = self.tw.pandas_model.get_view_column_index(C.COL_EUSKERA)
@@ -311,65 +348,54 @@ class MergeInterventionsCommand(QUndoCommand):
         self.tw.request_resize_rows_to_contents_deferred()
 
 
-class ChangeSceneCommand(QUndoCommand):
+class ChangeSceneCommand(BulkColumnEditCommand):
     def __init__(self, table_window: 'TableWindow', df_start_idx: int):
-        super().__init__()
-        self.tw = table_window
+        super().__init__(table_window, {}, f"Incrementar escena desde fila {df_start_idx + 1}")
         self.df_start_idx = df_start_idx
-        self.old_scenes_map: Dict[int, str] = {}
-        self.setText(f"Incrementar escena desde fila {df_start_idx + 1}")
 
-    def _apply_scenes(self, scene_map: Dict[int, str], select_row: Optional[int]):
-        view_col_scene = self.tw.pandas_model.get_view_column_index(C.COL_SCENE)
-        if view_col_scene is None:
-            return
-        for df_idx, scene_val in scene_map.items():
-            if 0 <= df_idx < self.tw.pandas_model.rowCount():
-                self.tw.pandas_model.setData(self.tw.pandas_model.index(df_idx, view_col_scene), scene_val, Qt.ItemDataRole.EditRole)
-        if select_row is not None and 0 <= select_row < self.tw.pandas_model.rowCount():
+    def _apply_scenes(self, use_new: bool):
+        self._apply(use_new)
+        select_row = self.df_start_idx
+        if 0 <= select_row < self.tw.pandas_model.df_row_count():
+            self.tw.pandas_model.ensure_rows_fetched(select_row)
             self.tw.table_view.selectRow(select_row)
             idx_to_scroll = self.tw.pandas_model.index(select_row, 0)
             if idx_to_scroll.isValid():
                 self.tw.table_view.scrollTo(idx_to_scroll, QAbstractItemView.ScrollHint.EnsureVisible)
-        self.tw.set_unsaved_changes(True)
 
     def redo(self):
-        current_df = self.tw.pandas_model.dataframe()
-        if not (0 <= self.df_start_idx < len(current_df)):
+        if self.changes:
+            self._apply_scenes(True)
+            return
+
+        scenes = self.tw.pandas_model.get_column_values(C.COL_SCENE)
+        if not (0 <= self.df_start_idx < len(scenes)):
             self.setText(f"Incrementar escena (fila {self.df_start_idx+1} inválida)")
             return
 
-        for df_idx in range(self.df_start_idx, len(current_df)):
-            scene_val_str = str(current_df.at[df_idx, C.COL_SCENE]).strip()
-            try:
-                int(scene_val_str)
-            except ValueError:
-                QMessageBox.warning(self.tw, "Cambiar Escena",
-                                    f"El valor de escena en la fila {df_idx + 1} ('{scene_val_str}') "
-                                    "no es un número simple. No se puede autoincrementar en bloque. "
-                                    "Todas las escenas desde la seleccionada deben ser numéricas.")
-                self.setText("Incrementar escena (escena no numérica encontrada)")
-                return
-
-        self.old_scenes_map.clear()
-        new_scenes_map_for_redo: Dict[int, str] = {}
-
-        for df_idx in range(self.df_start_idx, len(current_df)):
-            original_scene_str = str(current_df.at[df_idx, C.COL_SCENE])
-            self.old_scenes_map[df_idx] = original_scene_str
-
-            scene_num = int(original_scene_str.strip())
-            new_scene_val = str(scene_num + 1)
-            new_scenes_map_for_redo[df_idx] = new_scene_val
-
-        self._apply_scenes(new_scenes_map_for_redo, self.df_start_idx)
+        old_scenes = scenes[self.df_start_idx:].copy()
+        stripped = pd.Series(old_scenes, dtype=object).str.strip()
+        is_numeric = stripped.str.fullmatch(r'[+-]?\d+').to_numpy(dtype=bool)
+        if not is_numeric.all():
+            first_bad = int(np.argmin(is_numeric))
+            QMessageBox.warning(self.tw, "Cambiar Escena",
+                                f"El valor de escena en la fila {self.df_start_idx + first_bad + 1} ('{stripped.iloc[first_bad]}') "
+                                "no es un número simple. No se puede autoincrementar en bloque. "
+                                "Todas las escenas desde la seleccionada deben ser numéricas.")
+            self.setText("Incrementar escena (escena no numérica encontrada)")
+            return
+
+        rows = np.arange(self.df_start_idx, len(scenes))
+        new_scenes = (stripped.astype(np.int64) + 1).astype(str).to_numpy(dtype=object)
+        self.changes = {C.COL_SCENE: (rows, old_scenes, new_scenes)}
+        self._apply_scenes(True)
         self.setText(f"Incrementar escenas desde fila {self.df_start_idx + 1}")
 
     def undo(self):
-        if not self.old_scenes_map:
+        if not self.changes:
             self.setText(f"Incrementar escena (sin datos para undo)")
             return
-        self._apply_scenes(self.old_scenes_map, self.df_start_idx)
+        self._apply_scenes(False)
 
 
 class HeaderEditCommand(QUndoCommand):
@@ -399,8 +425,8 @@ class ToggleBookmarkCommand(QUndoCommand):
         self.original_states: Dict[int, bool] = {}
 
         for df_idx in self.df_indices:
-            if 0 <= df_idx < self.tw.pandas_model.rowCount():
-                self.original_states[df_idx] = self.tw.pandas_model.dataframe().at[df_idx, C.COL_BOOKMARK]
+            if 0 <= df_idx < self.tw.pandas_model.df_row_count():
+                self.original_states[df_idx] = self.tw.pandas_model.get_value(df_idx, C.COL_BOOKMARK)
         
         self.setText(f"Marcar/Desmarcar {len(self.df_indices)} fila(s)")
 
@@ -411,13 +437,15 @@ class ToggleBookmarkCommand(QUndoCommand):
             self.tw.pandas_model.setData(model_idx, is_bookmarked, Qt.ItemDataRole.EditRole)
 
     def redo(self):
-        for df_idx, original_state in self.original_states.items():
-            self._set_bookmark_state(not original_state, df_idx)
+        with self.tw.pandas_model.batch_changes():
+            for df_idx, original_state in self.original_states.items():
+                self._set_bookmark_state(not original_state, df_idx)
         self.tw.set_unsaved_changes(True)
 
     def undo(self):
-        for df_idx, original_state in self.original_states.items():
-            self._set_bookmark_state(original_state, df_idx)
+        with self.tw.pandas_model.batch_changes():
+            for df_idx, original_state in self.original_states.items():
+                self._set_bookmark_state(original_state, df_idx)
         self.tw.set_unsaved_changes(True)
 
 class UpdateMultipleCharactersCommand(QUndoCommand):
@@ -426,7 +454,8 @@ class UpdateMultipleCharactersCommand(QUndoCommand):
         self.tw = table_window
         self.old_names_list = old_names_list
         self.new_name = new_name
-        self.original_series: Optional[pd.Series] = None
+        self.original_rows: Optional[np.ndarray] = None
+        self.original_values: Optional[np.ndarray] = None
         
         text = f"Unificar personajes a '{self.new_name}'"
         if len(self.old_names_list) == 1:
@@ -435,48 +464,22 @@ class UpdateMultipleCharactersCommand(QUndoCommand):
 
     def redo(self):
         model = self.tw.pandas_model
-        df = model.dataframe()
+        characters = model.get_column_values(C.COL_PERSONAJE)
         
-        mask = df[C.COL_PERSONAJE].astype(str).str.strip().isin(self.old_names_list)
+        mask = pd.Series(characters, dtype=object).str.strip().isin(self.old_names_list).to_numpy()
         if not mask.any(): return
 
-        if self.original_series is None:
-            self.original_series = df.loc[mask, C.COL_PERSONAJE].copy()
-
-        view_col_char = model.get_view_column_index(C.COL_PERSONAJE)
-        if view_col_char is None:
-            df.loc[mask, C.COL_PERSONAJE] = self.new_name
-            model.layoutChanged.emit() # Fallback
-            self.tw.set_unsaved_changes(True)
-            return
+        if self.original_rows is None:
+            self.original_rows = np.flatnonzero(mask)
+            self.original_values = characters[self.original_rows].copy()
 
-        df.loc[mask, C.COL_PERSONAJE] = self.new_name
-        
-        for df_idx in self.original_series.index:
-            model_idx = model.index(df_idx, view_col_char)
-            model.dataChanged.emit(model_idx, model_idx, [Qt.ItemDataRole.EditRole])
-        
+        model.set_column_values(C.COL_PERSONAJE, self.new_name, self.original_rows)
         self.tw.set_unsaved_changes(True)
 
     def undo(self):
-        if self.original_series is None or self.original_series.empty: return
-
-        model = self.tw.pandas_model
-        df = model.dataframe()
+        if self.original_rows is None or self.original_rows.size == 0: return
 
-        view_col_char = model.get_view_column_index(C.COL_PERSONAJE)
-        if view_col_char is None:
-            df.loc[self.original_series.index, C.COL_PERSONAJE] = self.original_series
-            model.layoutChanged.emit() # Fallback
-            self.tw.set_unsaved_changes(True)
-            return
-
-        df.loc[self.original_series.index, C.COL_PERSONAJE] = self.original_series
-        
-        for df_idx in self.original_series.index:
-            model_idx = model.index(df_idx, view_col_char)
-            model.dataChanged.emit(model_idx, model_idx, [Qt.ItemDataRole.EditRole])
-        
+        self.tw.pandas_model.set_column_values(C.COL_PERSONAJE, self.original_values, self.original_rows)
         self.tw.set_unsaved_changes(True)
 
 class SplitCharacterCommand(QUndoCommand):
@@ -494,9 +497,8 @@ class SplitCharacterCommand(QUndoCommand):
 
     def redo(self):
         model = self.tw.pandas_model
-        df = model.dataframe()
         
-        indices_to_split = df[df[C.COL_PERSONAJE] == self.old_name].index.tolist()
+        indices_to_split = np.flatnonzero(model.get_column_values(C.COL_PERSONAJE) == self.old_name).tolist()
         
         if not indices_to_split: return
 
@@ -505,22 +507,22 @@ class SplitCharacterCommand(QUndoCommand):
 
         if not self.original_rows_data:
             for df_idx in indices_to_split:
-                self.original_rows_data[df_idx] = df.iloc[df_idx].copy()
+                self.original_rows_data[df_idx] = pd.Series(model.get_row_data(df_idx), dtype=object)
 
         self.added_row_ids.clear()
 
-        for df_idx in reversed(indices_to_split):
-            model.setData(model.index(df_idx, view_col_char), self.new_name1, Qt.ItemDataRole.EditRole)
-            
-            original_row_data = df.iloc[df_idx].to_dict()
-            new_row_data = original_row_data.copy()
+        new_rows = []
+        first_new_id = model.get_next_id()
+        for k, df_idx in enumerate(indices_to_split):
+            new_row_data = model.get_row_data(df_idx)
             new_row_data[C.COL_PERSONAJE] = self.new_name2
-            
-            new_id = model.get_next_id()
-            new_row_data[C.COL_ID] = new_id
-            self.added_row_ids.append(new_id)
-            
-            model.insert_row_data(df_idx + 1, new_row_data)
+            new_row_data[C.COL_ID] = first_new_id + k
+            self.added_row_ids.append(first_new_id + k)
+            new_rows.append(new_row_data)
+
+        model.set_column_values(C.COL_PERSONAJE, self.new_name1, indices_to_split)
+        # Cada fila nueva queda justo debajo de su original: posición final idx + 1 + k
+        model.insert_rows([df_idx + 1 + k for k, df_idx in enumerate(indices_to_split)], new_rows)
 
         self.tw.set_unsaved_changes(True)
 
@@ -529,31 +531,28 @@ class SplitCharacterCommand(QUndoCommand):
 
         model = self.tw.pandas_model
         
-        for row_id in self.added_row_ids:
-            df_idx_to_remove = model.find_df_index_by_id(row_id)
-            if df_idx_to_remove is not None:
-                model.remove_row_by_df_index(df_idx_to_remove)
+        rows_to_remove = [model.find_df_index_by_id(row_id) for row_id in self.added_row_ids]
+        model.remove_rows([idx for idx in rows_to_remove if idx is not None])
         
-        view_col_char = model.get_view_column_index(C.COL_PERSONAJE)
-        if view_col_char is not None:
-            for df_idx in self.original_rows_data.keys():
-                if 0 <= df_idx < model.rowCount():
-                    model.setData(model.index(df_idx, view_col_char), self.old_name, Qt.ItemDataRole.EditRole)
+        original_indices = [idx for idx in self.original_rows_data.keys() if 0 <= idx < model.df_row_count()]
+        if original_indices:
+            model.set_column_values(C.COL_PERSONAJE, self.old_name, original_indices)
 
         self.tw.set_unsaved_changes(True)
 
+
 class TrimAllCharactersCommand(QUndoCommand):
     def __init__(self, table_window: 'TableWindow'):
         super().__init__("Limpiar nombres (Espacios y paréntesis)")
         self.tw = table_window
-        self.original_series: Optional[pd.Series] = None
+        self.original_rows: Optional[np.ndarray] = None
+        self.original_values: Optional[np.ndarray] = None
 
     def redo(self):
         model = self.tw.pandas_model
-        df = model.dataframe()
         
         # Obtenemos la serie como texto
-        current_series = df[C.COL_PERSONAJE].astype(str)
+        current_series = pd.Series(model.get_column_values(C.COL_PERSONAJE), dtype=object)
         
         # --- LÓGICA DE LIMPIEZA VECTORIZADA (Pandas) ---
         # 1. str.replace con regex=True elimina ' (CONT'D)', ' (O.S.)', etc.
@@ -562,49 +561,28 @@ class TrimAllCharactersCommand(QUndoCommand):
         # -----------------------------------------------
 
         # Detectamos qué filas cambian realmente
-        mask = current_series != cleaned_series
+        mask = (current_series != cleaned_series).to_numpy()
         
         if not mask.any(): 
             return
             
         # Guardamos el estado original para el UNDO (solo la primera vez)
-        if self.original_series is None:
-            self.original_series = df.loc[mask, C.COL_PERSONAJE].copy()
+        if self.original_rows is None:
+            self.original_rows = np.flatnonzero(mask)
+            self.original_values = current_series.to_numpy()[self.original_rows].copy()
             
-        view_col_char = model.get_view_column_index(C.COL_PERSONAJE)
-        
-        # Aplicamos los cambios al DataFrame Real
-        df.loc[mask, C.COL_PERSONAJE] = cleaned_series[mask]
-        
-        # Si tenemos la columna visual, notificamos fila por fila para actualizar la UI
-        if view_col_char is not None:
-            for df_idx in self.original_series.index:
-                model_idx = model.index(df_idx, view_col_char)
-                model.dataChanged.emit(model_idx, model_idx, [Qt.ItemDataRole.EditRole])
-        else:
-            # Fallback si no hay columna visual (raro)
-            model.layoutChanged.emit()
+        # Aplicamos los cambios en bloque (una sola notificación al modelo)
+        model.set_column_values(C.COL_PERSONAJE, cleaned_series.to_numpy()[self.original_rows], self.original_rows)
 
         self.tw.set_unsaved_changes(True)
         # Esto fuerza a la ventana de Reparto a recalcularse
         self.tw.update_character_completer_and_notify()
 
     def undo(self):
-        if self.original_series is None or self.original_series.empty: return
-
-        model = self.tw.pandas_model
-        df = model.dataframe()
+        if self.original_rows is None or self.original_rows.size == 0: return
 
         # Restauramos los valores originales
-        df.loc[self.original_series.index, C.COL_PERSONAJE] = self.original_series
-        
-        view_col_char = model.get_view_column_index(C.COL_PERSONAJE)
-        if view_col_char is not None:
-            for df_idx in self.original_series.index:
-                model_idx = model.index(df_idx, view_col_char)
-                model.dataChanged.emit(model_idx, model_idx, [Qt.ItemDataRole.EditRole])
-        else:
-            model.layoutChanged.emit()
+        self.tw.pandas_model.set_column_values(C.COL_PERSONAJE, self.original_values, self.original_rows)
         
         self.tw.set_unsaved_changes(True)
         self.tw.update_character_completer_and_notify()
@@ -616,8 +594,6 @@ class ShiftTimecodesCommand(QUndoCommand):
         self.fps = fps
         self.offset_frames = offset_frames
         self.sign = sign
-        self.original_in_series: Optional[pd.Series] = None
-        self.original_out_series: Optional[pd.Series] = None
         
         operation_text = "Adelantar" if sign == 1 else "Retrasar"
         offset_tc = frames_to_tc(offset_frames, fps)
@@ -625,30 +601,16 @@ class ShiftTimecodesCommand(QUndoCommand):
 
     def _shift_and_notify(self, reverse=False):
         model = self.tw.pandas_model
-        df = model.dataframe()
-
-        def shift_cell(tc_value: str) -> str:
-            if pd.isna(tc_value) or str(tc_value).strip() == "": return ""
-            original_frames = tc_to_frames(tc_value, self.fps)
-            if original_frames is None: return tc_value
-            
-            current_sign = -self.sign if reverse else self.sign
-            new_frames = original_frames + (current_sign * self.offset_frames)
-            return frames_to_tc(new_frames, self.fps)
-
-        df[C.COL_IN] = df[C.COL_IN].apply(shift_cell)
-        df[C.COL_OUT] = df[C.COL_OUT].apply(shift_cell)
-
-        view_col_in = model.get_view_column_index(C.COL_IN)
-        view_col_out = model.get_view_column_index(C.COL_OUT)
-        if view_col_in is None or view_col_out is None or model.rowCount() == 0:
-            model.layoutChanged.emit() # Fallback
-            self.tw.set_unsaved_changes(True)
-            return
-
-        top_left_index = model.index(0, min(view_col_in, view_col_out))
-        bottom_right_index = model.index(model.rowCount() - 1, max(view_col_in, view_col_out))
-        model.dataChanged.emit(top_left_index, bottom_right_index, [Qt.ItemDataRole.EditRole])
+        if model.df_row_count() == 0: return
+
+        offset = (-self.sign if reverse else self.sign) * self.offset_frames
+        for col_name in (C.COL_IN, C.COL_OUT):
+            # Los timecodes no válidos (o vacíos) se quedan como están
+            shifted = model.get_column_values(col_name).copy()
+            frames, _ = parse_tc_array(shifted, self.fps)
+            valid = frames >= 0
+            shifted[valid] = frames_to_tc_array(frames[valid] + offset, self.fps)
+            model.set_column_values(col_name, shifted)
         self.tw.set_unsaved_changes(True)
 
     def redo(self):
@@ -662,41 +624,22 @@ class ResetScenesCommand(QUndoCommand):
     def __init__(self, table_window: 'TableWindow'):
         super().__init__("Reiniciar todas las escenas a '1'")
         self.tw = table_window
-        self.original_scenes: Optional[pd.Series] = None
+        self.original_scenes: Optional[np.ndarray] = None
 
     def redo(self):
         model = self.tw.pandas_model
-        df = model.dataframe()
-        if df.empty: return
+        if model.df_row_count() == 0: return
 
         if self.original_scenes is None:
-            self.original_scenes = df[C.COL_SCENE].copy()
+            self.original_scenes = model.get_column_values(C.COL_SCENE).copy()
             
-        df[C.COL_SCENE] = "1"
-        
-        view_col_scene = model.get_view_column_index(C.COL_SCENE)
-        if view_col_scene is None or model.rowCount() == 0:
-            model.layoutChanged.emit() # Fallback
-        else:
-            top_left = model.index(0, view_col_scene)
-            bottom_right = model.index(model.rowCount() - 1, view_col_scene)
-            model.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.EditRole])
+        model.set_column_values(C.COL_SCENE, "1")
         self.tw.set_unsaved_changes(True)
 
     def undo(self):
         if self.original_scenes is None: return
 
-        model = self.tw.pandas_model
-        df = model.dataframe()
-        df[C.COL_SCENE] = self.original_scenes
-        
-        view_col_scene = model.get_view_column_index(C.COL_SCENE)
-        if view_col_scene is None or model.rowCount() == 0:
-            model.layoutChanged.emit() # Fallback
-        else:
-            top_left = model.index(0, view_col_scene)
-            bottom_right = model.index(model.rowCount() - 1, view_col_scene)
-            model.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.EditRole])
+        self.tw.pandas_model.set_column_values(C.COL_SCENE, self.original_scenes)
         self.tw.set_unsaved_changes(True)
 
 
@@ -704,90 +647,50 @@ class ResetTimecodesCommand(QUndoCommand):
     def __init__(self, table_window: 'TableWindow'):
         super().__init__("Reiniciar todos los IN/OUT a cero")
         self.tw = table_window
-        self.original_ins: Optional[pd.Series] = None
-        self.original_outs: Optional[pd.Series] = None
+        self.original_ins: Optional[np.ndarray] = None
+        self.original_outs: Optional[np.ndarray] = None
 
     def redo(self):
         model = self.tw.pandas_model
-        df = model.dataframe()
-        if df.empty: return
+        if model.df_row_count() == 0: return
 
-        if self.original_ins is None: self.original_ins = df[C.COL_IN].copy()
-        if self.original_outs is None: self.original_outs = df[C.COL_OUT].copy()
+        if self.original_ins is None: self.original_ins = model.get_column_values(C.COL_IN).copy()
+        if self.original_outs is None: self.original_outs = model.get_column_values(C.COL_OUT).copy()
             
-        df[C.COL_IN] = C.DEFAULT_TIMECODE
-        df[C.COL_OUT] = C.DEFAULT_TIMECODE
-        
-        view_col_in = model.get_view_column_index(C.COL_IN)
-        view_col_out = model.get_view_column_index(C.COL_OUT)
-        if view_col_in is None or view_col_out is None or model.rowCount() == 0:
-            model.layoutChanged.emit() # Fallback
-        else:
-            top_left = model.index(0, min(view_col_in, view_col_out))
-            bottom_right = model.index(model.rowCount() - 1, max(view_col_in, view_col_out))
-            model.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.EditRole])
+        model.set_column_values(C.COL_IN, C.DEFAULT_TIMECODE)
+        model.set_column_values(C.COL_OUT, C.DEFAULT_TIMECODE)
         self.tw.set_unsaved_changes(True)
 
     def undo(self):
         if self.original_ins is None or self.original_outs is None: return
 
         model = self.tw.pandas_model
-        df = model.dataframe()
-        df[C.COL_IN] = self.original_ins
-        df[C.COL_OUT] = self.original_outs
-        
-        view_col_in = model.get_view_column_index(C.COL_IN)
-        view_col_out = model.get_view_column_index(C.COL_OUT)
-        if view_col_in is None or view_col_out is None or model.rowCount() == 0:
-            model.layoutChanged.emit() # Fallback
-        else:
-            top_left = model.index(0, min(view_col_in, view_col_out))
-            bottom_right = model.index(model.rowCount() - 1, max(view_col_in, view_col_out))
-            model.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.EditRole])
+        model.set_column_values(C.COL_IN, self.original_ins)
+        model.set_column_values(C.COL_OUT, self.original_outs)
         self.tw.set_unsaved_changes(True)
 
 class CopyInToPreviousOutCommand(QUndoCommand):
     def __init__(self, table_window: 'TableWindow'):
         super().__init__("Copiar IN de la siguiente fila al OUT de la actual")
         self.tw = table_window
-        self.original_outs: Optional[pd.Series] = None
+        self.original_outs: Optional[np.ndarray] = None
 
     def redo(self):
         model = self.tw.pandas_model
-        df = model.dataframe()
-        if df.empty: return
+        if model.df_row_count() == 0: return
 
         if self.original_outs is None:
-            self.original_outs = df[C.COL_OUT].copy()
-            
-        df[C.COL_OUT] = df[C.COL_IN].shift(-1)
-        
-        if not self.original_outs.empty:
-            df.loc[df.index[-1], C.COL_OUT] = self.original_outs.iloc[-1]
-        
-        view_col_out = model.get_view_column_index(C.COL_OUT)
-        if view_col_out is None or model.rowCount() == 0:
-            model.layoutChanged.emit() # Fallback
-        else:
-            top_left = model.index(0, view_col_out)
-            bottom_right = model.index(model.rowCount() - 1, view_col_out)
-            model.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.EditRole])
+            self.original_outs = model.get_column_values(C.COL_OUT).copy()
+
+        # OUT[i] = IN[i+1]; la última fila conserva su OUT original
+        new_outs = np.concatenate([model.get_column_values(C.COL_IN)[1:], self.original_outs[-1:]])
+        model.set_column_values(C.COL_OUT, new_outs)
         self.tw.set_unsaved_changes(True)
 
     def undo(self):
         if self.original_outs is None: return
 
-        model = self.tw.pandas_model
-        df = model.dataframe()
-        df[C.COL_OUT] = self.original_outs
-        
-        view_col_out = model.get_view_column_index(C.COL_OUT)
-        if view_col_out is None or model.rowCount() == 0:
-            model.layoutChanged.emit() # Fallback
-        else:
-            top_left = model.index(0, view_col_out)
-            bottom_right = model.index(model.rowCount() - 1, view_col_out)
-            model.dataChanged.emit(top_left, bottom_right, [Qt.ItemDataRole.EditRole])
+        self.tw.pandas_model.set_column_values(C.COL_OUT, self.original_outs)
         self.tw.set_unsaved_changes(True)
 
 class AutoSplitInterventionCommand(QUndoCommand):
@@ -807,9 +710,8 @@ class AutoSplitInterventionCommand(QUndoCommand):
 
     def redo(self):
         model = self.tw.pandas_model
-        df = model.dataframe()
         
-        if not (0 <= self.df_idx_split < len(df)):
+        if not (0 <= self.df_idx_split < model.df_row_count()):
             return
 
         view_col_idx = model.get_view_column_index(self.df_column_name)
@@ -818,14 +720,14 @@ class AutoSplitInterventionCommand(QUndoCommand):
 
         # 1. Guardar texto original (solo la primera vez)
         if not self.original_text:
-            self.original_text = str(df.at[self.df_idx_split, self.df_column_name])
+            self.original_text = model.get_value(self.df_idx_split, self.df_column_name)
 
         # 2. Actualizar la fila actual con el primer trozo
         first_text = self.split_texts[0]
         model.setData(model.index(self.df_idx_split, view_col_idx), first_text, Qt.ItemDataRole.EditRole)
 
         # 3. Preparar datos base para las nuevas filas (copiando escena, personaje, etc.)
-        base_row_data = df.iloc[self.df_idx_split].to_dict().copy()
+        base_row_data = model.get_row_data(self.df_idx_split)
         
         # Limpiar los textos en la copia base para no duplicar contenido
         if C.COL_DIALOGO in base_row_data: base_row_data[C.COL_DIALOGO] = ""
@@ -836,18 +738,19 @@ class AutoSplitInterventionCommand(QUndoCommand):
 
         self.added_row_ids = []
 
-        # 4. Insertar el resto de trozos como nuevas filas
-        # Iteramos en reverso para insertar siempre justo debajo de la fila original y mantener el orden
-        for i, text_part in enumerate(self.split_texts[1:], start=1):
+        # 4. Insertar el resto de trozos como nuevas filas, justo debajo de la original y en orden
+        new_rows = []
+        first_new_id = model.get_next_id()
+        for i, text_part in enumerate(self.split_texts[1:]):
             new_data = base_row_data.copy()
             new_data[self.df_column_name] = text_part
-            new_data[C.COL_ID] = model.get_next_id() # Nuevo ID único
+            new_data[C.COL_ID] = first_new_id + i # Nuevo ID único
             
             # Guardamos el ID para el UNDO
             self.added_row_ids.append(new_data[C.COL_ID])
-            
-            # Insertamos. Nota: insertamos en df_idx_split + i
-            model.insert_row_data(self.df_idx_split + i, new_data)
+            new_rows.append(new_data)
+
+        model.insert_rows([self.df_idx_split + i for i in range(1, len(new_rows) + 1)], new_rows)
 
         self.tw.set_unsaved_changes(True)
         self.tw.request_resize_rows_to_contents_deferred()
@@ -861,11 +764,8 @@ class AutoSplitInterventionCommand(QUndoCommand):
             model.setData(model.index(self.df_idx_split, view_col_idx), self.original_text, Qt.ItemDataRole.EditRole)
 
         # 2. Eliminar las filas creadas buscando por ID (más seguro que por índice)
-        # Las borramos en orden inverso de creación para no alterar índices pendientes
-        for row_id in reversed(self.added_row_ids):
-            idx_to_remove = model.find_df_index_by_id(row_id)
-            if idx_to_remove is not None:
-                model.remove_row_by_df_index(idx_to_remove)
+        rows_to_remove = [model.find_df_index_by_id(row_id) for row_id in self.added_row_ids]
+        model.remove_rows([idx for idx in rows_to_remove if idx is not None])
 
         self.tw.set_unsaved_changes(True)
         self.tw.request_resize_rows_to_contents_deferred()
\ No newline at end of file
@@ -3,7 +3,7 @@
 # guion_editor/delegates/custom_delegates.py
 
 from PyQt6.QtWidgets import QStyledItemDelegate, QLineEdit, QCompleter, QWidget, QStyle, QStyleOptionViewItem, QComboBox
-from PyQt6.QtCore import Qt, QObject, QModelIndex, QAbstractItemModel
+from PyQt6.QtCore import Qt, QObject, QModelIndex, QAbstractItemModel, QStringListModel
 from PyQt6.QtGui import QPalette, QPainter, QBrush, QColor, QFont
 
 from guion_editor.commands.undo_commands import EditCommand
@@ -97,18 +97,27 @@ class TimeCodeDelegate(QStyledItemDelegate):
         painter.restore()
 
 class CharacterDelegate(QStyledItemDelegate):
+    """
+    Editor de PERSONAJE con autocompletado. Con `names_model` el completer usa ese
+    modelo compartido (que se mantiene al día fuera del delegado); si no, pide la
+    lista a `get_names_callback` cada vez que se abre un editor.
+    """
     def __init__(self, get_names_callback: Optional[Callable[[], List[str]]] = None,
-                 parent: Optional[QObject] = None):
+                 parent: Optional[QObject] = None, names_model: Optional[QStringListModel] = None):
         super().__init__(parent)
         self.get_names_callback = get_names_callback
+        self.names_model = names_model
 
     def createEditor(self, parent_widget_for_editor: QWidget,
                      option: 'QStyleOptionViewItem',
                      index: QModelIndex) -> QWidget:
         editor = QLineEdit(parent_widget_for_editor)
-        if self.get_names_callback:
-            character_names = self.get_names_callback()
-            completer = QCompleter(character_names, editor)
+        completer = None
+        if self.names_model is not None:
+            completer = QCompleter(self.names_model, editor)
+        elif self.get_names_callback:
+            completer = QCompleter(self.get_names_callback(), editor)
+        if completer is not None:
             completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
             editor.setCompleter(completer)
             popup = completer.popup()
@@ -1,9 +1,12 @@
 # guion_editor/delegates/guion_delegate.py
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
 from PyQt6.QtWidgets import QStyledItemDelegate, QApplication, QStyleOptionViewItem, QWidget, QStyle, QTextEdit
 from PyQt6.QtCore import Qt, QSize, QEvent, QModelIndex, QAbstractItemModel
 from PyQt6.QtGui import (
     QFontMetrics, QPalette, QFont, QBrush, 
-    QColor, QTextDocument, QPainter, QTextOption 
+    QColor, QTextDocument, QPainter, QTextOption, QStaticText
 )
 
 from guion_editor.widgets.custom_text_edit import CustomTextEdit
@@ -11,6 +14,80 @@ from guion_editor.widgets.custom_text_edit import CustomTextEdit
 from guion_editor.commands.undo_commands import EditCommand
 
 
+# Márgenes del texto dentro de la celda (los mismos que usa el editor CustomTextEdit)
+CELL_PADDING = 3
+DOCUMENT_MARGIN = 4
+# Alturas recordadas (baratas: una por celda de texto del guion) y textos maquetados listos para pintar
+TEXT_HEIGHT_CACHE_SIZE = 65536
+TEXT_LAYOUT_CACHE_SIZE = 1024
+
+LayoutKey = Tuple[str, int, int]
+
+
+class TextLayoutCache:
+    """
+    Caché LRU de textos maquetados, por (texto, ancho, tamaño de letra), que
+    comparten sizeHint y paint: cada texto se reparte en líneas una sola vez.
+    Las alturas se guardan para muchas más celdas que las maquetaciones, que
+    solo hacen falta para las filas visibles.
+    """
+
+    def __init__(self, max_heights: int = TEXT_HEIGHT_CACHE_SIZE, max_layouts: int = TEXT_LAYOUT_CACHE_SIZE):
+        self.max_heights = max_heights
+        self.max_layouts = max_layouts
+        self._heights: 'OrderedDict[LayoutKey, float]' = OrderedDict()
+        self._layouts: 'OrderedDict[LayoutKey, QStaticText]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._heights)
+
+    def clear(self) -> None:
+        self._heights.clear()
+        self._layouts.clear()
+
+    def height(self, text: str, width: int, font: QFont) -> float:
+        """Altura de `text` repartido en `width` píxeles."""
+        key = (text, width, font.pointSize())
+        height = self._heights.get(key)
+        if height is None:
+            return self._build(key, font).size().height()
+        self._heights.move_to_end(key)
+        return height
+
+    def cached_height(self, text: str, width: int, font: QFont) -> Optional[float]:
+        """Altura ya calculada, o None si el texto aún no se ha maquetado con ese ancho."""
+        return self._heights.get((text, width, font.pointSize()))
+
+    def layout(self, text: str, width: int, font: QFont) -> QStaticText:
+        """Texto maquetado listo para QPainter.drawStaticText."""
+        key = (text, width, font.pointSize())
+        static_text = self._layouts.get(key)
+        if static_text is None:
+            return self._build(key, font)
+        self._layouts.move_to_end(key)
+        return static_text
+
+    def _build(self, key: LayoutKey, font: QFont) -> QStaticText:
+        text, width, _ = key
+        # En texto plano QStaticText no trata '\n' como salto de línea: se usa el separador Unicode
+        static_text = QStaticText(text.replace('\n', '\u2028'))
+        static_text.setTextFormat(Qt.TextFormat.PlainText)
+        text_option = QTextOption()
+        text_option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+        static_text.setTextOption(text_option)
+        static_text.setTextWidth(max(width, 1))
+        static_text.prepare(font=font)
+        self._remember(self._heights, key, static_text.size().height(), self.max_heights)
+        self._remember(self._layouts, key, static_text, self.max_layouts)
+        return static_text
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key: LayoutKey, value, max_entries: int) -> None:
+        cache[key] = value
+        if len(cache) > max_entries:
+            cache.popitem(last=False)
+
+
 class DialogDelegate(QStyledItemDelegate):
     def __init__(self, parent=None, font_size=9, table_window_instance=None):
         super().__init__(parent)
@@ -18,10 +95,49 @@ class DialogDelegate(QStyledItemDelegate):
         self._font = QFont()
         self._font.setPointSize(self._font_size)
         self.table_window = table_window_instance
+        self._layouts = TextLayoutCache()
+
+    def invalidate_layouts(self) -> None:
+        """Olvida los textos maquetados (cambio de fuente o de ancho de columna)."""
+        self._layouts.clear()
+
+    def _text_font(self, base_font: QFont) -> QFont:
+        font = QFont(base_font)
+        font.setPointSize(self._font_size)
+        return font
+
+    @staticmethod
+    def _text_width(cell_width: int) -> int:
+        return cell_width - 2 * (CELL_PADDING + DOCUMENT_MARGIN)
+
+    @staticmethod
+    def _cell_height(text_height: float, font_metrics: QFontMetrics) -> int:
+        calculated_height = int(text_height + 2 * DOCUMENT_MARGIN + (CELL_PADDING * 2) + 4)
+        min_line_height = font_metrics.height() + (CELL_PADDING * 2) + 4
+        return max(calculated_height, min_line_height)
+
+    def estimated_heights(self, texts: Iterable[str], cell_width: int) -> List[int]:
+        """
+        Altura de celda de cada texto sin maquetarlo: la exacta si ya está en la caché
+        y, si no, una línea por cada salto de línea. Sirve para las filas fuera de pantalla.
+        """
+        view = self.parent()
+        font = self._text_font(view.font() if isinstance(view, QWidget) else self._font)
+        font_metrics = QFontMetrics(font)
+        line_spacing = font_metrics.lineSpacing()
+        text_width = self._text_width(cell_width)
+        heights = []
+        for text in texts:
+            text_height = self._layouts.cached_height(text, text_width, font)
+            if text_height is None:
+                text_height = (text.count('\n') + 1) * line_spacing
+            heights.append(self._cell_height(text_height, font_metrics))
+        return heights
 
     def setFontSize(self, size: int):
         self._font_size = size
         self._font.setPointSize(self._font_size)
+        self.invalidate_layouts()
         if self.table_window and hasattr(self.table_window, 'table_view'):
             self.table_window.table_view.viewport().update()
             self.table_window.request_resize_rows_to_contents_deferred()
@@ -73,23 +189,11 @@ class DialogDelegate(QStyledItemDelegate):
     def updateEditorGeometry(self, editor: QWidget, option: QStyleOptionViewItem, index: QModelIndex) -> None:
         editor.setGeometry(option.rect)
 
-    # ... (el resto de los métodos sizeHint y paint no cambian)
     def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
         text = str(index.data(Qt.ItemDataRole.DisplayRole) or "")
-        doc = QTextDocument()
-        doc.setPlainText(text)
-        doc.setDefaultFont(self._font) 
-
-        available_width_for_qtextedit_content = option.rect.width() - (3 * 2)
-
-        doc.setTextWidth(available_width_for_qtextedit_content)
-        ideal_height_of_text = doc.size().height()
-        
-        calculated_height = int(ideal_height_of_text + (3 * 2) + 4)
-
-        min_line_height = QFontMetrics(self._font).height() + (3 * 2) + 4
-        
-        return QSize(option.rect.width(), max(calculated_height, min_line_height))
+        font = self._text_font(option.font)
+        ideal_height_of_text = self._layouts.height(text, self._text_width(option.rect.width()), font)
+        return QSize(option.rect.width(), self._cell_height(ideal_height_of_text, QFontMetrics(font)))
 
 
     def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
@@ -120,9 +224,10 @@ class DialogDelegate(QStyledItemDelegate):
 
         text_to_display = str(index.model().data(index, Qt.ItemDataRole.DisplayRole) or "")
         text_rect = widget.style().subElementRect(QStyle.SubElement.SE_ItemViewItemText, style_option, widget)
-        current_paint_font = QFont(style_option.font)
-        current_paint_font.setPointSize(self._font_size)
-        painter.setFont(current_paint_font)
+        # Mismo ancho y fuente que sizeHint: la maquetación sale de la caché
+        paint_font = self._text_font(option.font)
+        static_text = self._layouts.layout(text_to_display, self._text_width(option.rect.width()), paint_font)
+        painter.setFont(paint_font)
 
         if style_option.state & QStyle.StateFlag.State_Selected:
             painter.setPen(style_option.palette.highlightedText().color())
@@ -138,7 +243,7 @@ class DialogDelegate(QStyledItemDelegate):
             else:
                 painter.setPen(style_option.palette.text().color())
 
-        text_flags = Qt.TextFlag.TextWordWrap | Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft
-        painter.drawText(text_rect, int(text_flags), text_to_display)
+        painter.setClipRect(text_rect)
+        painter.drawStaticText(text_rect.topLeft(), static_text)
 
         painter.restore()
\ No newline at end of file
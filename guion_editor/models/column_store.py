@@ -0,0 +1,610 @@
+# guion_editor/models/column_store.py
+"""
+Almacenamiento columnar tipado que respalda a PandasTableModel.
+
+Cada columna del guion vive en un array contiguo de numpy con su propio tipo:
+- ID: enteros (MISSING_ID si el guion original no traía identificador).
+- IN / OUT: el texto "HH:MM:SS:FF" tal y como se muestra, más su valor en frames y en ms.
+- BOOKMARK: booleanos.
+- Resto de columnas de texto: arrays de objetos que contienen siempre `str`.
+
+Las lecturas y escrituras de una celda son O(1) y no crean objetos nuevos; el
+DataFrame completo solo se construye bajo demanda (exportar, takeo, SRT...).
+
+El orden visible de las filas es una permutación (`_order`: fila -> hueco físico).
+Mover, insertar o borrar filas solo toca ese array de enteros: las filas nuevas se
+añaden al final de los arrays físicos (con capacidad de reserva) y las borradas
+quedan como huecos libres. `compact()` reordena físicamente los datos y descarta
+los huecos; solo se llama explícitamente (p. ej. tras guardar) o cuando los
+huecos superan a las filas vivas. Materializar el DataFrame no modifica el almacén.
+
+`snapshot()` entrega a otros hilos una vista inmutable de algunas columnas sin
+copiarlas: las columnas compartidas se copian solo si se vuelven a escribir
+(copy-on-write por columna).
+
+PERSONAJE se guarda además como códigos de un diccionario de nombres internados
+(`CharacterDictionary`) que lleva la cuenta de filas por personaje: los listados de
+personajes se obtienen en O(nº de personajes) sin recorrer las filas.
+
+El hueco físico de una fila sirve como clave estable (`slots_of`/`rows_of_slots`)
+mientras `slot_epoch` no cambie (solo cambia al compactar).
+"""
+from itertools import count
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from guion_editor import constants_logic as C
+from guion_editor.utils.timecode import INVALID_FRAMES, INVALID_MS, parse_tc, parse_tc_array, parse_tc_to_frames
+
+MISSING_ID = -1
+
+TIME_COLUMNS = (C.COL_IN, C.COL_OUT)
+TEXT_COLUMNS = (C.COL_SCENE, C.COL_PERSONAJE, C.COL_DIALOGO, C.COL_EUSKERA, C.COL_OHARRAK)
+
+_ORDER_KEY = "__order__"
+# Épocas de huecos únicas entre almacenes: un resultado de un almacén anterior nunca coincide
+_slot_epochs = count()
+
+
+def _to_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    try:
+        if pd.isna(value):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def _to_id(value: Any) -> int:
+    try:
+        if value is None or pd.isna(value):
+            return MISSING_ID
+        return int(value)
+    except (TypeError, ValueError):
+        return MISSING_ID
+
+
+def _to_bool(value: Any) -> bool:
+    try:
+        return False if pd.isna(value) else bool(value)
+    except (TypeError, ValueError):
+        return bool(value)
+
+
+def _object_array(values) -> np.ndarray:
+    items = list(values)
+    arr = np.empty(len(items), dtype=object)
+    arr[:] = items
+    return arr
+
+
+def _move_item(arr: np.ndarray, source: int, target: int) -> None:
+    item = arr[source]
+    if source < target:
+        arr[source:target] = arr[source + 1:target + 1]
+    else:
+        arr[target + 1:source + 1] = arr[target:source]
+    arr[target] = item
+
+
+class CharacterDictionary:
+    """Nombres de PERSONAJE internados (código -> nombre) con el número de filas vivas por código."""
+
+    def __init__(self):
+        self._names: List[str] = [""]
+        self._codes: Dict[str, int] = {"": 0}
+        self._counts = np.zeros(1, dtype=np.int64)
+        self._names_array: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def encode(self, names: Any) -> np.ndarray:
+        """Códigos de `names`; los nombres nuevos se añaden al diccionario."""
+        codes = np.fromiter((self._code(name) for name in names), dtype=np.int32)
+        if len(self._counts) < len(self._names):
+            self._counts = np.concatenate([self._counts, np.zeros(len(self._names) - len(self._counts), dtype=np.int64)])
+        return codes
+
+    def _code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self._names)
+            self._names.append(name)
+            self._codes[name] = code
+            self._names_array = None
+        return code
+
+    def names(self, codes: np.ndarray) -> np.ndarray:
+        """Nombres (las cadenas internadas, sin duplicarlas) de `codes`."""
+        if self._names_array is None:
+            self._names_array = _object_array(self._names)
+        return self._names_array[codes]
+
+    def acquire(self, codes: np.ndarray) -> None:
+        self._counts += np.bincount(codes, minlength=len(self._counts))
+
+    def release(self, codes: np.ndarray) -> None:
+        self._counts -= np.bincount(codes, minlength=len(self._counts))
+
+    def counts(self) -> Dict[str, int]:
+        """Nombre -> número de filas, solo de los nombres en uso."""
+        used = np.flatnonzero(self._counts)
+        return dict(zip([self._names[code] for code in used.tolist()], self._counts[used].tolist()))
+
+
+class ColumnStore:
+    def __init__(self, num_rows: int = 0):
+        self._num_rows = num_rows
+        self._ids = np.full(num_rows, MISSING_ID, dtype=np.int64)
+        self._id_text = np.full(num_rows, "", dtype=object)
+        self._text: Dict[str, np.ndarray] = {
+            col: np.full(num_rows, C.DEFAULT_SCENE if col == C.COL_SCENE else "", dtype=object)
+            for col in TEXT_COLUMNS
+        }
+        self._tc_text: Dict[str, np.ndarray] = {col: np.full(num_rows, C.DEFAULT_TIMECODE, dtype=object) for col in TIME_COLUMNS}
+        self._frames: Dict[str, np.ndarray] = {col: np.zeros(num_rows, dtype=np.int64) for col in TIME_COLUMNS}
+        self._ms: Dict[str, np.ndarray] = {col: np.zeros(num_rows, dtype=np.int64) for col in TIME_COLUMNS}
+        # Texto de DURACIÓN ya formateado por fila; None = pendiente de calcular.
+        self._duration_text = np.full(num_rows, None, dtype=object)
+        self._bookmark = np.zeros(num_rows, dtype=bool)
+        self._characters = CharacterDictionary()
+        self._character_codes = np.zeros(num_rows, dtype=np.int32)
+        self._characters.acquire(self._character_codes)
+        # Columnas que no pertenecen al esquema (p. ej. REPARTO): se conservan tal cual para exportar.
+        self._extra: Dict[str, np.ndarray] = {}
+        # Fila visible -> hueco físico. `_used` huecos ocupados (vivos o borrados) de la capacidad total.
+        self._order = np.arange(num_rows, dtype=np.int64)
+        self._used = num_rows
+        self._is_compact = True
+        self._order_version = 0
+        self._inverse_order: Optional[np.ndarray] = None
+        self._inverse_order_version = -1
+        self.slot_epoch = next(_slot_epochs)
+        # Índice ID -> fila y siguiente ID libre (nunca decrece, aunque se borren filas).
+        self._id_index: Dict[int, int] = {}
+        self._next_id = 0
+        # Columnas (y el orden) referenciadas por alguna instantánea: se copian antes de escribir en ellas.
+        self._shared: Set[str] = set()
+        # Se incrementa con cada mutación; permite cachear vistas derivadas (DataFrame, etc.).
+        self.version = 0
+
+    # --- Construcción / exportación ---
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'ColumnStore':
+        store = cls(len(df))
+        if C.COL_ID in df.columns:
+            store._ids = np.fromiter((_to_id(v) for v in df[C.COL_ID]), dtype=np.int64, count=len(df))
+            store._id_text = _object_array("" if v == MISSING_ID else str(v) for v in store._ids)
+        for col in TEXT_COLUMNS:
+            if col in df.columns:
+                store._text[col] = _object_array(_to_text(v) for v in df[col])
+        if C.COL_PERSONAJE in df.columns:
+            store._text[C.COL_PERSONAJE] = store._recode_characters(slice(None), store._text[C.COL_PERSONAJE])
+        for col in TIME_COLUMNS:
+            if col in df.columns:
+                texts = _object_array(_to_text(v) for v in df[col])
+                store._tc_text[col] = texts
+                store._set_parsed_times(col, slice(None), texts)
+        if C.COL_BOOKMARK in df.columns:
+            store._bookmark = np.fromiter((_to_bool(v) for v in df[C.COL_BOOKMARK]), dtype=bool, count=len(df))
+        for col in df.columns:
+            if col not in C.DF_COLUMN_ORDER:
+                store._extra[col] = _object_array(df[col].tolist())
+        store._rebuild_id_index()
+        return store
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame en el orden visible. Solo lee: no compacta ni cambia `slot_epoch`."""
+        slots = self._slots(None)
+
+        def visible(arr: np.ndarray) -> np.ndarray:
+            # Con el almacén compacto `slots` es un slice (vista): hay que copiar
+            return arr[slots].copy() if isinstance(slots, slice) else arr[slots]
+        data: Dict[str, Any] = {}
+        for col in C.DF_COLUMN_ORDER:
+            if col == C.COL_ID:
+                ids = self._ids[slots]
+                data[col] = pd.array(np.where(ids == MISSING_ID, None, ids).tolist(), dtype='Int64')
+            elif col in TIME_COLUMNS:
+                data[col] = visible(self._tc_text[col])
+            elif col == C.COL_BOOKMARK:
+                data[col] = visible(self._bookmark)
+            else:
+                data[col] = visible(self._text[col])
+        for col, values in self._extra.items():
+            data[col] = visible(values)
+        return pd.DataFrame(data)
+
+    def compact(self) -> Optional[np.ndarray]:
+        """
+        Reordena físicamente los arrays según el orden visible y libera los huecos borrados.
+        Devuelve la traducción hueco antiguo -> nuevo (-1 si estaba libre), o None si ya era compacto.
+        """
+        if self._is_compact and self._used == self._num_rows:
+            return None
+        order = self._order
+        slot_map = np.full(self._used, -1, dtype=np.int64)
+        slot_map[order] = np.arange(self._num_rows, dtype=np.int64)
+        self._map_arrays(lambda arr: arr[order])
+        self._order = np.arange(self._num_rows, dtype=np.int64)
+        self._used = self._num_rows
+        self._is_compact = True
+        self._order_version += 1
+        self.slot_epoch = next(_slot_epochs)
+        return slot_map
+
+    def snapshot(self, columns: List[str]) -> 'ColumnSnapshot':
+        """Instantánea inmutable de columnas de texto/timecode, sin copiar datos."""
+        arrays: Dict[str, np.ndarray] = {}
+        for col in columns:
+            arrays[col] = self._text[col] if col in self._text else self._tc_text[col]
+            self._shared.add(col)
+        slots = self._slots(None)
+        if not isinstance(slots, slice):
+            self._shared.add(_ORDER_KEY)
+        return ColumnSnapshot(self.version, self.slot_epoch, self._num_rows, slots, arrays)
+
+    # --- Consultas ---
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    @property
+    def columns(self) -> List[str]:
+        return list(C.DF_COLUMN_ORDER) + list(self._extra.keys())
+
+    def has_column(self, col: str) -> bool:
+        return col in C.DF_COLUMN_ORDER or col in self._extra
+
+    def get(self, row: int, col: str) -> Any:
+        """Valor tipado de una celda (ID: int o None, BOOKMARK: bool, resto: str)."""
+        row = self._order[row]
+        if col in self._text: return self._text[col][row]
+        if col in self._tc_text: return self._tc_text[col][row]
+        if col == C.COL_BOOKMARK: return bool(self._bookmark[row])
+        if col == C.COL_ID:
+            value = self._ids[row]
+            return None if value == MISSING_ID else int(value)
+        return self._extra[col][row]
+
+    def display_text(self, row: int, col: str) -> str:
+        """Texto de una celda tal y como se muestra, sin crear cadenas nuevas."""
+        row = self._order[row]
+        if col in self._text: return self._text[col][row]
+        if col in self._tc_text: return self._tc_text[col][row]
+        if col == C.COL_ID: return self._id_text[row]
+        return _to_text(self._extra[col][row]) if col in self._extra else ""
+
+    def is_bookmarked(self, row: int) -> bool:
+        return bool(self._bookmark[self._order[row]])
+
+    def column(self, col: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Valores de la columna en orden visible (o solo de `rows`). Puede ser una
+        vista interna: no debe modificarse desde fuera.
+        """
+        if col in self._text: arr = self._text[col]
+        elif col in self._tc_text: arr = self._tc_text[col]
+        elif col == C.COL_BOOKMARK: arr = self._bookmark
+        elif col == C.COL_ID: arr = self._ids
+        else: arr = self._extra[col]
+        return self._visible(arr, rows)
+
+    def frames(self, col: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Frames de IN u OUT (INVALID_FRAMES donde el timecode no es válido)."""
+        return self._visible(self._frames[col], rows)
+
+    def ms(self, col: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Milisegundos de IN u OUT (INVALID_MS donde el timecode no es válido)."""
+        return self._visible(self._ms[col], rows)
+
+    def ms_at(self, row: int, col: str) -> int:
+        return int(self._ms[col][self._order[row]])
+
+    def cached_duration_text(self, row: int) -> Optional[str]:
+        return self._duration_text[self._order[row]]
+
+    def cache_duration_text(self, row: int, text: str) -> None:
+        """Guarda el texto de DURACIÓN; se invalida solo al cambiar IN/OUT de esa fila."""
+        self._duration_text[self._order[row]] = text
+
+    def row(self, row: int) -> Dict[str, Any]:
+        return {col: self.get(row, col) for col in self.columns}
+
+    def slots_of(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Huecos físicos de `rows` (claves estables mientras no cambie `slot_epoch`)."""
+        return self._order[:self._num_rows].copy() if rows is None else self._order[np.asarray(rows, dtype=np.int64)]
+
+    def rows_of_slots(self, slots: np.ndarray) -> np.ndarray:
+        """Fila visible actual de cada hueco; -1 si la fila ya no existe."""
+        if self._inverse_order_version != self._order_version:
+            inverse = np.full(len(self._ids), -1, dtype=np.int64)
+            inverse[self._order] = np.arange(self._num_rows, dtype=np.int64)
+            self._inverse_order, self._inverse_order_version = inverse, self._order_version
+        slots = np.asarray(slots, dtype=np.int64)
+        rows = np.full(len(slots), -1, dtype=np.int64)
+        in_range = (slots >= 0) & (slots < len(self._inverse_order))
+        rows[in_range] = self._inverse_order[slots[in_range]]
+        return rows
+
+    def character_counts(self) -> Dict[str, int]:
+        """PERSONAJE -> número de filas (tal cual está escrito), en O(nº de personajes)."""
+        return self._characters.counts()
+
+    def row_of_id(self, id_value: int) -> Optional[int]:
+        return self._id_index.get(id_value)
+
+    def next_id(self) -> int:
+        return self._next_id
+
+    # --- Mutaciones ---
+
+    def set(self, row: int, col: str, value: Any) -> None:
+        visible_row, row = row, self._order[row]
+        if col in self._text:
+            text = _to_text(value)
+            if col == C.COL_PERSONAJE:
+                text = self._recode_characters(np.array([row]), [text])[0]
+            self._writable(col)[row] = text
+        elif col in self._tc_text:
+            text = _to_text(value)
+            self._writable(col)[row] = text
+            self._frames[col][row], self._ms[col][row] = parse_tc(text)
+            self._duration_text[row] = None
+        elif col == C.COL_BOOKMARK:
+            self._bookmark[row] = bool(value)
+        elif col == C.COL_ID:
+            new_id = _to_id(value)
+            old_ids = self._ids[[row]]
+            self._ids[row] = new_id
+            self._id_text[row] = "" if new_id == MISSING_ID else str(new_id)
+            self._update_id_index(np.array([visible_row]), old_ids)
+        else:
+            self._extra_column(col)[row] = value
+        self.version += 1
+
+    def set_column(self, col: str, values: Any, rows: Optional[np.ndarray] = None) -> None:
+        """Asignación vectorizada de una columna completa o de las filas indicadas."""
+        target = self._slots(rows)
+        if col in self._text or col in self._tc_text:
+            count = self._num_rows if rows is None else len(target)
+            if isinstance(values, str):
+                texts = np.full(count, values, dtype=object)
+            else:
+                texts = _object_array(_to_text(v) for v in values)
+            if col == C.COL_PERSONAJE:
+                texts = self._recode_characters(target, texts)
+            self._writable(col)[target] = texts
+            if col in self._tc_text:
+                self._set_parsed_times(col, target, texts)
+        elif col == C.COL_BOOKMARK:
+            self._bookmark[target] = np.asarray(values, dtype=bool)
+        elif col == C.COL_ID:
+            ids = np.fromiter((_to_id(v) for v in np.atleast_1d(values)), dtype=np.int64)
+            old_ids = self._ids[target].copy()
+            self._ids[target] = ids
+            self._id_text[target] = _object_array("" if v == MISSING_ID else str(v) for v in self._ids[target])
+            if rows is None:
+                self._rebuild_id_index()
+            else:
+                self._update_id_index(np.asarray(rows, dtype=np.int64), old_ids)
+        else:
+            self._extra_column(col)[target] = values
+        self.version += 1
+
+    def insert(self, pos: int, row_data: Dict[str, Any]) -> None:
+        """Inserta una fila ya completa (todas las columnas del esquema presentes)."""
+        self.insert_block(pos, [row_data])
+
+    def insert_block(self, pos: int, rows: List[Dict[str, Any]]) -> None:
+        """Inserta filas contiguas a partir de `pos`: se escriben en huecos nuevos al final."""
+        if not rows:
+            return
+        count = len(rows)
+        if self._used + count > len(self._ids):
+            self._grow(count)
+        slots = slice(self._used, self._used + count)
+        new_ids = [_to_id(r.get(C.COL_ID)) for r in rows]
+        self._ids[slots] = new_ids
+        self._id_text[slots] = _object_array("" if i == MISSING_ID else str(i) for i in new_ids)
+        for col in TEXT_COLUMNS:
+            texts = _object_array(_to_text(r.get(col, "")) for r in rows)
+            if col == C.COL_PERSONAJE:
+                # Huecos nuevos: no hay códigos anteriores que descontar
+                texts = self._recode_characters(slots, texts, release_previous=False)
+            self._writable(col)[slots] = texts
+        for col in TIME_COLUMNS:
+            texts = _object_array(_to_text(r.get(col, C.DEFAULT_TIMECODE)) for r in rows)
+            self._writable(col)[slots] = texts
+            self._set_parsed_times(col, slots, texts)
+        self._bookmark[slots] = [_to_bool(r.get(C.COL_BOOKMARK, False)) for r in rows]
+        for col, values in self._extra.items():
+            values[slots] = _object_array(r.get(col) for r in rows)
+
+        appended_in_place = self._is_compact and pos == self._num_rows == self._used
+        self._order = np.insert(self._order, pos, np.arange(self._used, self._used + count))
+        self._is_compact = appended_in_place
+        self._order_version += 1
+        self._used += count
+        self._num_rows += count
+        self._reindex_ids(pos, self._num_rows)
+        self._next_id = max(self._next_id, max(new_ids) + 1)
+        self.version += 1
+
+    def remove(self, pos: int) -> Dict[str, Any]:
+        return self.remove_block(pos, pos + 1)[0]
+
+    def remove_block(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Elimina las filas [start, stop) y devuelve sus datos. Sus huecos quedan libres."""
+        removed = [self.row(i) for i in range(start, stop)]
+        for row_data in removed:
+            row_id = _to_id(row_data[C.COL_ID])
+            if start <= self._id_index.get(row_id, -1) < stop:
+                del self._id_index[row_id]
+        tail_of_compact = self._is_compact and stop == self._num_rows
+        self._characters.release(self._character_codes[self._order[start:stop]])
+        self._order = np.delete(self._order, slice(start, stop))
+        self._order_version += 1
+        self._num_rows -= len(removed)
+        # Borrar por el final deja el orden como estaba (0..n-1): sigue siendo compacto. Los huecos
+        # liberados quedan reservados hasta compact(), así que `slot_epoch` no cambia
+        if not tail_of_compact:
+            self._is_compact = False
+        self._reindex_ids(start, self._num_rows)
+        if self._used > 2 * self._num_rows + 64:
+            self.compact()
+        self.version += 1
+        return removed
+
+    def move(self, source: int, target: int) -> None:
+        if source == target:
+            return
+        if _ORDER_KEY in self._shared:
+            self._order = self._order.copy()
+            self._shared.discard(_ORDER_KEY)
+        _move_item(self._order, source, target)
+        self._is_compact = False
+        self._order_version += 1
+        self._reindex_ids(min(source, target), max(source, target) + 1)
+        self.version += 1
+
+    def _reindex_ids(self, start: int, stop: int) -> None:
+        """Actualiza el índice ID -> fila solo para las filas desplazadas [start, stop)."""
+        ids = self._ids[self._order[start:stop]].tolist()
+        index = self._id_index
+        # Las entradas que apuntaban dentro del tramo ya no valen; las de antes del tramo siguen ganando
+        for id_value in ids:
+            if start <= index.get(id_value, -1) < stop:
+                del index[id_value]
+        self._index_first_rows(range(start, stop), ids)
+
+    def _update_id_index(self, rows: np.ndarray, old_ids: np.ndarray) -> None:
+        """Actualiza el índice ID -> fila solo para las filas `rows`, cuyo ID anterior era `old_ids`."""
+        rows_list = rows.tolist()
+        for row, old_id in zip(rows_list, old_ids.tolist()):
+            if old_id == MISSING_ID or self._id_index.get(old_id) != row:
+                continue
+            del self._id_index[old_id]
+            # Con IDs repetidos, el índice pasa a la primera fila que conserve el ID antiguo
+            others = self.rows_of_slots(np.flatnonzero(self._ids[:self._used] == old_id))
+            others = others[others >= 0]
+            if others.size:
+                self._id_index[old_id] = int(others.min())
+        new_ids = self._ids[self._order[rows]]
+        self._index_first_rows(rows_list, new_ids.tolist())
+        if new_ids.size:
+            self._next_id = max(self._next_id, int(new_ids.max()) + 1)
+
+    def _index_first_rows(self, rows: Iterable[int], ids: Iterable[int]) -> None:
+        """Apunta cada ID a su fila salvo que ya apunte a una anterior: con IDs repetidos gana la primera fila."""
+        index = self._id_index
+        for row, id_value in zip(rows, ids):
+            current = index.get(id_value)
+            if current is None or current > row:
+                index[id_value] = row
+        index.pop(MISSING_ID, None)
+
+    def _rebuild_id_index(self) -> None:
+        # Se recorre al revés para que, con IDs duplicados, gane la primera fila.
+        ids = self._ids[self._order]
+        self._id_index = dict(zip(ids[::-1].tolist(), range(self._num_rows - 1, -1, -1)))
+        self._id_index.pop(MISSING_ID, None)
+        self._next_id = max(self._next_id, int(ids.max()) + 1 if self._num_rows else 0)
+
+    def _set_parsed_times(self, col: str, target: Any, texts: np.ndarray) -> None:
+        self._frames[col][target], self._ms[col][target] = parse_tc_array(texts)
+        self._duration_text[target] = None
+
+    def _recode_characters(self, target: Any, texts: Any, release_previous: bool = True) -> np.ndarray:
+        """Actualiza los códigos y cuentas de PERSONAJE en `target`; devuelve los nombres internados."""
+        if release_previous:
+            self._characters.release(self._character_codes[target])
+        codes = self._characters.encode(texts)
+        self._character_codes[target] = codes
+        self._characters.acquire(codes)
+        return self._characters.names(codes)
+
+    def _writable(self, col: str) -> np.ndarray:
+        """Array de texto de `col` listo para escribir; si lo comparte una instantánea, antes se copia."""
+        columns = self._text if col in self._text else self._tc_text
+        if col in self._shared:
+            columns[col] = columns[col].copy()
+            self._shared.discard(col)
+        return columns[col]
+
+    def _extra_column(self, col: str) -> np.ndarray:
+        if col not in self._extra:
+            self._extra[col] = np.full(len(self._ids), None, dtype=object)
+        return self._extra[col]
+
+    def _slots(self, rows: Optional[np.ndarray]) -> Any:
+        """Huecos físicos de las filas visibles `rows` (todas si es None)."""
+        if rows is None:
+            return slice(0, self._num_rows) if self._is_compact else self._order
+        return self._order[np.asarray(rows, dtype=np.int64)]
+
+    def _visible(self, arr: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        return arr[self._slots(rows)]
+
+    def _grow(self, count: int) -> None:
+        """Amplía la capacidad física (al menos al doble) para inserciones amortizadas."""
+        used = self._used
+        capacity = max(2 * len(self._ids), used + count, 16)
+
+        def grow(arr: np.ndarray) -> np.ndarray:
+            grown = np.empty(capacity, dtype=arr.dtype)
+            grown[:used] = arr[:used]
+            return grown
+        self._map_arrays(grow)
+
+    def _map_arrays(self, fn) -> None:
+        """Aplica `fn` a todos los arrays físicos y los sustituye por el resultado (arrays nuevos)."""
+        self._shared.clear()
+        self._ids = fn(self._ids)
+        self._id_text = fn(self._id_text)
+        self._duration_text = fn(self._duration_text)
+        self._bookmark = fn(self._bookmark)
+        self._character_codes = fn(self._character_codes)
+        for columns in (self._text, self._tc_text, self._frames, self._ms, self._extra):
+            for col in columns:
+                columns[col] = fn(columns[col])
+
+
+class ColumnSnapshot:
+    """
+    Vista de solo lectura de algunas columnas de un ColumnStore en una versión
+    concreta. Comparte los arrays con el almacén, que los copia antes de volver a
+    escribir en ellos, así que puede leerse desde otro hilo.
+    """
+
+    def __init__(self, version: int, slot_epoch: int, num_rows: int, slots: Any, arrays: Dict[str, np.ndarray]):
+        self.version = version
+        self.slot_epoch = slot_epoch
+        self._num_rows = num_rows
+        self._slots = slots
+        self._arrays = arrays
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._arrays.keys())
+
+    def column(self, col: str) -> np.ndarray:
+        return self._arrays[col][self._slots]
+
+    def values_at_slots(self, col: str, slots: np.ndarray) -> np.ndarray:
+        """Valores de `col` en huecos físicos concretos (ver ColumnStore.slots_of)."""
+        return self._arrays[col][slots]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame({col: self.column(col) for col in self._arrays})
@@ -0,0 +1,198 @@
+# guion_editor/models/interval_index.py
+"""
+Índice de intervalos [IN, OUT) por fila para saber qué intervenciones están
+activas en un instante del vídeo.
+
+Los intervalos se guardan en arrays de numpy ordenados por inicio (y por fila en
+caso de empate), junto con el máximo acumulado de los finales. Para un instante
+`t`, las filas activas solo pueden estar entre la primera posición cuyo máximo
+acumulado supera `t` y la última cuyo inicio es <= `t`: dos searchsorted, sin
+recorrer el guion. Un segundo prefijo guarda la posición de ese máximo, así que
+la fila activa que sigue la sincronización sale en O(1) tras la búsqueda. Las
+consultas por instante no reservan memoria: escriben en búferes del propio índice.
+Las filas editadas se actualizan con `update_rows`: un mapa fila -> posición
+localiza sus entradas sin buscarlas. Con pocas filas cada entrada se desplaza
+dentro de los arrays y los prefijos se recalculan solo hasta que vuelven a
+coincidir con los anteriores; con muchas se rehacen en bloque. Tras insertar,
+borrar o mover filas hay que reconstruir el índice.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Clave de orden: inicio en los bits altos y fila en los bajos (los ms de un guion caben de sobra)
+_ROW_BITS = 31
+NO_END = np.iinfo(np.int64).max
+# Hasta cuántas filas editadas se recolocan una a una dentro de los arrays (más: se rehacen en bloque)
+_IN_PLACE_MAX_ROWS = 8
+_PREFIX_CHUNK = 64
+
+
+class IntervalIndex:
+    def __init__(self):
+        self._keys = np.empty(0, dtype=np.int64)
+        self.starts = np.empty(0, dtype=np.int64)
+        self.ends = np.empty(0, dtype=np.int64)
+        self.rows = np.empty(0, dtype=np.int64)
+        self._max_ends = np.empty(0, dtype=np.int64)
+        self._argmax_ends = np.empty(0, dtype=np.int64)
+        self._mask = np.empty(0, dtype=bool)
+        self._buffer = np.empty(0, dtype=np.int64)
+        # Fila -> posición en los arrays ordenados (-1 si la fila no tiene intervalo válido)
+        self._positions = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def rebuild(self, starts: np.ndarray, ends: np.ndarray, rows: Optional[np.ndarray] = None) -> None:
+        """Construye el índice desde cero. Se ignoran los intervalos inválidos (inicio < 0 o fin <= inicio)."""
+        starts, ends = np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+        rows = np.arange(len(starts), dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        self._positions = np.full(int(rows.max()) + 1 if rows.size else 0, -1, dtype=np.int64)
+        valid = (starts >= 0) & (ends > starts)
+        starts, ends, rows = starts[valid], ends[valid], rows[valid]
+        keys = (starts << _ROW_BITS) | rows
+        order = np.argsort(keys, kind='stable')
+        self._set(keys[order], starts[order], ends[order], rows[order], 0)
+
+    def update_rows(self, rows: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> None:
+        """Sustituye los intervalos de `rows` por los nuevos (los inválidos simplemente desaparecen)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size == 0:
+            return
+        if rows.max() >= len(self._positions):
+            missing = int(rows.max()) + 1 - len(self._positions)
+            self._positions = np.concatenate((self._positions, np.full(missing, -1, dtype=np.int64)))
+        starts, ends = np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+        valid = (starts >= 0) & (ends > starts)
+        old_positions = self._positions[rows]
+        if rows.size <= _IN_PLACE_MAX_ROWS and valid.all() and (old_positions >= 0).all():
+            # Caso habitual (editar el IN/OUT de unas pocas filas): cada entrada se desplaza dentro de los arrays
+            for row, start, end in zip(rows.tolist(), starts.tolist(), ends.tolist()):
+                self._move_entry(row, start, end)
+            return
+
+        old_positions = old_positions[old_positions >= 0]
+        self._positions[rows] = -1
+        keys, old_starts, old_ends, old_rows = (np.delete(arr, old_positions) for arr in
+                                                (self._keys, self.starts, self.ends, self.rows))
+        new_starts, new_ends, new_rows = starts[valid], ends[valid], rows[valid]
+        new_keys = (new_starts << _ROW_BITS) | new_rows
+        order = np.argsort(new_keys)
+        new_keys, new_starts, new_ends, new_rows = new_keys[order], new_starts[order], new_ends[order], new_rows[order]
+        positions = np.searchsorted(keys, new_keys)
+        # Antes de la primera entrada borrada o insertada nada se mueve: los prefijos siguen valiendo
+        first = min(int(old_positions.min()) if old_positions.size else len(keys),
+                    int(positions[0]) if positions.size else len(keys))
+        self._set(np.insert(keys, positions, new_keys), np.insert(old_starts, positions, new_starts),
+                  np.insert(old_ends, positions, new_ends), np.insert(old_rows, positions, new_rows), first)
+
+    def _move_entry(self, row: int, start: int, end: int) -> None:
+        """Lleva la entrada de `row` a su nueva posición desplazando solo las entradas intermedias."""
+        old = int(self._positions[row])
+        key = (start << _ROW_BITS) | row
+        new = int(self._keys.searchsorted(key))
+        if new > old:
+            new -= 1  # La propia entrada deja su hueco al salir
+        lo, hi = min(old, new), max(old, new)
+        for arr, value in ((self._keys, key), (self.starts, start), (self.ends, end), (self.rows, row)):
+            if new > old:
+                arr[old:new] = arr[old + 1:new + 1]
+            elif new < old:
+                arr[new + 1:old + 1] = arr[new:old]
+            arr[new] = value
+        self._positions[self.rows[lo:hi + 1]] = np.arange(lo, hi + 1)
+        self._refresh_prefixes(lo, hi + 1)
+
+    def _refresh_prefixes(self, first: int, stop: int) -> None:
+        """
+        Recalcula los prefijos en [first, stop) y sigue por tramos crecientes solo mientras
+        difieran de los anteriores: más allá de `stop` las entradas no han cambiado, así que en
+        cuanto un prefijo coincide con el antiguo, los siguientes también.
+        """
+        n, size = len(self.ends), _PREFIX_CHUNK
+        while True:
+            previous = (self._max_ends[stop - 1], self._argmax_ends[stop - 1])
+            self._fill_prefixes(first, stop)
+            if stop >= n or (self._max_ends[stop - 1], self._argmax_ends[stop - 1]) == previous:
+                return
+            first, stop, size = stop, min(n, stop + size), 2 * size
+
+    def _set(self, keys: np.ndarray, starts: np.ndarray, ends: np.ndarray, rows: np.ndarray, first: int) -> None:
+        """Sustituye los arrays ordenados; los prefijos y el mapa de posiciones se rehacen desde `first`."""
+        n = len(ends)
+        max_ends, argmax_ends = np.empty(n, dtype=np.int64), np.empty(n, dtype=np.int64)
+        max_ends[:first], argmax_ends[:first] = self._max_ends[:first], self._argmax_ends[:first]
+        self._keys, self.starts, self.ends, self.rows = keys, starts, ends, rows
+        self._max_ends, self._argmax_ends = max_ends, argmax_ends
+        self._fill_prefixes(first, n)
+        self._positions[rows[first:]] = np.arange(first, n)
+        if len(self._mask) < n:
+            self._mask = np.empty(2 * n, dtype=bool)
+            self._buffer = np.empty(2 * n, dtype=np.int64)
+
+    def _fill_prefixes(self, first: int, stop: int) -> None:
+        """Recalcula el máximo acumulado de OUT y su posición en [first, stop)."""
+        if first >= stop:
+            return
+        ends = self.ends[first:stop]
+        tail = np.maximum.accumulate(ends)
+        if first:
+            np.maximum(tail, self._max_ends[first - 1], out=tail)
+        # Última posición que alcanza el máximo acumulado: entre OUT iguales, la que empezó más tarde
+        tail_argmax = np.maximum.accumulate(np.where(ends >= tail, np.arange(first, stop), 0))
+        if first:
+            np.maximum(tail_argmax, self._argmax_ends[first - 1], out=tail_argmax)
+        self._max_ends[first:stop], self._argmax_ends[first:stop] = tail, tail_argmax
+
+    def _candidates(self, position: int):
+        """Rango [lo, hi) de posiciones que pueden contener `position`."""
+        hi = int(self.starts.searchsorted(position, side='right'))
+        lo = int(self._max_ends.searchsorted(position, side='right'))
+        return lo, hi
+
+    def _active(self, lo: int, hi: int, position: int) -> Tuple[np.ndarray, np.ndarray]:
+        mask = np.greater(self.ends[lo:hi], position, out=self._mask[:hi - lo])
+        count = int(np.count_nonzero(mask))
+        return np.compress(mask, self.rows[lo:hi], out=self._buffer[:count]), mask
+
+    def active_rows(self, position: int) -> np.ndarray:
+        """
+        Filas cuyo intervalo contiene `position`, ordenadas por inicio. Es una vista de
+        un búfer interno: vale hasta la siguiente consulta.
+
+        Coste: una pasada vectorizada por la ventana [lo, hi) que dejan las dos búsquedas.
+        Normalmente son unas pocas entradas, pero un intervalo temprano y muy largo
+        adelanta `lo` hasta él y la ventana puede abarcar casi todo el guion (O(n) en el
+        peor caso). Por eso el vídeo no la llama en cada tick: `active_span` dice hasta
+        cuándo vale el resultado y `latest_active_row` es O(1) tras las búsquedas.
+        """
+        lo, hi = self._candidates(position)
+        if lo >= hi:
+            return self.rows[:0]
+        return self._active(lo, hi, position)[0]
+
+    def active_span(self, position: int) -> Tuple[np.ndarray, int]:
+        """
+        Filas activas en `position` (como en `active_rows`) y el instante hasta el que siguen
+        siendo las mismas: el siguiente IN o el primer OUT de las activas (NO_END si no cambia nada más).
+        Mismo coste que `active_rows`, incluido su peor caso.
+        """
+        lo, hi = self._candidates(position)
+        until = int(self.starts[hi]) if hi < len(self.starts) else NO_END
+        if lo >= hi:
+            return self.rows[:0], until
+        rows, mask = self._active(lo, hi, position)
+        return rows, min(until, int(self.ends[lo:hi].min(where=mask, initial=NO_END)))
+
+    def latest_active_row(self, position: int) -> int:
+        """
+        Fila que sigue la sincronización en `position` (-1 si no hay ninguna): la última en
+        empezar si sigue activa y, si ya terminó, la activa que acaba más tarde.
+        """
+        lo, hi = self._candidates(position)
+        if lo >= hi:
+            return -1
+        # Con lo < hi el máximo de OUT hasta hi - 1 supera `position`: su fila está activa
+        last = hi - 1 if self.ends[hi - 1] > position else self._argmax_ends[hi - 1]
+        return int(self.rows[last])
@@ -0,0 +1,73 @@
+# guion_editor/models/line_groups.py
+"""
+Índice de grupos simultáneos (mismo IN y OUT) para la validación de líneas.
+
+Las reglas de líneas solo dependen de las filas de un mismo grupo (IN, OUT), así
+que basta con revalidar los grupos que han cambiado. Cada grupo guarda los huecos
+físicos de sus filas (ver ColumnStore.slots_of), que no cambian al mover filas.
+Cuando el almacén renumera sus huecos (`ColumnStore.slot_epoch` cambia) el índice
+se reconstruye; los grupos pendientes de validar se conservan. Si se conoce la
+traducción de huecos (`ColumnStore.compact`), basta con `remap`.
+"""
+from typing import Dict, Iterable, Set, Tuple
+
+import numpy as np
+
+GroupKey = Tuple[str, str]
+
+
+class LineGroupIndex:
+    def __init__(self):
+        self._groups: Dict[GroupKey, Set[int]] = {}
+        self._dirty: Set[GroupKey] = set()
+        self.epoch = -1
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def rebuild(self, epoch: int, slots: np.ndarray, in_tcs: np.ndarray, out_tcs: np.ndarray) -> None:
+        """Reconstruye los grupos desde cero. Los grupos sucios se conservan."""
+        self._groups = {}
+        self.add(slots, in_tcs, out_tcs, mark_dirty=False)
+        self.epoch = epoch
+
+    def remap(self, epoch: int, slot_map: np.ndarray) -> None:
+        """Traduce los huecos de cada grupo con `slot_map` (hueco antiguo -> nuevo) tras compactar."""
+        self._groups = {key: set(slot_map[np.fromiter(members, dtype=np.int64, count=len(members))].tolist())
+                        for key, members in self._groups.items()}
+        self.epoch = epoch
+
+    def add(self, slots: Iterable[int], in_tcs: Iterable[str], out_tcs: Iterable[str], mark_dirty: bool = True) -> None:
+        for slot, key in zip(slots, zip(in_tcs, out_tcs)):
+            self._groups.setdefault(key, set()).add(int(slot))
+            if mark_dirty:
+                self._dirty.add(key)
+
+    def discard(self, slots: Iterable[int], in_tcs: Iterable[str], out_tcs: Iterable[str]) -> None:
+        """Saca filas de sus grupos; el grupo que queda también debe revalidarse."""
+        for slot, key in zip(slots, zip(in_tcs, out_tcs)):
+            members = self._groups.get(key)
+            if members is None:
+                continue
+            members.discard(int(slot))
+            if not members:
+                del self._groups[key]
+            self._dirty.add(key)
+
+    def mark_dirty(self, in_tcs: Iterable[str], out_tcs: Iterable[str]) -> None:
+        self._dirty.update(zip(in_tcs, out_tcs))
+
+    def mark_keys_dirty(self, keys: Iterable[GroupKey]) -> None:
+        self._dirty.update(keys)
+
+    def mark_all_dirty(self) -> None:
+        self._dirty.update(self._groups)
+
+    def has_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def take_dirty(self) -> Dict[GroupKey, np.ndarray]:
+        """Devuelve los grupos sucios (clave -> huecos, vacío si el grupo ya no existe) y los limpia."""
+        dirty = {key: np.fromiter(self._groups.get(key, ()), dtype=np.int64) for key in self._dirty}
+        self._dirty = set()
+        return dirty
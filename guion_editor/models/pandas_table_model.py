@@ -1,11 +1,22 @@
 # guion_editor/models/pandas_table_model.py
+from contextlib import contextmanager
+
+import numpy as np
 import pandas as pd
 from PyQt6.QtCore import QAbstractTableModel, Qt, QModelIndex, pyqtSignal, QThread, QTimer, pyqtSlot
 from PyQt6.QtGui import QColor, QBrush
-from typing import Any, List, Dict, Optional, Tuple, Union
+from typing import Any, List, Dict, Optional, Set, Tuple, Union
 
 from guion_editor import constants as C
-from guion_editor.workers.validation_worker import ValidationWorker
+from guion_editor.models.column_store import ColumnStore, INVALID_MS
+from guion_editor.models.line_groups import LineGroupIndex
+from guion_editor.models.row_revisions import RowRevisions
+from guion_editor.models.validation_status import (
+    FLAG_BOOKMARK, FLAG_LINE_ERROR_DIALOGO, FLAG_LINE_ERROR_EUSKERA, FLAG_SCENE_ERROR, FLAG_SEARCH_HIT, FLAG_TIME_ERROR,
+    NUM_FLAG_STATES, RowFlagArray, ValidationStatusArray, validate_scenes, validate_times,
+)
+from guion_editor.workers.validation_worker import ValidationJob, ValidationWorker
+from guion_editor.utils.timecode import parse_tc_parts
 from guion_editor.utils.theme_manager import theme_manager
 
 # Colores de validación (apropiados para tema oscuro)
@@ -15,12 +26,23 @@ from guion_editor.utils.theme_manager import theme_manager
 # BOOKMARK_BG_COLOR = QColor(221, 211, 237, 40) # Lila claro con transparencia
 # LINE_ERROR_BG_COLOR = QColor(255, 165, 0, 60) # Naranja con algo de transparencia
 
+# Por encima de este número de tramos, un lote se notifica como un único rango
+MAX_BATCH_RANGES = 32
+
+# Guiones grandes: la vista recibe las filas por tramos (canFetchMore/fetchMore) al desplazarse
+LAZY_FETCH_MIN_ROWS = 5000
+FETCH_CHUNK_ROWS = 1000
+
+# Columnas cuyo cambio obliga a revalidar las líneas del grupo (IN, OUT) de la fila
+LINE_CONTENT_COLUMNS = (C.COL_PERSONAJE, C.COL_DIALOGO, C.COL_EUSKERA)
+LINE_ERROR_FLAGS = FLAG_LINE_ERROR_DIALOGO | FLAG_LINE_ERROR_EUSKERA
+
 # MAX_INTERVENTION_DURATION_MS removed, using C.MAX_INTERVENTION_DURATION_MS
 
 
 class PandasTableModel(QAbstractTableModel):
     layoutChangedSignal = pyqtSignal()
-    start_async_validation = pyqtSignal(pd.DataFrame)
+    start_async_validation = pyqtSignal()
 
 
     def __init__(self, column_map: Dict[int, str], view_column_names: List[str], parent=None):
@@ -29,16 +51,39 @@ class PandasTableModel(QAbstractTableModel):
         self.view_column_names = view_column_names
         self.df_column_order = C.DF_COLUMN_ORDER
 
-        self._dataframe = pd.DataFrame(columns=self.df_column_order)
-        self._ensure_df_structure()
+        # Los datos viven en arrays tipados por columna; el DataFrame se materializa bajo demanda.
+        self._store = ColumnStore()
+        self._df_cache: Optional[pd.DataFrame] = None
+        self._df_cache_version = -1
+        # Filas expuestas a la vista (rowCount); el resto sigue en el almacén para exportar, buscar, etc.
+        self._fetched_rows = 0
+        # >0 mientras hay un cambio de filas en curso: la vista no puede pedir más filas a la vez (fetchMore)
+        self._row_change_depth = 0
 
         self.df_col_to_view_col: Dict[str, int] = {
             df_name: view_idx for view_idx, df_name in column_map.items()
             if df_name != C.ROW_NUMBER_COL_IDENTIFIER and df_name != C.DURATION_COL_IDENTIFIER
         }
-        self._time_validation_status: Dict[int, Union[bool, str]] = {}
-        self._scene_validation_status: Dict[int, Union[bool, str]] = {}
-        self._line_validation_status: Dict[int, Dict[str, bool]] = {}
+        self._duration_view_col: Optional[int] = next(
+            (view_idx for view_idx, name in column_map.items() if name == C.DURATION_COL_IDENTIFIER), None)
+        self._time_validation_status = ValidationStatusArray()
+        self._scene_validation_status = ValidationStatusArray()
+        # Grupos (IN, OUT) pendientes de revalidar y último trabajo enviado al worker (sin resultado aún)
+        self._line_groups = LineGroupIndex()
+        self._line_job: Optional[ValidationJob] = None
+        self._validation_generation = 0
+        # Estado visual por fila (marcapáginas/errores) y pinceles de fondo precalculados por estado
+        self._row_flags = RowFlagArray()
+        self._row_revisions = RowRevisions()
+        self._background_brushes: Dict[str, List[Optional[QBrush]]] = {}
+        self._default_background_brushes: List[Optional[QBrush]] = []
+        self._rebuild_background_brushes()
+        theme_manager.themeChanged.connect(self._rebuild_background_brushes)
+
+        # Notificaciones dataChanged pendientes dentro de batch_changes(): (fila_ini, fila_fin, col_ini, col_fin)
+        self._batch_depth = 0
+        self._pending_changes: List[Tuple[int, int, int, int]] = []
+        self._pending_roles: Set[Qt.ItemDataRole] = set()
 
         # --- Async Validation Setup ---
         self.validation_thread = QThread()
@@ -46,7 +91,7 @@ class PandasTableModel(QAbstractTableModel):
         self.worker.moveToThread(self.validation_thread)
         
         # Connect signals
-        self.start_async_validation.connect(self.worker.validate)
+        self.start_async_validation.connect(self.worker.run_pending)
         self.worker.validation_finished.connect(self._on_validation_finished)
         self.validation_thread.start()
 
@@ -57,13 +102,32 @@ class PandasTableModel(QAbstractTableModel):
         self._validation_debounce_timer.timeout.connect(self._trigger_async_validation)
 
         
+    def _rebuild_background_brushes(self):
+        """Precalcula un QBrush por estado de fila para cada tipo de columna. Se rehace al cambiar de tema."""
+        line_error = QBrush(theme_manager.get_color("table_line_error_bg"))
+        invalid = QBrush(theme_manager.get_color("table_invalid_time_bg"))
+        bookmark = QBrush(theme_manager.get_color("table_bookmark_bg"))
+
+        def table(error_flag: int, error_brush: Optional[QBrush]) -> List[Optional[QBrush]]:
+            return [error_brush if state & error_flag else (bookmark if state & FLAG_BOOKMARK else None)
+                    for state in range(NUM_FLAG_STATES)]
+
+        time_brushes = table(FLAG_TIME_ERROR, invalid)
+        self._background_brushes = {
+            C.COL_IN: time_brushes,
+            C.COL_OUT: time_brushes,
+            C.COL_SCENE: table(FLAG_SCENE_ERROR, invalid),
+            C.COL_DIALOGO: table(FLAG_LINE_ERROR_DIALOGO, line_error),
+            C.COL_EUSKERA: table(FLAG_LINE_ERROR_EUSKERA, line_error),
+        }
+        self._default_background_brushes = table(0, None)
+
     def _convert_ms_to_duration_str(self, ms: int) -> str:
         if ms < 0:
             return "-.s"
         return f"{ms / 1000.0:.1f}s"
 
-    def _ensure_df_structure(self, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
-        target_df = df if df is not None else self._dataframe
+    def _ensure_df_structure(self, target_df: pd.DataFrame) -> pd.DataFrame:
 
         for df_col_name in self.df_column_order:
             if df_col_name not in target_df.columns:
@@ -90,33 +154,215 @@ class PandasTableModel(QAbstractTableModel):
         cols_in_df_ordered = [col for col in self.df_column_order if col in target_df.columns]
         other_cols = [col for col in target_df.columns if col not in self.df_column_order]
         final_df = target_df[cols_in_df_ordered + other_cols]
-
-        if df is None:
-            self._dataframe = final_df
-        return final_df
+        return final_df.reset_index(drop=True)
 
     def dataframe(self) -> pd.DataFrame:
-        return self._dataframe
+        """
+        DataFrame materializado a partir del almacenamiento columnar.
+        Se cachea hasta la siguiente modificación; debe tratarse como solo lectura
+        (para modificar datos usar setData / set_column_values / comandos).
+        """
+        if self._df_cache is None or self._df_cache_version != self._store.version:
+            self._df_cache = self._store.to_dataframe()
+            self._df_cache_version = self._store.version
+        return self._df_cache
 
     def set_dataframe(self, dataframe: pd.DataFrame):
+        self._pending_changes.clear()
+        self._pending_roles.clear()
+        self._row_change_depth += 1
         self.beginResetModel()
         if dataframe is not None:
-            self._dataframe = self._ensure_df_structure(dataframe.copy())
+            self._store = ColumnStore.from_dataframe(self._ensure_df_structure(dataframe.copy()))
         else:
-            self._dataframe = pd.DataFrame(columns=self.df_column_order)
-            self._dataframe = self._ensure_df_structure(self._dataframe)
-
-        self._time_validation_status.clear()
-        self._scene_validation_status.clear()
-        for i in range(len(self._dataframe)):
-            self._validate_in_out_for_row(i)
-            self._validate_scene_for_row(i)
+            self._store = ColumnStore()
+        self._df_cache = None
+        num_rows = len(self._store)
+        self._fetched_rows = num_rows if num_rows < LAZY_FETCH_MIN_ROWS else FETCH_CHUNK_ROWS
+
+        self._time_validation_status.reset(len(self._store))
+        self._scene_validation_status.reset(len(self._store))
+        self._row_flags.reset(len(self._store))
+        self._row_flags.assign(FLAG_BOOKMARK, self._store.column(C.COL_BOOKMARK))
+        self._row_revisions.reset(len(self._store))
+        self._validate_time_rows()
+        self._validate_scene_rows()
+        self._cancel_line_job(requeue=False)
+        self._line_groups = LineGroupIndex()
         self.revalidate_all_lines()
         self.endResetModel()
+        self._row_change_depth -= 1
         self.layoutChangedSignal.emit()
 
+    # --- Acceso directo a los datos (sin materializar el DataFrame) ---
+
+    def get_value(self, df_row_idx: int, df_col_name: str) -> Any:
+        """Valor de una celda en O(1). IN/OUT/texto como str, BOOKMARK como bool, ID como int o None."""
+        return self._store.get(df_row_idx, df_col_name)
+
+    def get_row_data(self, df_row_idx: int) -> Dict[str, Any]:
+        return self._store.row(df_row_idx)
+
+    def get_column_values(self, df_col_name: str) -> np.ndarray:
+        """Array de la columna en orden visible (de solo lectura; puede ser una vista interna)."""
+        return self._store.column(df_col_name)
+
+    def get_time_frames(self, df_col_name: str) -> np.ndarray:
+        """Frames de IN u OUT por fila; INVALID_FRAMES donde el timecode no es válido."""
+        return self._store.frames(df_col_name)
+
+    def get_time_ms(self, df_col_name: str) -> np.ndarray:
+        """Milisegundos de IN u OUT por fila; INVALID_MS donde el timecode no es válido."""
+        return self._store.ms(df_col_name)
+
+    def character_counts(self) -> Dict[str, int]:
+        """PERSONAJE -> número de intervenciones, sin recorrer las filas."""
+        return self._store.character_counts()
+
+    def character_names(self) -> List[str]:
+        """Nombres de personaje en uso (sin espacios sobrantes), ordenados."""
+        return sorted({name.strip() for name in self._store.character_counts() if name.strip()})
+
+    # --- Revisiones: qué filas han cambiado desde un momento dado ---
+
+    def revision(self) -> int:
+        """Revisión global: aumenta con cada cambio de datos o de estructura."""
+        return self._row_revisions.revision
+
+    def row_revision(self, df_row_idx: int) -> int:
+        """Revisión del último cambio en la fila (o de su inserción/desplazamiento)."""
+        return self._row_revisions[df_row_idx]
+
+    def changed_rows_since(self, revision: int) -> Optional[np.ndarray]:
+        """
+        Filas cuyo contenido ha cambiado después de `revision`. Devuelve None si desde
+        entonces se han insertado, borrado o movido filas: quien llama debe reconstruir
+        su caché desde cero.
+        """
+        return self._row_revisions.changed_since(revision)
+
+    def set_column_values(self, df_col_name: str, values: Any, df_row_indices: Optional[List[int]] = None):
+        """
+        Asigna en bloque una columna (completa o en las filas indicadas) y emite una
+        única notificación dataChanged que cubre el rango afectado.
+        """
+        if df_col_name not in self.df_column_order and not self._store.has_column(df_col_name):
+            return
+        rows = None if df_row_indices is None else np.asarray(df_row_indices, dtype=np.int64)
+        if rows is not None and rows.size == 0:
+            return
+        if df_col_name in [C.COL_IN, C.COL_OUT]:
+            self._detach_line_groups(rows)
+        self._store.set_column(df_col_name, values, rows)
+        self._row_revisions.touch(rows)
+        if df_col_name in [C.COL_IN, C.COL_OUT]:
+            self._attach_line_groups(rows)
+        elif df_col_name in LINE_CONTENT_COLUMNS:
+            self._mark_line_groups_dirty(rows)
+
+        if df_col_name in [C.COL_IN, C.COL_OUT]:
+            self._validate_time_rows(rows)
+        elif df_col_name == C.COL_SCENE:
+            self._validate_scene_rows(rows)
+        elif df_col_name == C.COL_BOOKMARK:
+            self._row_flags.assign(FLAG_BOOKMARK, self._store.column(C.COL_BOOKMARK, rows), rows)
+
+        view_col = self.get_view_column_index(df_col_name)
+        if view_col is None or len(self._store) == 0:
+            self.layoutChanged.emit()
+            return
+        first_row = 0 if rows is None else int(rows.min())
+        last_row = len(self._store) - 1 if rows is None else int(rows.max())
+        first_col, last_col = view_col, view_col
+        if df_col_name in [C.COL_IN, C.COL_OUT]:
+            duration_col = self._duration_view_col
+            if duration_col is not None:
+                first_col, last_col = min(first_col, duration_col), max(last_col, duration_col)
+        elif df_col_name == C.COL_BOOKMARK:
+            first_col, last_col = 0, self.columnCount() - 1
+        self._notify_data_changed(first_row, first_col, last_row, last_col,
+                                  [Qt.ItemDataRole.EditRole, Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole])
+
+    # --- Notificaciones agrupadas ---
+
+    @contextmanager
+    def batch_changes(self):
+        """
+        Agrupa las notificaciones dataChanged del bloque. Al salir se emiten los
+        rangos rectangulares mínimos (tramos de filas contiguas con la unión de
+        columnas y roles), o un único rango si hay demasiados tramos.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_pending_changes()
+
+    def _notify_data_changed(self, first_row: int, first_col: int, last_row: int, last_col: int,
+                             roles: List[Qt.ItemDataRole]):
+        if self._batch_depth > 0:
+            self._pending_changes.append((first_row, last_row, first_col, last_col))
+            self._pending_roles.update(roles)
+            return
+        if first_row >= self._fetched_rows: return
+        last_row = min(last_row, self._fetched_rows - 1)
+        self.dataChanged.emit(self.index(first_row, first_col), self.index(last_row, last_col), roles)
+
+    def _flush_pending_changes(self):
+        """Emite lo acumulado en el lote. Se llama también antes de insertar/borrar/mover filas."""
+        if not self._pending_changes: return
+        changes = np.array(self._pending_changes, dtype=np.int64)
+        roles = list(self._pending_roles)
+        self._pending_changes.clear()
+        self._pending_roles.clear()
+
+        num_rows = self._fetched_rows
+        changes = changes[changes[:, 0] < num_rows]
+        if changes.size == 0: return
+        first_col, last_col = int(changes[:, 2].min()), int(changes[:, 3].max())
+        changes = changes[np.argsort(changes[:, 0], kind='stable')]
+        starts, stops = changes[:, 0], np.minimum(changes[:, 1], num_rows - 1)
+        # Un tramo nuevo empieza donde la fila inicial no toca el máximo alcanzado hasta ahora
+        reach = np.maximum.accumulate(stops)
+        breaks = np.flatnonzero(starts[1:] > reach[:-1] + 1) + 1
+        run_starts = np.concatenate(([0], breaks))
+        run_stops = np.concatenate((breaks, [len(starts)])) - 1
+        if len(run_starts) > MAX_BATCH_RANGES:
+            ranges = [(int(starts[0]), int(reach[-1]))]
+        else:
+            ranges = zip(starts[run_starts].tolist(), reach[run_stops].tolist())
+        for first_row, last_row in ranges:
+            self.dataChanged.emit(self.index(first_row, first_col), self.index(last_row, last_col), roles)
+
     def rowCount(self, parent=QModelIndex()):
-        return len(self._dataframe)
+        return 0 if parent.isValid() else self._fetched_rows
+
+    def df_row_count(self) -> int:
+        """Filas del guion, incluidas las que la vista aún no ha cargado."""
+        return len(self._store)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._row_change_depth == 0 and self._fetched_rows < len(self._store)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid(): return
+        self._fetch_rows(min(len(self._store), self._fetched_rows + FETCH_CHUNK_ROWS))
+
+    def ensure_rows_fetched(self, df_row_idx: int):
+        """Carga en la vista las filas hasta `df_row_idx` (p. ej. antes de seleccionarla)."""
+        if df_row_idx >= self._fetched_rows:
+            self._fetch_rows(min(len(self._store), df_row_idx + 1 + FETCH_CHUNK_ROWS))
+
+    def _fetch_rows(self, new_fetched_rows: int):
+        if new_fetched_rows <= self._fetched_rows or self._row_change_depth: return
+        self._flush_pending_changes()
+        self._row_change_depth += 1
+        self.beginInsertRows(QModelIndex(), self._fetched_rows, new_fetched_rows - 1)
+        self._fetched_rows = new_fetched_rows
+        self.endInsertRows()
+        self._row_change_depth -= 1
 
     def columnCount(self, parent=QModelIndex()):
         return len(self.view_column_names)
@@ -129,7 +375,7 @@ class PandasTableModel(QAbstractTableModel):
         view_col_idx = index.column()
         col_identifier = self.column_map.get(view_col_idx)
 
-        if col_identifier is None:
+        if col_identifier is None or df_row_idx >= len(self._store):
             return None
 
         if col_identifier == C.ROW_NUMBER_COL_IDENTIFIER:
@@ -141,30 +387,26 @@ class PandasTableModel(QAbstractTableModel):
             
         if col_identifier == C.DURATION_COL_IDENTIFIER:
             if role == Qt.ItemDataRole.DisplayRole:
-                in_tc = self._dataframe.at[df_row_idx, C.COL_IN]
-                out_tc = self._dataframe.at[df_row_idx, C.COL_OUT]
-                in_ms = self._convert_tc_to_ms(in_tc)
-                out_ms = self._convert_tc_to_ms(out_tc)
-                if in_ms is not None and out_ms is not None:
-                    duration_ms = out_ms - in_ms
-                    return self._convert_ms_to_duration_str(duration_ms)
-                return "?.?s"
+                duration_text = self._store.cached_duration_text(df_row_idx)
+                if duration_text is None:
+                    in_ms = self._store.ms_at(df_row_idx, C.COL_IN)
+                    out_ms = self._store.ms_at(df_row_idx, C.COL_OUT)
+                    if in_ms != INVALID_MS and out_ms != INVALID_MS:
+                        duration_text = self._convert_ms_to_duration_str(out_ms - in_ms)
+                    else:
+                        duration_text = "?.?s"
+                    self._store.cache_duration_text(df_row_idx, duration_text)
+                return duration_text
             if role == Qt.ItemDataRole.TextAlignmentRole:
                 return Qt.AlignmentFlag.AlignCenter
             return None
 
         df_col_name = col_identifier
-        if df_row_idx >= len(self._dataframe) or df_col_name not in self._dataframe.columns:
-            return None
-
-        df_actual_col_idx = self._dataframe.columns.get_loc(df_col_name)
-        value = self._dataframe.iat[df_row_idx, df_actual_col_idx]
-        if pd.isna(value): value = ""
 
         if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
             if df_col_name == C.COL_BOOKMARK:
                 return ""
-            return str(value)
+            return self._store.display_text(df_row_idx, df_col_name)
 
         if role == Qt.ItemDataRole.ToolTipRole:
             if df_col_name in [C.COL_IN, C.COL_OUT]:
@@ -175,62 +417,59 @@ class PandasTableModel(QAbstractTableModel):
                 if status is not True: return status
 
         if role == Qt.ItemDataRole.BackgroundRole:
-            df_row_idx = index.row()
-            line_status = self._line_validation_status.get(df_row_idx)
-            if line_status:
-                is_col_valid = line_status.get(df_col_name, True)
-                if not is_col_valid: return QBrush(theme_manager.get_color("table_line_error_bg"))
-
-            if df_col_name in [C.COL_IN, C.COL_OUT]:
-                is_valid = self._time_validation_status.get(df_row_idx, True) is True
-                if not is_valid: return QBrush(theme_manager.get_color("table_invalid_time_bg"))
-            elif df_col_name == C.COL_SCENE:
-                is_valid = self._scene_validation_status.get(df_row_idx, True) is True
-                if not is_valid: return QBrush(theme_manager.get_color("table_invalid_time_bg"))
-
-            is_bookmarked = self._dataframe.at[df_row_idx, C.COL_BOOKMARK]
-            if is_bookmarked: return QBrush(theme_manager.get_color("table_bookmark_bg"))
+            brushes = self._background_brushes.get(df_col_name, self._default_background_brushes)
+            return brushes[self._row_flags[df_row_idx]]
         return None
 
     def setData(self, index: QModelIndex, value: Any, role=Qt.ItemDataRole.EditRole):
         if not index.isValid() or role != Qt.ItemDataRole.EditRole: return False
+        return self.set_cell_data(index.row(), index.column(), value)
 
-        df_row_idx = index.row()
-        view_col_idx = index.column()
+    def set_cell_data(self, df_row_idx: int, view_col_idx: int, value: Any) -> bool:
+        """Como setData, pero por índice de fila: vale también para filas que la vista aún no ha cargado."""
         col_identifier = self.column_map.get(view_col_idx)
         if col_identifier is None or col_identifier in [C.ROW_NUMBER_COL_IDENTIFIER, C.DURATION_COL_IDENTIFIER]:
             return False
 
         df_col_name = col_identifier
-        if df_row_idx >= len(self._dataframe) or df_col_name not in self._dataframe.columns:
+        if not 0 <= df_row_idx < len(self._store) or not self._store.has_column(df_col_name):
             return False
 
         try:
             if df_col_name == C.COL_BOOKMARK: new_typed_value = bool(value)
             elif df_col_name in [C.COL_IN, C.COL_OUT]:
-                parts = str(value).split(':')
-                if len(parts) == 4 and all(len(p) == 2 and p.isdigit() for p in parts): new_typed_value = str(value)
-                else: return False
+                # Misma regla que al cargar, desplazar o formatear timecodes (horas de más de dos cifras incluidas)
+                new_typed_value = str(value).strip()
+                if parse_tc_parts(new_typed_value) is None: return False
             else: new_typed_value = str(value)
         except (ValueError, TypeError): return False
 
-        df_actual_col_idx = self._dataframe.columns.get_loc(df_col_name)
-        current_df_value = self._dataframe.iat[df_row_idx, df_actual_col_idx]
-        
         if df_col_name == C.COL_BOOKMARK:
-            if current_df_value == new_typed_value: return True
-        else:
-            current_value_str = "" if pd.isna(current_df_value) else str(current_df_value)
-            if current_value_str == new_typed_value: return True
-
-        self._dataframe.iat[df_row_idx, df_actual_col_idx] = new_typed_value
-        self.dataChanged.emit(index, index, [Qt.ItemDataRole.EditRole, Qt.ItemDataRole.DisplayRole])
-
-        if df_col_name in [C.COL_IN, C.COL_OUT]: self.force_time_validation_update_for_row(df_row_idx)
+            if self._store.is_bookmarked(df_row_idx) == new_typed_value: return True
+        elif self._store.display_text(df_row_idx, df_col_name) == new_typed_value:
+            return True
+
+        row_array = np.array([df_row_idx])
+        if df_col_name in [C.COL_IN, C.COL_OUT]:
+            self._detach_line_groups(row_array)
+        self._store.set(df_row_idx, df_col_name, new_typed_value)
+        self._row_revisions.touch(row_array)
+        if df_col_name in [C.COL_IN, C.COL_OUT]:
+            self._attach_line_groups(row_array)
+        elif df_col_name in LINE_CONTENT_COLUMNS:
+            self._mark_line_groups_dirty(row_array)
+        self._notify_data_changed(df_row_idx, view_col_idx, df_row_idx, view_col_idx,
+                                  [Qt.ItemDataRole.EditRole, Qt.ItemDataRole.DisplayRole])
+
+        if df_col_name in [C.COL_IN, C.COL_OUT]:
+            if self._duration_view_col is not None:
+                self._notify_data_changed(df_row_idx, self._duration_view_col, df_row_idx, self._duration_view_col,
+                                          [Qt.ItemDataRole.DisplayRole])
+            self.force_time_validation_update_for_row(df_row_idx)
         if df_col_name == C.COL_SCENE: self.force_scene_validation_update_for_row(df_row_idx)
         if df_col_name == C.COL_BOOKMARK:
-            start_index, end_index = self.index(df_row_idx, 0), self.index(df_row_idx, self.columnCount() - 1)
-            self.dataChanged.emit(start_index, end_index, [Qt.ItemDataRole.BackgroundRole])
+            self._row_flags.assign(FLAG_BOOKMARK, np.array([new_typed_value]), row_array)
+            self._notify_data_changed(df_row_idx, 0, df_row_idx, self.columnCount() - 1, [Qt.ItemDataRole.BackgroundRole])
         return True
 
     def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
@@ -250,108 +489,149 @@ class PandasTableModel(QAbstractTableModel):
         return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
 
     def insert_row_data(self, df_row_idx_to_insert_at: int, row_data_dict: Dict[str, Any]) -> bool:
-        self.beginInsertRows(QModelIndex(), df_row_idx_to_insert_at, df_row_idx_to_insert_at)
+        df_row_idx_to_insert_at = max(0, min(df_row_idx_to_insert_at, len(self._store)))
+        return self.insert_rows([df_row_idx_to_insert_at], [row_data_dict])
+
+    def insert_rows(self, df_positions: List[int], rows: List[Dict[str, Any]]) -> bool:
+        """
+        Inserta varias filas. `df_positions` son los índices que ocuparán las filas
+        nuevas en la tabla final. Cada tramo contiguo se inserta con una sola
+        notificación beginInsertRows/endInsertRows.
+        """
+        if len(df_positions) != len(rows): return False
+        if not rows: return True
+        order = sorted(range(len(rows)), key=lambda k: df_positions[k])
+        positions = [df_positions[k] for k in order]
+        final_count = len(self._store) + len(rows)
+        if positions[0] < 0 or positions[-1] >= final_count or len(set(positions)) != len(positions):
+            return False
+
+        next_id = self.get_next_id()
+        new_rows: List[Dict[str, Any]] = []
+        for k in order:
+            new_row = self._normalize_new_row(rows[k], next_id)
+            if new_row[C.COL_ID] == next_id: next_id += 1
+            new_rows.append(new_row)
+
+        self._flush_pending_changes()
+        self._row_change_depth += 1
+        for run_start, run_stop in self._contiguous_runs(positions):
+            count = run_stop - run_start
+            # Las filas insertadas después de la zona cargada no se notifican: llegarán con fetchMore
+            visible = positions[run_start] <= self._fetched_rows
+            if visible:
+                self.beginInsertRows(QModelIndex(), positions[run_start], positions[run_stop - 1])
+            self._store.insert_block(positions[run_start], new_rows[run_start:run_stop])
+            self._time_validation_status.insert(positions[run_start], count)
+            self._scene_validation_status.insert(positions[run_start], count)
+            self._row_flags.insert(positions[run_start], count)
+            self._row_revisions.insert(positions[run_start], count)
+            new_rows_range = np.arange(positions[run_start], positions[run_stop - 1] + 1)
+            self._row_flags.assign(FLAG_BOOKMARK, self._store.column(C.COL_BOOKMARK, new_rows_range), new_rows_range)
+            self._validate_time_rows(new_rows_range)
+            self._validate_scene_rows(new_rows_range)
+            self._attach_line_groups(new_rows_range)
+            if visible:
+                self._fetched_rows += count
+                self.endInsertRows()
+        self._row_change_depth -= 1
+        return True
 
-        new_row_series = pd.Series(index=self.df_column_order, dtype=object)
+    def _normalize_new_row(self, row_data_dict: Dict[str, Any], default_id: int) -> Dict[str, Any]:
+        new_row: Dict[str, Any] = {}
         for col_name, value in row_data_dict.items():
             if col_name in self.df_column_order:
-                if col_name == C.COL_ID and pd.notna(value): new_row_series[col_name] = int(value)
-                elif col_name == C.COL_SCENE: new_row_series[col_name] = str(value)
-                elif col_name == C.COL_BOOKMARK: new_row_series[col_name] = bool(value)
-                else: new_row_series[col_name] = value
+                if col_name == C.COL_ID and pd.notna(value): new_row[col_name] = int(value)
+                elif col_name == C.COL_SCENE: new_row[col_name] = str(value)
+                elif col_name == C.COL_BOOKMARK: new_row[col_name] = bool(value)
+                else: new_row[col_name] = value
+            elif self._store.has_column(col_name):
+                new_row[col_name] = value
 
         for col_name in self.df_column_order:
-            if col_name not in new_row_series or pd.isna(new_row_series[col_name]):
-                if col_name == C.COL_ID: new_row_series[col_name] = self.get_next_id()
-                elif col_name in [C.COL_IN, C.COL_OUT]: new_row_series[col_name] = C.DEFAULT_TIMECODE
-                elif col_name == C.COL_SCENE: new_row_series[col_name] = C.DEFAULT_SCENE
-                elif col_name in [C.COL_EUSKERA, C.COL_OHARRAK]: new_row_series[col_name] = ""
-                elif col_name == C.COL_BOOKMARK: new_row_series[col_name] = False
-                else: new_row_series[col_name] = ""
-
-        new_row_df = pd.DataFrame([new_row_series])
-        if df_row_idx_to_insert_at >= len(self._dataframe):
-            self._dataframe = pd.concat([self._dataframe, new_row_df], ignore_index=True)
-        else:
-            df_part1, df_part2 = self._dataframe.iloc[:df_row_idx_to_insert_at], self._dataframe.iloc[df_row_idx_to_insert_at:]
-            self._dataframe = pd.concat([df_part1, new_row_df, df_part2], ignore_index=True)
-        self._dataframe = self._ensure_df_structure(self._dataframe)
-        self._rebuild_time_validation_after_insert(df_row_idx_to_insert_at)
-        self._validate_in_out_for_row(df_row_idx_to_insert_at)
-        self._rebuild_scene_validation_after_insert(df_row_idx_to_insert_at)
-        self._validate_scene_for_row(df_row_idx_to_insert_at)
-        self.endInsertRows()
-        # self._revalidate_all_lines()
-        return True
-
-    def _rebuild_time_validation_after_insert(self, inserted_df_idx: int):
-        new_status = {}
-        for old_idx, is_valid in self._time_validation_status.items():
-            new_status[old_idx if old_idx < inserted_df_idx else old_idx + 1] = is_valid
-        self._time_validation_status = new_status
-
-    def _rebuild_scene_validation_after_insert(self, inserted_df_idx: int):
-        new_status = {}
-        for old_idx, is_valid in self._scene_validation_status.items():
-            new_status[old_idx if old_idx < inserted_df_idx else old_idx + 1] = is_valid
-        self._scene_validation_status = new_status
+            if col_name not in new_row or pd.isna(new_row[col_name]):
+                if col_name == C.COL_ID: new_row[col_name] = default_id
+                elif col_name in [C.COL_IN, C.COL_OUT]: new_row[col_name] = C.DEFAULT_TIMECODE
+                elif col_name == C.COL_SCENE: new_row[col_name] = C.DEFAULT_SCENE
+                elif col_name in [C.COL_EUSKERA, C.COL_OHARRAK]: new_row[col_name] = ""
+                elif col_name == C.COL_BOOKMARK: new_row[col_name] = False
+                else: new_row[col_name] = ""
+        return new_row
+
+    @staticmethod
+    def _contiguous_runs(sorted_positions: List[int]) -> List[Tuple[int, int]]:
+        """Agrupa posiciones ordenadas en tramos consecutivos [inicio, fin) sobre la lista."""
+        runs = []
+        run_start = 0
+        for k in range(1, len(sorted_positions) + 1):
+            if k == len(sorted_positions) or sorted_positions[k] != sorted_positions[k - 1] + 1:
+                runs.append((run_start, k))
+                run_start = k
+        return runs
 
     def remove_row_by_df_index(self, df_row_idx: int) -> Optional[pd.Series]:
-        if 0 <= df_row_idx < len(self._dataframe):
-            self.beginRemoveRows(QModelIndex(), df_row_idx, df_row_idx)
-            removed_row_data = self._dataframe.iloc[df_row_idx].copy()
-            self._dataframe.drop(index=df_row_idx, inplace=True)
-            self._dataframe.reset_index(drop=True, inplace=True)
-            self._rebuild_time_validation_after_remove(df_row_idx)
-            self._rebuild_scene_validation_after_remove(df_row_idx)
-            self.endRemoveRows()
-            return removed_row_data
+        if 0 <= df_row_idx < len(self._store):
+            removed = self.remove_rows([df_row_idx])
+            return pd.Series(removed[0][1], dtype=object)
         return None
 
-    def _rebuild_time_validation_after_remove(self, removed_df_idx: int):
-        new_status = {}
-        for old_idx, is_valid in self._time_validation_status.items():
-            if old_idx < removed_df_idx: new_status[old_idx] = is_valid
-            elif old_idx > removed_df_idx: new_status[old_idx - 1] = is_valid
-        self._time_validation_status = new_status
-
-    def _rebuild_scene_validation_after_remove(self, removed_df_idx: int):
-        new_status = {}
-        for old_idx, is_valid in self._scene_validation_status.items():
-            if old_idx < removed_df_idx: new_status[old_idx] = is_valid
-            elif old_idx > removed_df_idx: new_status[old_idx - 1] = is_valid
-        self._scene_validation_status = new_status
+    def remove_rows(self, df_indices: List[int]) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Elimina varias filas. Cada tramo contiguo se borra con una sola notificación
+        beginRemoveRows/endRemoveRows, de abajo arriba. Devuelve (índice, datos) en
+        orden ascendente, listo para `insert_rows`.
+        """
+        indices = sorted({int(i) for i in df_indices if 0 <= int(i) < len(self._store)})
+        removed: List[Tuple[int, Dict[str, Any]]] = []
+        self._flush_pending_changes()
+        self._row_change_depth += 1
+        for run_start, run_stop in reversed(self._contiguous_runs(indices)):
+            first, last = indices[run_start], indices[run_stop - 1]
+            last_visible = min(last, self._fetched_rows - 1)
+            if first <= last_visible:
+                self.beginRemoveRows(QModelIndex(), first, last_visible)
+            self._detach_line_groups(np.arange(first, last + 1))
+            block = self._store.remove_block(first, last + 1)
+            self._time_validation_status.remove(first, last + 1)
+            self._scene_validation_status.remove(first, last + 1)
+            self._row_flags.remove(first, last + 1)
+            self._row_revisions.remove(first, last + 1)
+            if first <= last_visible:
+                self._fetched_rows -= last_visible - first + 1
+                self.endRemoveRows()
+            removed[:0] = list(zip(range(first, last + 1), block))
+        self._row_change_depth -= 1
+        if removed:
+            self._validation_debounce_timer.start()
+        return removed
 
     def move_df_row(self, source_df_idx: int, target_df_idx: int) -> bool:
-        if not (0 <= source_df_idx < len(self._dataframe)): return False
+        if not (0 <= source_df_idx < len(self._store)): return False
+        if not (0 <= target_df_idx < len(self._store)): return False
+        if source_df_idx == target_df_idx: return True
         qt_target_row = target_df_idx if source_df_idx > target_df_idx else target_df_idx + 1
+        self.ensure_rows_fetched(max(source_df_idx, target_df_idx))
+        self._flush_pending_changes()
         if not self.beginMoveRows(QModelIndex(), source_df_idx, source_df_idx, QModelIndex(), qt_target_row): return False
-        try:
-            temp_df_list = self._dataframe.to_dict(orient='records')
-            moved_item_data = temp_df_list.pop(source_df_idx)
-            temp_df_list.insert(target_df_idx, moved_item_data)
-            self._dataframe = pd.DataFrame(temp_df_list, columns=self.df_column_order)
-            self._dataframe = self._ensure_df_structure(self._dataframe)
-            for i in range(len(self._dataframe)):
-                self._validate_in_out_for_row(i)
-                self._validate_scene_for_row(i)
-        except Exception as e:
-            self.endMoveRows()
-            return False
+        self._row_change_depth += 1
+        self._store.move(source_df_idx, target_df_idx)
+        # Los estados de tiempo y escena son por fila: se desplazan igual que la fila
+        self._time_validation_status.move(source_df_idx, target_df_idx)
+        self._scene_validation_status.move(source_df_idx, target_df_idx)
+        self._row_flags.move(source_df_idx, target_df_idx)
+        self._row_revisions.move(source_df_idx, target_df_idx)
         self.endMoveRows()
-        # self._revalidate_all_lines()
+        self._row_change_depth -= 1
+        # Los grupos (IN, OUT) se indexan por hueco físico, que no cambia al mover la fila
         return True
 
     def get_next_id(self) -> int:
-        if self._dataframe.empty or C.COL_ID not in self._dataframe.columns or self._dataframe[C.COL_ID].isna().all(): return 0
-        numeric_ids = pd.to_numeric(self._dataframe[C.COL_ID], errors='coerce').dropna()
-        return int(numeric_ids.max()) + 1 if not numeric_ids.empty else 0
+        return self._store.next_id()
 
     def find_df_index_by_id(self, id_value: int) -> Optional[int]:
-        if C.COL_ID not in self._dataframe.columns or self._dataframe.empty: return None
-        df_ids_numeric = pd.to_numeric(self._dataframe[C.COL_ID], errors='coerce')
-        matches = self._dataframe.index[df_ids_numeric == id_value].tolist()
-        return matches[0] if matches else None
+        try: id_value = int(id_value)
+        except (ValueError, TypeError): return None
+        return self._store.row_of_id(id_value)
 
     def get_view_column_index(self, df_column_name: str) -> Optional[int]:
         return self.df_col_to_view_col.get(df_column_name)
@@ -361,105 +641,209 @@ class PandasTableModel(QAbstractTableModel):
         if col_identifier == C.ROW_NUMBER_COL_IDENTIFIER: return None
         return col_identifier
 
-    def _convert_tc_to_ms(self, time_code: str) -> Optional[int]:
-        try:
-            parts = time_code.split(':')
-            if len(parts) != 4: return None
-            h, m, s, f = map(int, parts)
-            if not (0 <= h < 100 and 0 <= m < 60 and 0 <= s < 60 and 0 <= f < 100): return None
-            return (h * 3600 + m * 60 + s) * 1000 + int(round((f / C.FPS) * 1000.0))
-        except (ValueError, TypeError): return None
+    def _validate_time_rows(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Revalida IN/OUT en `rows` (todas si es None). Devuelve las filas cuyo estado cambió."""
+        in_ms, out_ms = self._store.ms(C.COL_IN, rows), self._store.ms(C.COL_OUT, rows)
+        in_tc, out_tc = self._store.column(C.COL_IN, rows), self._store.column(C.COL_OUT, rows)
+        error_positions, messages = validate_times(in_ms, out_ms, in_tc, out_tc)
+        changed = self._time_validation_status.assign(rows, error_positions, messages)
+        self._row_flags.assign(FLAG_TIME_ERROR, self._time_validation_status.error_mask(rows), rows)
+        return changed
+
+    def _validate_scene_rows(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Revalida ESCENA en `rows` (todas si es None). Devuelve las filas cuyo estado cambió."""
+        scenes = self._store.column(C.COL_SCENE, rows)
+        error_positions, messages = validate_scenes(scenes)
+        changed = self._scene_validation_status.assign(rows, error_positions, messages)
+        self._row_flags.assign(FLAG_SCENE_ERROR, self._scene_validation_status.error_mask(rows), rows)
+        return changed
 
     def _validate_in_out_for_row(self, df_row_idx: int):
-        if 0 <= df_row_idx < len(self._dataframe):
-            in_tc = str(self._dataframe.at[df_row_idx, C.COL_IN])
-            out_tc = str(self._dataframe.at[df_row_idx, C.COL_OUT])
-            in_ms, out_ms = self._convert_tc_to_ms(in_tc), self._convert_tc_to_ms(out_tc)
-            validation_result: Union[bool, str] = True
-            if in_ms is None or out_ms is None: validation_result = "Formato de tiempo inválido (HH:MM:SS:FF)."
-            elif in_ms == 0 and out_ms == 0: validation_result = "Tiempos IN y OUT no pueden ser ambos cero."
-            else:
-                duration_ms = out_ms - in_ms
-                if duration_ms < 0: validation_result = f"Error: OUT ({out_tc}) es anterior a IN ({in_tc})."
-                elif duration_ms > C.MAX_INTERVENTION_DURATION_MS:
-                    validation_result = f"Duración ({duration_ms / 1000.0:.1f}s) excede el máximo ({C.MAX_INTERVENTION_DURATION_MS / 1000.0:.0f}s)."
-            self._time_validation_status[df_row_idx] = validation_result
-        elif df_row_idx in self._time_validation_status: del self._time_validation_status[df_row_idx]
+        if 0 <= df_row_idx < len(self._store):
+            self._validate_time_rows(np.array([df_row_idx]))
 
     def _validate_scene_for_row(self, df_row_idx: int):
-        if 0 <= df_row_idx < len(self._dataframe):
-            scene_value = str(self._dataframe.at[df_row_idx, C.COL_SCENE]).strip()
-            validation_result: Union[bool, str] = True
-            if not scene_value or scene_value.lower() == "nan": validation_result = "La escena no puede estar vacía."
-            else:
-                try: int(scene_value)
-                except ValueError: validation_result = f"La escena '{scene_value}' no es un número entero."
-            self._scene_validation_status[df_row_idx] = validation_result
-        elif df_row_idx in self._scene_validation_status: del self._scene_validation_status[df_row_idx]
+        if 0 <= df_row_idx < len(self._store):
+            self._validate_scene_rows(np.array([df_row_idx]))
+
+    def validate_all_times_and_scenes(self):
+        """
+        Revalida tiempos y escenas de toda la tabla de una vez y emite un único
+        dataChanged que abarca solo las filas cuyo estado ha cambiado.
+        """
+        if len(self._store) == 0: return
+        changed = np.union1d(self._validate_time_rows(), self._validate_scene_rows())
+        if changed.size == 0: return
+        view_cols = [c for c in (self.get_view_column_index(C.COL_SCENE), self.get_view_column_index(C.COL_IN),
+                                 self.get_view_column_index(C.COL_OUT)) if c is not None]
+        if not view_cols: return
+        self._notify_data_changed(int(changed[0]), min(view_cols), int(changed[-1]), max(view_cols),
+                                  [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole])
+
+    def time_error_rows(self) -> np.ndarray:
+        return self._time_validation_status.error_rows()
+
+    def scene_error_rows(self) -> np.ndarray:
+        return self._scene_validation_status.error_rows()
+
+    def get_time_validation_status(self, df_row_idx: int) -> Union[bool, str]:
+        return self._time_validation_status.get(df_row_idx)
+
+    def get_scene_validation_status(self, df_row_idx: int) -> Union[bool, str]:
+        return self._scene_validation_status.get(df_row_idx)
 
     def force_time_validation_update_for_row(self, df_row_idx: int):
-        if 0 <= df_row_idx < len(self._dataframe):
-            old_status, new_status = self._time_validation_status.get(df_row_idx, True), self._time_validation_status.get(df_row_idx, True)
+        if 0 <= df_row_idx < len(self._store):
+            old_status = self._time_validation_status.get(df_row_idx)
             self._validate_in_out_for_row(df_row_idx)
+            new_status = self._time_validation_status.get(df_row_idx)
             if old_status != new_status:
                 in_view_col, out_view_col = self.get_view_column_index(C.COL_IN), self.get_view_column_index(C.COL_OUT)
-                if in_view_col is not None:
-                    in_idx = self.index(df_row_idx, in_view_col)
-                    self.dataChanged.emit(in_idx, in_idx, [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole])
-                if out_view_col is not None:
-                    out_idx = self.index(df_row_idx, out_view_col)
-                    self.dataChanged.emit(out_idx, out_idx, [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole])
+                for view_col in (in_view_col, out_view_col):
+                    if view_col is not None:
+                        self._notify_data_changed(df_row_idx, view_col, df_row_idx, view_col,
+                                                  [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole])
 
     def force_scene_validation_update_for_row(self, df_row_idx: int):
-        if 0 <= df_row_idx < len(self._dataframe):
-            old_status, new_status = self._scene_validation_status.get(df_row_idx, True), self._scene_validation_status.get(df_row_idx, True)
+        if 0 <= df_row_idx < len(self._store):
+            old_status = self._scene_validation_status.get(df_row_idx)
             self._validate_scene_for_row(df_row_idx)
+            new_status = self._scene_validation_status.get(df_row_idx)
             if old_status != new_status:
                 scene_view_col = self.get_view_column_index(C.COL_SCENE)
                 if scene_view_col is not None:
-                    scene_idx = self.index(df_row_idx, scene_view_col)
-                    self.dataChanged.emit(scene_idx, scene_idx, [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole])
+                    self._notify_data_changed(df_row_idx, scene_view_col, df_row_idx, scene_view_col,
+                                              [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole])
         return None
     
     def cleanup(self):
         """Clean up thread on exit"""
+        self._cancel_line_job(requeue=False)
         self.validation_thread.quit()
         self.validation_thread.wait()
 
+    def line_error_rows(self) -> np.ndarray:
+        """Filas con exceso de líneas en DIÁLOGO o EUSKERA."""
+        return self._row_flags.rows_with(LINE_ERROR_FLAGS)
+
+    def has_line_error(self, df_row_idx: int) -> bool:
+        return 0 <= df_row_idx < len(self._store) and bool(self._row_flags[df_row_idx] & LINE_ERROR_FLAGS)
+
+    def flagged_row_count(self, mask: int) -> int:
+        """Número de filas con alguno de los flags de `mask` (FLAG_*), sin recorrer la tabla."""
+        return self._row_flags.count(mask)
+
+    def next_flagged_row(self, mask: int, from_row: int, backwards: bool = False) -> int:
+        """Siguiente (o anterior) fila marcada con `mask` a partir de `from_row`, cíclica. -1 si no hay."""
+        return self._row_flags.next_row(mask, from_row, backwards)
+
+    def set_search_hits(self, hits: np.ndarray) -> None:
+        """Marca como resultado de búsqueda las filas de la máscara booleana `hits`."""
+        self._row_flags.assign(FLAG_SEARCH_HIT, np.asarray(hits, dtype=bool))
+
+    def clear_search_hits(self) -> None:
+        if self._row_flags.count(FLAG_SEARCH_HIT):
+            self._row_flags.assign(FLAG_SEARCH_HIT, np.zeros(len(self._row_flags), dtype=bool))
+
+    def _sync_line_groups(self):
+        """Reconstruye el índice de grupos si el almacén ha renumerado sus huecos."""
+        if self._line_groups.epoch != self._store.slot_epoch:
+            self._line_groups.rebuild(self._store.slot_epoch, self._store.slots_of(),
+                                      self._store.column(C.COL_IN), self._store.column(C.COL_OUT))
+
+    def compact_storage(self):
+        """
+        Compacta el almacén (se llama tras guardar). El índice de grupos se traduce a los
+        huecos nuevos en vez de reconstruirse; con una validación en curso no se compacta,
+        porque su resultado viene indexado por los huecos actuales.
+        """
+        if self._line_job is not None:
+            return
+        self._sync_line_groups()
+        slot_map = self._store.compact()
+        if slot_map is not None:
+            self._line_groups.remap(self._store.slot_epoch, slot_map)
+
+    def _detach_line_groups(self, rows: Optional[np.ndarray]):
+        """Saca `rows` (todas si es None) de su grupo actual antes de cambiar su IN/OUT o borrarlas."""
+        self._sync_line_groups()
+        self._line_groups.discard(self._store.slots_of(rows), self._store.column(C.COL_IN, rows),
+                                  self._store.column(C.COL_OUT, rows))
+
+    def _attach_line_groups(self, rows: Optional[np.ndarray]):
+        self._sync_line_groups()
+        self._line_groups.add(self._store.slots_of(rows), self._store.column(C.COL_IN, rows),
+                              self._store.column(C.COL_OUT, rows))
+        self._validation_debounce_timer.start()
+
+    def _mark_line_groups_dirty(self, rows: Optional[np.ndarray]):
+        self._line_groups.mark_dirty(self._store.column(C.COL_IN, rows), self._store.column(C.COL_OUT, rows))
+        self._validation_debounce_timer.start()
+
     def revalidate_all_lines(self):
-        """Triggers the debounced async validation."""
+        """Marks every (IN, OUT) group dirty and triggers the debounced async validation."""
+        self._sync_line_groups()
+        self._line_groups.mark_all_dirty()
         self._validation_debounce_timer.start()
 
+    def request_line_validation(self):
+        """Triggers the debounced async validation of the groups changed since the last run."""
+        if self._line_groups.has_dirty():
+            self._validation_debounce_timer.start()
+
+    def _cancel_line_job(self, requeue: bool = True):
+        """Cancela el trabajo en curso o en cola; con `requeue` sus grupos vuelven a quedar pendientes."""
+        if self._line_job is None:
+            return
+        self._line_job.cancel()
+        if requeue:
+            self._line_groups.mark_keys_dirty(self._line_job.dirty_groups)
+        self._line_job = None
+
     def _trigger_async_validation(self):
-        """Captures current dataframe state and starts worker."""
-        if not self._dataframe.empty:
-            # Pass a copy to ensure thread safety
-            self.start_async_validation.emit(self._dataframe.copy())
-
-    @pyqtSlot(dict)
-    def _on_validation_finished(self, new_status: Dict[int, Dict[str, bool]]):
-        """Updates the model with results from the worker."""
-        old_error_indices = set(k for k, v in self._line_validation_status.items() if not v.get(C.COL_DIALOGO, True) or not v.get(C.COL_EUSKERA, True))
-        
-        self._line_validation_status = new_status
-        
-        new_error_indices = set(k for k, v in self._line_validation_status.items() if not v.get(C.COL_DIALOGO, True) or not v.get(C.COL_EUSKERA, True))
-        indices_to_update = old_error_indices.symmetric_difference(new_error_indices)
-        
-        if indices_to_update:
-            view_col_dialogo = self.get_view_column_index(C.COL_DIALOGO)
-            view_col_euskera = self.get_view_column_index(C.COL_EUSKERA)
-            
-            # Batch updates if possible, but simplest is loop
-            # Optimization: could use layoutChanged if too many, but that resets everything
-            for df_idx in indices_to_update:
-                if view_col_dialogo is not None:
-                    idx = self.index(df_idx, view_col_dialogo)
-                    if idx.isValid():
-                        self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.BackgroundRole])
-                if view_col_euskera is not None:
-                    idx = self.index(df_idx, view_col_euskera)
-                    if idx.isValid():
-                        self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.BackgroundRole])
-                
+        """Sends the dirty groups and a read-only snapshot of the needed columns to the worker."""
+        self._sync_line_groups()
+        if not self._line_groups.has_dirty():
+            return
+        # El trabajo anterior queda obsoleto: sus grupos se incluyen en este y su resultado se descartará
+        self._cancel_line_job()
+        self._validation_generation += 1
+        # Sin copias: el almacén copia una columna solo si se escribe en ella mientras el worker la lee
+        self._line_job = ValidationJob(self._validation_generation,
+                                       self._store.snapshot(ValidationWorker.REQUIRED_COLUMNS),
+                                       self._line_groups.take_dirty())
+        self.worker.submit(self._line_job)
+        self.start_async_validation.emit()
+
+    @pyqtSlot(object, object, object, object)
+    def _on_validation_finished(self, job: ValidationJob, slots: np.ndarray,
+                                dialogo_errors: np.ndarray, euskera_errors: np.ndarray):
+        """Applies the worker's delta: only the rows of the revalidated groups change."""
+        if self._line_job is None or job.generation != self._line_job.generation:
+            return  # Resultado de una generación anterior: sus grupos ya se reenviaron
+        self._line_job = None
+        if job.snapshot.slot_epoch != self._store.slot_epoch:
+            # Los huecos se han renumerado mientras el worker trabajaba: se repiten esos grupos
+            self._line_groups.mark_keys_dirty(job.dirty_groups)
+            self._validation_debounce_timer.start()
+            return
+
+        rows = self._store.rows_of_slots(slots)
+        alive = rows >= 0
+        rows = rows[alive]
+        if rows.size == 0:
+            return
+        old_flags = self._row_flags[rows] & LINE_ERROR_FLAGS
+        self._row_flags.assign(FLAG_LINE_ERROR_DIALOGO, dialogo_errors[alive], rows)
+        self._row_flags.assign(FLAG_LINE_ERROR_EUSKERA, euskera_errors[alive], rows)
+        changed_rows = np.sort(rows[(self._row_flags[rows] & LINE_ERROR_FLAGS) != old_flags])
+
+        if changed_rows.size:
+            view_cols = [c for c in (self.get_view_column_index(C.COL_DIALOGO), self.get_view_column_index(C.COL_EUSKERA))
+                         if c is not None]
+            if not view_cols: return
+            with self.batch_changes():
+                for df_idx in changed_rows.tolist():
+                    self._notify_data_changed(df_idx, min(view_cols), df_idx, max(view_cols), [Qt.ItemDataRole.BackgroundRole])
+
     # _check_group_for_column removed as it is now in ValidationWorker
@@ -0,0 +1,64 @@
+# guion_editor/models/row_revisions.py
+"""
+Revisiones por fila para saber qué ha cambiado desde un momento dado.
+
+Cada cambio incrementa un contador global y estampa su valor en las filas
+afectadas. Una caché guarda la revisión con la que se construyó y después pide
+solo las filas modificadas desde entonces (`changed_since`). Insertar, borrar o
+mover filas desplaza los índices, así que cualquier caché indexada por fila
+anterior a ese cambio debe reconstruirse: `changed_since` devuelve None.
+"""
+from typing import Optional
+
+import numpy as np
+
+
+class RowRevisions:
+    def __init__(self, num_rows: int = 0):
+        self.revision = 0
+        self.structure_revision = 0
+        self._rows = np.zeros(num_rows, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, row: int) -> int:
+        return int(self._rows[row])
+
+    def _bump(self) -> int:
+        self.revision += 1
+        return self.revision
+
+    def reset(self, num_rows: int) -> None:
+        self._rows = np.full(num_rows, self._bump(), dtype=np.int64)
+        self.structure_revision = self.revision
+
+    def touch(self, rows: Optional[np.ndarray] = None) -> int:
+        """Marca como modificadas `rows` (todas si es None) y devuelve la nueva revisión."""
+        self._rows[slice(None) if rows is None else rows] = self._bump()
+        return self.revision
+
+    def insert(self, pos: int, count: int = 1) -> None:
+        self._rows = np.insert(self._rows, pos, np.full(count, self._bump(), dtype=np.int64))
+        self.structure_revision = self.revision
+
+    def remove(self, start: int, stop: int) -> None:
+        self._rows = np.delete(self._rows, slice(start, stop))
+        self.structure_revision = self._bump()
+
+    def move(self, source: int, target: int) -> None:
+        # Todas las filas entre origen y destino cambian de índice
+        lo, hi = min(source, target), max(source, target)
+        self._rows[lo:hi + 1] = self._bump()
+        self.structure_revision = self.revision
+
+    def changed_since(self, revision: int) -> Optional[np.ndarray]:
+        """
+        Filas modificadas después de `revision`, en orden. None si desde entonces se han
+        insertado, borrado o movido filas (los índices antiguos ya no son válidos).
+        """
+        if self.structure_revision > revision:
+            return None
+        if revision >= self.revision:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self._rows > revision)
@@ -0,0 +1,284 @@
+# guion_editor/models/validation_status.py
+"""
+Estado de validación por fila guardado en arrays de numpy.
+
+Cada fila tiene un código entero: 0 significa "válida" y cualquier otro valor es
+el índice (base 1) de su mensaje de error en una tabla aparte. Los mensajes se
+internan, así que miles de filas con el mismo error comparten una sola cadena.
+Insertar o borrar filas es un np.insert/np.delete sobre el array de códigos.
+
+Las reglas de tiempos, escenas y límites de líneas se evalúan de forma vectorizada
+sobre columnas enteras (`validate_times`, `validate_scenes`, `validate_line_limits`).
+
+`RowFlagArray` resume en un byte por fila el estado visual (marcapáginas, errores y
+resultados de búsqueda) que usa el modelo para pintar el fondo de las celdas y para
+saltar a la siguiente fila marcada sin recorrer la tabla.
+"""
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from guion_editor import constants_logic as C
+from guion_editor.models.column_store import INVALID_MS
+
+STATUS_OK = 0
+
+FLAG_BOOKMARK = 1
+FLAG_TIME_ERROR = 2
+FLAG_SCENE_ERROR = 4
+FLAG_LINE_ERROR_DIALOGO = 8
+FLAG_LINE_ERROR_EUSKERA = 16
+FLAG_SEARCH_HIT = 32
+NUM_FLAG_STATES = 64
+
+ValidationResult = Union[bool, str]
+
+MSG_INVALID_TIME_FORMAT = "Formato de tiempo inválido (HH:MM:SS:FF)."
+MSG_BOTH_TIMES_ZERO = "Tiempos IN y OUT no pueden ser ambos cero."
+MSG_EMPTY_SCENE = "La escena no puede estar vacía."
+
+# Límites de líneas en un bloque simultáneo (mismo IN y OUT): hay error a partir de estos valores
+CHARACTER_LINE_LIMIT = 6
+GROUP_LINE_LIMIT = 11
+
+_INTEGER_RE = re.compile(r"[+-]?\d+(?:_\d+)*")
+
+
+def validate_times(in_ms: np.ndarray, out_ms: np.ndarray,
+                   in_tc: np.ndarray, out_tc: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    """
+    Aplica las reglas de IN/OUT a columnas enteras. Devuelve las posiciones con
+    error (orden ascendente) y su mensaje.
+    """
+    invalid = (in_ms == INVALID_MS) | (out_ms == INVALID_MS)
+    both_zero = ~invalid & (in_ms == 0) & (out_ms == 0)
+    duration = out_ms - in_ms
+    checked = ~invalid & ~both_zero
+    negative = checked & (duration < 0)
+    too_long = checked & (duration > C.MAX_INTERVENTION_DURATION_MS)
+
+    error_rows = np.flatnonzero(invalid | both_zero | negative | too_long)
+    messages: List[str] = []
+    for i in error_rows.tolist():
+        if invalid[i]: messages.append(MSG_INVALID_TIME_FORMAT)
+        elif both_zero[i]: messages.append(MSG_BOTH_TIMES_ZERO)
+        elif negative[i]: messages.append(f"Error: OUT ({out_tc[i]}) es anterior a IN ({in_tc[i]}).")
+        else: messages.append(f"Duración ({duration[i] / 1000.0:.1f}s) excede el máximo ({C.MAX_INTERVENTION_DURATION_MS / 1000.0:.0f}s).")
+    return error_rows, messages
+
+
+def validate_scenes(scenes: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    """La escena debe ser un entero no vacío. Devuelve posiciones con error y mensajes."""
+    stripped = [str(value).strip() for value in scenes]
+    empty = np.array([not value or value.lower() == "nan" for value in stripped], dtype=bool)
+    not_integer = np.array([_INTEGER_RE.fullmatch(value) is None for value in stripped], dtype=bool) & ~empty
+
+    error_rows = np.flatnonzero(empty | not_integer)
+    messages = [MSG_EMPTY_SCENE if empty[i] else f"La escena '{stripped[i]}' no es un número entero."
+                for i in error_rows.tolist()]
+    return error_rows, messages
+
+
+def validate_line_limits(group_codes: np.ndarray, characters: np.ndarray, texts: np.ndarray) -> np.ndarray:
+    """
+    Reglas de líneas para varios bloques simultáneos a la vez. `group_codes` indica
+    el bloque de cada fila. Devuelve una máscara de error alineada con las filas:
+    un personaje con CHARACTER_LINE_LIMIT líneas o más marca sus filas; si ningún
+    personaje se pasa, un bloque con GROUP_LINE_LIMIT líneas o más marca todas.
+    """
+    if len(texts) == 0:
+        return np.zeros(0, dtype=bool)
+    text = pd.Series(texts, dtype=object).astype(str)
+    lines = np.where(text.str.strip().str.len().to_numpy() > 0, text.str.count("\n").to_numpy() + 1, 0)
+    frame = pd.DataFrame({"group": group_codes, "character": pd.Series(characters, dtype=object).astype(str),
+                          "lines": lines})
+    character_lines = frame.groupby(["group", "character"], sort=False)["lines"].transform("sum").to_numpy()
+    character_error = character_lines >= CHARACTER_LINE_LIMIT
+    by_group = frame.assign(character_error=character_error).groupby("group", sort=False)
+    group_has_character_error = by_group["character_error"].transform("any").to_numpy()
+    group_lines = by_group["lines"].transform("sum").to_numpy()
+    return character_error | (~group_has_character_error & (group_lines >= GROUP_LINE_LIMIT))
+
+
+class ValidationStatusArray:
+    def __init__(self, num_rows: int = 0):
+        self._codes = np.zeros(num_rows, dtype=np.int32)
+        self._messages: List[str] = []
+        self._message_codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def reset(self, num_rows: int) -> None:
+        """Marca todas las filas como válidas y vacía la tabla de mensajes."""
+        self._codes = np.zeros(num_rows, dtype=np.int32)
+        self._messages = []
+        self._message_codes = {}
+
+    def _code_for(self, result: ValidationResult) -> int:
+        if result is True:
+            return STATUS_OK
+        message = str(result)
+        code = self._message_codes.get(message)
+        if code is None:
+            self._messages.append(message)
+            code = len(self._messages)
+            self._message_codes[message] = code
+        return code
+
+    def set(self, row: int, result: ValidationResult) -> None:
+        self._codes[row] = self._code_for(result)
+
+    def get(self, row: int, default: ValidationResult = True) -> ValidationResult:
+        """Devuelve True si la fila es válida, o el mensaje de error."""
+        if not 0 <= row < len(self._codes):
+            return default
+        code = self._codes[row]
+        return True if code == STATUS_OK else self._messages[code - 1]
+
+    def assign(self, rows: Optional[np.ndarray], error_positions: np.ndarray, messages: List[str]) -> np.ndarray:
+        """
+        Sustituye el estado de `rows` (todas si es None). `error_positions` son
+        posiciones dentro de `rows`. Devuelve las filas cuyo estado ha cambiado.
+        """
+        count = len(self._codes) if rows is None else len(rows)
+        new_codes = np.zeros(count, dtype=np.int32)
+        if len(error_positions):
+            new_codes[error_positions] = [self._code_for(message) for message in messages]
+        if rows is None:
+            changed = np.flatnonzero(self._codes != new_codes)
+            self._codes = new_codes
+            return changed
+        changed = rows[self._codes[rows] != new_codes]
+        self._codes[rows] = new_codes
+        return changed
+
+    def is_valid(self, row: int) -> bool:
+        return not (0 <= row < len(self._codes)) or self._codes[row] == STATUS_OK
+
+    def error_mask(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Máscara booleana de error para `rows` (todas si es None)."""
+        return self._codes != STATUS_OK if rows is None else self._codes[rows] != STATUS_OK
+
+    def error_rows(self) -> np.ndarray:
+        """Índices ordenados de las filas con error."""
+        return np.flatnonzero(self._codes)
+
+    def error_count(self) -> int:
+        return int(np.count_nonzero(self._codes))
+
+    def insert(self, pos: int, count: int = 1) -> None:
+        """Abre `count` filas válidas a partir de `pos`."""
+        self._codes = np.insert(self._codes, pos, np.zeros(count, dtype=np.int32))
+
+    def remove(self, start: int, stop: int) -> None:
+        """Elimina las filas [start, stop)."""
+        self._codes = np.delete(self._codes, slice(start, stop))
+
+    def move(self, source: int, target: int) -> None:
+        """Desplaza el estado de una fila igual que se mueve la fila (solo el tramo afectado)."""
+        code = self._codes[source]
+        if source < target:
+            self._codes[source:target] = self._codes[source + 1:target + 1]
+        else:
+            self._codes[target + 1:source + 1] = self._codes[target:source]
+        self._codes[target] = code
+
+
+class RowFlagArray:
+    """
+    Un byte de flags por fila (FLAG_*), desplazado igual que las filas.
+
+    Lleva además cuántas filas hay en cada combinación de flags, de modo que contar
+    las filas con una máscara no depende del tamaño de la tabla, y guarda las filas
+    ordenadas de cada máscara consultada para buscar la siguiente con searchsorted.
+    """
+
+    _STATES = np.arange(NUM_FLAG_STATES)
+
+    def __init__(self, num_rows: int = 0):
+        self.reset(num_rows)
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def __getitem__(self, row: int) -> int:
+        return self._flags[row]
+
+    def reset(self, num_rows: int) -> None:
+        self._flags = np.zeros(num_rows, dtype=np.uint8)
+        self._state_counts = np.zeros(NUM_FLAG_STATES, dtype=np.int64)
+        self._state_counts[0] = num_rows
+        self._rows_cache: Dict[int, np.ndarray] = {}
+
+    def _count_states(self, flags: np.ndarray) -> np.ndarray:
+        return np.bincount(flags, minlength=NUM_FLAG_STATES)
+
+    def assign(self, flag: int, values: np.ndarray, rows: Optional[np.ndarray] = None) -> None:
+        """Activa/desactiva `flag` en `rows` (todas si es None) según el array booleano `values`."""
+        target = slice(None) if rows is None else rows
+        current = self._flags[target]
+        updated = np.where(values, current | flag, current & ~np.uint8(flag)).astype(np.uint8)
+        if np.array_equal(current, updated):
+            return
+        self._state_counts += self._count_states(updated) - self._count_states(current)
+        self._flags[target] = updated
+        for mask in [m for m in self._rows_cache if m & flag]:
+            del self._rows_cache[mask]
+
+    def count(self, mask: int) -> int:
+        """Número de filas con alguno de los flags de `mask`."""
+        return int(self._state_counts[(self._STATES & mask) != 0].sum())
+
+    def rows_with(self, mask: int) -> np.ndarray:
+        """Filas (ordenadas) con alguno de los flags de `mask`. No modificar el array devuelto."""
+        rows = self._rows_cache.get(mask)
+        if rows is None:
+            rows = np.flatnonzero(self._flags & mask) if self.count(mask) else np.empty(0, dtype=np.intp)
+            self._rows_cache[mask] = rows
+        return rows
+
+    def next_row(self, mask: int, row: int, backwards: bool = False) -> int:
+        """
+        Siguiente fila después de `row` (o anterior si `backwards`) con alguno de los
+        flags de `mask`, dando la vuelta al llegar al final. -1 si no hay ninguna.
+        """
+        rows = self.rows_with(mask)
+        if rows.size == 0:
+            return -1
+        if backwards:
+            pos = int(np.searchsorted(rows, row, side='left')) - 1
+            return int(rows[pos])  # pos == -1 da la vuelta al último
+        pos = int(np.searchsorted(rows, row, side='right'))
+        return int(rows[pos if pos < rows.size else 0])
+
+    def insert(self, pos: int, count: int = 1) -> None:
+        self._flags = np.insert(self._flags, pos, np.zeros(count, dtype=np.uint8))
+        self._state_counts[0] += count
+        for mask, rows in self._rows_cache.items():
+            self._rows_cache[mask] = np.where(rows >= pos, rows + count, rows)
+
+    def remove(self, start: int, stop: int) -> None:
+        self._state_counts -= self._count_states(self._flags[start:stop])
+        self._flags = np.delete(self._flags, slice(start, stop))
+        for mask, rows in self._rows_cache.items():
+            rows = rows[(rows < start) | (rows >= stop)]
+            self._rows_cache[mask] = np.where(rows >= stop, rows - (stop - start), rows)
+
+    def move(self, source: int, target: int) -> None:
+        flags = self._flags[source]
+        if source < target:
+            self._flags[source:target] = self._flags[source + 1:target + 1]
+        else:
+            self._flags[target + 1:source + 1] = self._flags[target:source]
+        self._flags[target] = flags
+        lo, hi = min(source, target), max(source, target)
+        shift = -1 if source < target else 1
+        for mask in list(self._rows_cache):
+            if mask & flags:
+                del self._rows_cache[mask]
+            else:
+                rows = self._rows_cache[mask]
+                self._rows_cache[mask] = np.where((rows >= lo) & (rows <= hi), rows + shift, rows)
@@ -3,38 +3,14 @@ import re
 from docx import Document
 import logging
 from guion_editor import constants_logic as C
+from guion_editor.utils.text_wrap import wrap_text
+from guion_editor.utils.timecode import frames_to_tc, tc_to_frames
 
 def ajustar_dialogo(dialogo, max_chars=C.DEFAULT_LINE_LENGTH):
-    if not dialogo:
-        return ""
-
-    # Usamos split() sin argumentos. Esto divide el texto por cualquier
-    # espacio en blanco (incluyendo \n, \t) y elimina los vacios.
-    # Asi eliminamos los saltos de linea originales indeseados.
-    palabras = dialogo.split()
-
-    if not palabras:
-        return ""
-
-    lineas_ajustadas = []
-    linea_actual = ""
-
-    for palabra in palabras:
-        if not linea_actual:
-            linea_actual = palabra
-        # Comprobamos si al anadir la palabra superamos el limite
-        elif contar_caracteres(linea_actual + " " + palabra) <= max_chars:
-            linea_actual += " " + palabra
-        else:
-            # Si supera, guardamos la linea actual y empezamos una nueva
-            lineas_ajustadas.append(linea_actual)
-            linea_actual = palabra
-    
-    # Anadir la ultima linea pendiente
-    if linea_actual:
-        lineas_ajustadas.append(linea_actual)
-
-    return "\n".join(lineas_ajustadas)
+    # El texto se divide por cualquier espacio en blanco (incluyendo \n, \t),
+    # asi se eliminan los saltos de linea originales indeseados.
+    # Las acotaciones entre parentesis no cuentan para el limite.
+    return wrap_text(dialogo, max_chars)
 
 def contar_caracteres(dialogo):
     # Eliminar contenido entre parentesis para el conteo
@@ -100,29 +76,3 @@ def guardar_dialogo(guion, personaje, dialogo_acumulado):
         C.COL_PERSONAJE: personaje,
         C.COL_DIALOGO: dialogo_ajustado
     })
-
-def tc_to_frames(tc: str, fps: int) -> int | None:
-    tc = str(tc).strip()
-    if not tc or tc.lower() == "nan":
-        return None
-    parts = tc.split(":")
-    if len(parts) != 4:
-        return None
-    try:
-        h, m, s, f = [int(p) for p in parts]
-        return ((h * 3600 + m * 60 + s) * fps) + f
-    except (ValueError, TypeError):
-        return None
-
-def frames_to_tc(frames: int, fps: int) -> str:
-    if frames is None:
-        return ""
-    if frames < 0:
-        frames = 0
-    
-    s_total, f = divmod(frames, fps)
-    h, s_rem = divmod(s_total, 3600)
-    m, s = divmod(s_rem, 60)
-    
-    h_str = f"{h:02d}" if h < 100 else str(h)
-    return f"{h_str}:{m:02d}:{s:02d}:{f:02d}"
\ No newline at end of file
@@ -130,7 +130,7 @@ class FileIOHandler:
 
     def export_excel(self) -> bool:
         """Abre el diálogo para exportar a Excel y realiza la operación."""
-        if self.tw.pandas_model.dataframe().empty:
+        if self.tw.pandas_model.df_row_count() == 0:
             QMessageBox.information(self.tw, "Exportar", "No hay datos para exportar.")
             return False
         
@@ -145,6 +145,7 @@ class FileIOHandler:
                 self.tw.current_script_name = os.path.basename(path)
                 self.tw.current_script_path = path
                 self.tw.undo_stack.setClean()
+                self.tw.pandas_model.compact_storage()
                 if self.tw.main_window:
                     self.tw.main_window.add_to_recent_files(path)
                 return True
@@ -156,7 +157,7 @@ class FileIOHandler:
 
     def save_as_json(self) -> bool:
         """Abre el diálogo "Guardar como..." para JSON."""
-        if self.tw.pandas_model.dataframe().empty:
+        if self.tw.pandas_model.df_row_count() == 0:
             QMessageBox.information(self, "Guardar", "No hay datos para guardar.")
             return False
             
@@ -171,6 +172,7 @@ class FileIOHandler:
                 self.tw.current_script_name = os.path.basename(path)
                 self.tw.current_script_path = path
                 self.tw.undo_stack.setClean()
+                self.tw.pandas_model.compact_storage()
                 if self.tw.main_window:
                     self.tw.main_window.add_to_recent_files(path)
                 return True
@@ -6,6 +6,7 @@ from typing import Tuple, Dict, Any
 from openpyxl.styles import PatternFill
 
 from .dialog_utils import leer_guion
+from .timecode import ms_to_srt, parse_tc_array, tc_to_ms
 from guion_editor import constants_logic as C
 
 class GuionManager:
@@ -138,30 +139,23 @@ class GuionManager:
             raise
 
     def _convert_tc_to_srt_format(self, tc: str) -> str:
-        try:
-            parts = tc.split(':')
-            h, m, s, f = map(int, parts)
-            ms_total = (h * 3600 + m * 60 + s) * 1000 + int(round((f / C.FPS) * 1000.0))
-            s_total, mmm = divmod(ms_total, 1000)
-            h_srt, s_rem = divmod(s_total, 3600)
-            m_srt, s_srt = divmod(s_rem, 60)
-            return f"{int(h_srt):02d}:{int(m_srt):02d}:{int(s_srt):02d},{int(mmm):03d}"
-        except Exception:
-            return "00:00:00,000"
+        ms = tc_to_ms(tc)
+        return "00:00:00,000" if ms is None else ms_to_srt(ms)
 
     def save_to_srt(self, path: str, dataframe: pd.DataFrame, column_to_export: str = C.COL_DIALOGO) -> None:
         if column_to_export not in dataframe.columns:
             raise ValueError(f"La columna '{column_to_export}' no se encuentra en el guion.")
+        # Timecodes de toda la columna de una vez; los inválidos (INVALID_MS) salen como 00:00:00,000
+        _, in_ms = parse_tc_array(dataframe[C.COL_IN].to_numpy(dtype=object))
+        _, out_ms = parse_tc_array(dataframe[C.COL_OUT].to_numpy(dtype=object))
+        dialogues = dataframe[column_to_export].astype(str).str.strip()
+        has_times = (dataframe[C.COL_IN].notna() & dataframe[C.COL_OUT].notna()).tolist()
         try:
             with open(path, 'w', encoding='utf-8') as f:
                 srt_index = 1
-                for _, row in dataframe.iterrows():
-                    in_tc, out_tc = row[C.COL_IN], row[C.COL_OUT]
-                    dialogue = str(row[column_to_export]).strip()
-                    if dialogue and pd.notna(in_tc) and pd.notna(out_tc):
-                        start_srt = self._convert_tc_to_srt_format(in_tc)
-                        end_srt = self._convert_tc_to_srt_format(out_tc)
-                        f.write(f"{srt_index}\n{start_srt} --> {end_srt}\n{dialogue}\n\n")
+                for dialogue, ok, start, end in zip(dialogues.tolist(), has_times, in_ms.tolist(), out_ms.tolist()):
+                    if dialogue and ok:
+                        f.write(f"{srt_index}\n{ms_to_srt(start)} --> {ms_to_srt(end)}\n{dialogue}\n\n")
                         srt_index += 1
         except Exception as e:
             raise
@@ -1,9 +1,11 @@
 # guion_editor/utils/srt_processor.py
 import pandas as pd
 import re
-from math import floor
 import unicodedata
 
+from guion_editor.utils.text_wrap import PARENS_LITERAL, wrap_lines
+from guion_editor.utils.timecode import seconds_to_srt, tc_array_to_seconds
+
 class SRTProcessor:
     DEFAULT_CONFIG = {
         "FPS": 25,
@@ -49,18 +51,16 @@ class SRTProcessor:
                 return None
         return None
 
+    def _parse_timecodes(self, column: pd.Series) -> pd.Series:
+        # 'HH:MM:SS:FF' en bloque; el resto de formatos que admite _parse_timecode, uno a uno
+        seconds = pd.Series(tc_array_to_seconds(column.to_numpy(dtype=object), self.FPS), index=column.index)
+        pending = seconds.isna()
+        if pending.any():
+            seconds[pending] = column[pending].map(self._parse_timecode)
+        return seconds
+
     def _fmt_srt_timestamp(self, seconds: float) -> str:
-        if seconds is None or seconds < 0: seconds = 0.0
-        total_seconds_int = int(floor(seconds))
-        fraction = seconds - total_seconds_int
-        ms = int(round(fraction * 1000))
-        if ms >= 1000:
-            total_seconds_int += 1
-            ms = 0
-        hh = total_seconds_int // 3600
-        mm = (total_seconds_int % 3600) // 60
-        ss = total_seconds_int % 60
-        return f"{hh:02d}:{mm:02d}:{ss:02d},{ms:03d}"
+        return seconds_to_srt(seconds)
 
     def _clean_text(self, text: str) -> str:
         if text is None: return ""
@@ -84,17 +84,7 @@ class SRTProcessor:
         return parts
 
     def _word_wrap(self, text: str, width: int):
-        words = text.split()
-        lines = []
-        cur = ""
-        for w in words:
-            if not cur: cur = w
-            elif len(cur) + 1 + len(w) <= width: cur += " " + w
-            else:
-                lines.append(cur)
-                cur = w
-        if cur: lines.append(cur)
-        return lines
+        return list(wrap_lines(text, width, PARENS_LITERAL))
 
     def _solve_global_overlaps(self, records: list[dict]) -> list[dict]:
         if not records: return []
@@ -172,8 +162,8 @@ class SRTProcessor:
         return srt_entries
 
     def generate_srt_string(self, df, col_mapping, char_color_mapping):
-        starts = df[col_mapping["IN"]].apply(self._parse_timecode)
-        ends   = df[col_mapping["OUT"]].apply(self._parse_timecode)
+        starts = self._parse_timecodes(df[col_mapping["IN"]])
+        ends   = self._parse_timecodes(df[col_mapping["OUT"]])
         texts_clean = df[col_mapping["DIALOGO"]].astype(str).apply(self._clean_text)
         
         all_temp_records = []
@@ -1,11 +1,12 @@
 # guion_editor/utils/takeo_optimizer_logic.py
 import pandas as pd
-import re
 import traceback
 from collections import defaultdict
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from guion_editor import constants_logic as C
+from guion_editor.utils.text_wrap import PARENS_AS_ONE, count_lines_many, wrap_lines
+from guion_editor.utils.timecode import tc_array_to_seconds, tc_to_seconds
 import logging
 
 class TakeoOptimizerLogic:
@@ -46,26 +47,31 @@ class TakeoOptimizerLogic:
     def parse_time(self, time_str):
         parts = str(time_str).split(':')
         if len(parts) == 3: hh, mm, ss = map(int, parts); return hh * 3600 + mm * 60 + ss
-        elif len(parts) == 4: hh, mm, ss, ff = map(int, parts); return hh * 3600 + mm * 60 + ss + ff / self.frame_rate
-        else: raise ValueError(f"Formato de tiempo inválido: '{time_str}'. Se esperaba HH:MM:SS o HH:MM:SS:FF.")
-    
-    def _get_effective_len(self, text):
-        parentheticals = re.findall(r'\([^)]*\)', text)
-        return len(text) - sum(len(p) for p in parentheticals) + len(parentheticals)
+        seconds = tc_to_seconds(time_str, self.frame_rate) if len(parts) == 4 else None
+        if seconds is None: raise ValueError(f"Formato de tiempo inválido: '{time_str}'. Se esperaba HH:MM:SS o HH:MM:SS:FF.")
+        return seconds
 
+    def parse_times(self, column: pd.Series) -> pd.Series:
+        """parse_time sobre una columna: los 'HH:MM:SS:FF' de una vez; el resto (y los errores) por parse_time."""
+        seconds = pd.Series(tc_array_to_seconds(column.to_numpy(dtype=object), self.frame_rate), index=column.index)
+        pending = seconds.isna()
+        if pending.any():
+            seconds[pending] = column[pending].map(self.parse_time)
+        return seconds
+    
     def expand_dialogue(self, text):
-        lines, current_line = [], ""
-        for word in str(text).split():
-            if not current_line: current_line = word
-            elif self._get_effective_len(f"{current_line} {word}") > self.max_chars_per_line: lines.append(current_line); current_line = word
-            else: current_line += " " + word
-        if current_line: lines.append(current_line)
-        return lines
+        # Cada acotación (...) cuenta como un solo carácter
+        return list(wrap_lines(str(text), self.max_chars_per_line, PARENS_AS_ONE))
 
     def _check_individual_interventions(self, script_data, dialogue_source_column: str):
         self.problematic_interventions_report = []
         if script_data is None: return
-        for index, row in script_data.iterrows():
+        line_counts = count_lines_many(script_data[dialogue_source_column].astype(str), self.max_chars_per_line, PARENS_AS_ONE)
+        # Los timecodes inválidos quedan en NaN y pasan por parse_time para conservar su mensaje de error
+        in_seconds = tc_array_to_seconds(script_data[C.COL_IN].to_numpy(dtype=object), self.frame_rate)
+        out_seconds = tc_array_to_seconds(script_data[C.COL_OUT].to_numpy(dtype=object), self.frame_rate)
+        durations = (out_seconds - in_seconds).tolist()
+        for (index, row), num_lines, duration in zip(script_data.iterrows(), line_counts, durations):
             dialogue_text = str(row[dialogue_source_column])
             details = {
                 C.COL_SCENE: row.get(C.COL_SCENE, 'N/A'),
@@ -75,10 +81,10 @@ class TakeoOptimizerLogic:
                 f"{dialogue_source_column}_Snippet": dialogue_text[:70] + "..."
             }
             try:
-                duration = self.parse_time(row[C.COL_OUT]) - self.parse_time(row[C.COL_IN])
+                if duration != duration:
+                    duration = self.parse_time(row[C.COL_OUT]) - self.parse_time(row[C.COL_IN])
                 if duration > self.max_duration:
                     self.problematic_interventions_report.append({**details, "PROBLEMA_TIPO": "Duración Excesiva", "DETALLE": f"Duración ({duration:.2f}s) > max ({self.max_duration}s)."})
-                num_lines = len(self.expand_dialogue(dialogue_text))
                 if num_lines > self.max_lines_per_take:
                     self.problematic_interventions_report.append({**details, "PROBLEMA_TIPO": "Líneas Excesivas", "DETALLE": f"Líneas ({num_lines}) > max ({self.max_lines_per_take})."})
             except Exception as e:
@@ -187,7 +193,7 @@ class TakeoOptimizerLogic:
         df = pd.DataFrame(rows)
         if dialogue_source_column not in df.columns:
             df[dialogue_source_column] = ""
-        df['sort_key'] = df[C.COL_IN].apply(self.parse_time)
+        df['sort_key'] = self.parse_times(df[C.COL_IN])
         df['take_start_time'] = df.groupby('TAKE')['sort_key'].transform('min')
         df_sorted = df.sort_values(by=["take_start_time", "sort_key"])
         chronological_take_order = df_sorted['TAKE'].unique()
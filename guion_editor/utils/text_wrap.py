@@ -0,0 +1,119 @@
+# guion_editor/utils/text_wrap.py
+"""
+Ajuste de texto en líneas (greedy por palabras) común a todo el programa.
+
+El texto se normaliza a palabras separadas por un espacio y se recorre una sola
+vez. Las acotaciones `(...)` se localizan de antemano (posiciones de los
+paréntesis) y la longitud efectiva de la línea en curso se lleva acumulada, en
+vez de volver a pasar una expresión regular por la línea entera con cada palabra.
+
+Cada módulo cuenta las acotaciones a su manera y se conserva su regla:
+  - PARENS_IGNORED: no cuentan, ni el espacio que las precede (Ajustar Diálogos, DOCX).
+  - PARENS_AS_ONE: cada acotación cuenta como un carácter (takeo).
+  - PARENS_LITERAL: se cuenta todo el texto (exportación SRT).
+Una acotación solo se descuenta si abre y cierra dentro de la misma línea.
+"""
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PARENS_IGNORED = 'ignored'
+PARENS_AS_ONE = 'as_one'
+PARENS_LITERAL = 'literal'
+
+WRAP_CACHE_SIZE = 65536
+
+
+def _positions(text: str, char: str) -> List[int]:
+    positions, pos = [], text.find(char)
+    while pos != -1:
+        positions.append(pos)
+        pos = text.find(char, pos + 1)
+    return positions
+
+
+def _wrap_plain(words: List[str], width: int) -> Tuple[str, ...]:
+    lines, first, length = [], 0, len(words[0])
+    for k in range(1, len(words)):
+        word_len = len(words[k])
+        if length + 1 + word_len <= width:
+            length += 1 + word_len
+        else:
+            lines.append(" ".join(words[first:k]))
+            first, length = k, word_len
+    lines.append(" ".join(words[first:]))
+    return tuple(lines)
+
+
+def _wrap_with_parens(words: List[str], width: int, parens: str) -> Tuple[str, ...]:
+    text = " ".join(words)
+    opens, closes = _positions(text, '('), _positions(text, ')')
+
+    def span_from(pos: int) -> Optional[Tuple[int, int]]:
+        # Primera acotación completa que empieza en `pos` o después: del '(' al primer ')' que le sigue
+        i = bisect_left(opens, pos)
+        if i == len(opens): return None
+        j = bisect_right(closes, opens[i])
+        return (opens[i], closes[j]) if j < len(closes) else None
+
+    def absorb(span, removed: int, line_start: int, line_end: int):
+        # Descuenta las acotaciones que ya cierran dentro de la línea [line_start, line_end)
+        while span is not None and span[1] < line_end:
+            open_pos, close_pos = span
+            if parens == PARENS_AS_ONE:
+                removed += close_pos - open_pos
+            else:
+                removed += close_pos - open_pos + 1 + (open_pos > line_start and text[open_pos - 1] == ' ')
+            span = span_from(close_pos + 1)
+        return span, removed
+
+    lines = []
+    line_start, line_end = 0, len(words[0])
+    span, removed = absorb(span_from(0), 0, line_start, line_end)
+    for word in words[1:]:
+        word_start = line_end + 1
+        word_end = word_start + len(word)
+        new_span, new_removed = absorb(span, removed, line_start, word_end)
+        if word_end - line_start - new_removed <= width:
+            span, removed, line_end = new_span, new_removed, word_end
+            continue
+        lines.append(text[line_start:line_end])
+        line_start, line_end = word_start, word_end
+        span, removed = absorb(span_from(line_start), 0, line_start, line_end)
+    lines.append(text[line_start:line_end])
+    return tuple(lines)
+
+
+@lru_cache(maxsize=WRAP_CACHE_SIZE)
+def wrap_lines(text: str, width: int, parens: str = PARENS_IGNORED) -> Tuple[str, ...]:
+    """Líneas de `text` ajustadas a `width` caracteres efectivos. Una palabra más larga que `width` va sola."""
+    words = text.split()
+    if not words:
+        return ()
+    if parens == PARENS_LITERAL or '(' not in text:
+        return _wrap_plain(words, width)
+    return _wrap_with_parens(words, width, parens)
+
+
+def wrap_text(text: Any, width: int, parens: str = PARENS_IGNORED) -> str:
+    """Como `wrap_lines`, pero devuelve las líneas unidas con saltos de línea."""
+    if not text:
+        return ""
+    return "\n".join(wrap_lines(str(text), width, parens))
+
+
+def wrap_many(texts: Iterable[Any], width: int, parens: str = PARENS_IGNORED) -> np.ndarray:
+    """Ajusta una columna entera (Series, array o lista). Cada texto distinto se ajusta una sola vez."""
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object).fillna(""))
+    wrapped = np.array([wrap_text(text, width, parens) for text in uniques], dtype=object)
+    return wrapped[codes] if len(codes) else np.empty(0, dtype=object)
+
+
+def count_lines_many(texts: Iterable[Any], width: int, parens: str = PARENS_IGNORED) -> np.ndarray:
+    """Número de líneas de cada texto una vez ajustado."""
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object).fillna(""))
+    counts = np.array([len(wrap_lines(str(text), width, parens)) for text in uniques], dtype=np.int64)
+    return counts[codes] if len(codes) else np.empty(0, dtype=np.int64)
@@ -0,0 +1,196 @@
+# guion_editor/utils/timecode.py
+"""
+Conversión de timecodes 'HH:MM:SS:FF' a frames, ms y segundos (y vuelta), en
+una sola versión para todo el programa.
+
+Regla única: cuatro campos de dígitos separados por ':' (se toleran espacios
+alrededor) con MM < 60, SS < 60 y FF < 100. Las horas no tienen tope, igual que al
+formatear (`frames_to_tc` escribe '100:00:00:00' pasadas las 99 h). Lo que no la cumple es
+inválido: INVALID_FRAMES / INVALID_MS en los arrays, None en las funciones escalares.
+
+Las funciones escalares comparten una caché del desglose (h, m, s, f) por texto.
+Las versiones `_array` trabajan sobre columnas enteras: los textos con la forma
+exacta 'DD:DD:DD:DD' se convierten con numpy de una vez y solo el resto pasa
+por el camino escalar.
+"""
+import re
+from functools import lru_cache
+from math import floor
+from typing import Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from guion_editor import constants_logic as C
+
+INVALID_FRAMES = -1
+INVALID_MS = -1
+
+TC_PARTS_CACHE_SIZE = 65536
+
+_TC_RE = re.compile(r'\s*([0-9]+):([0-9]+):([0-9]+):([0-9]+)\s*')
+_TC_LEN = 11
+_COLON_POSITIONS = [2, 5, 8]
+_DIGIT_POSITIONS = [0, 1, 3, 4, 6, 7, 9, 10]
+
+TcParts = Tuple[int, int, int, int]
+
+
+# --- Texto -> valores ---
+
+@lru_cache(maxsize=TC_PARTS_CACHE_SIZE)
+def parse_tc_parts(time_code: str) -> Optional[TcParts]:
+    """(h, m, s, f) de un timecode válido, o None."""
+    match = _TC_RE.fullmatch(time_code)
+    if match is None:
+        return None
+    h, m, s, f = map(int, match.groups())
+    if not (m < 60 and s < 60 and f < 100):
+        return None
+    return h, m, s, f
+
+
+def _parts(time_code: Any) -> Optional[TcParts]:
+    return parse_tc_parts(time_code if isinstance(time_code, str) else str(time_code))
+
+
+def _to_ms(seconds, f, fps: float):
+    # Mismo redondeo en escalar (round) y en arrays (rint): al par más cercano
+    return seconds * 1000 + int(round((f / fps) * 1000.0))
+
+
+def parse_tc(time_code: Any, fps: float = C.FPS) -> Tuple[int, int]:
+    """(frames, ms) de un timecode; (INVALID_FRAMES, INVALID_MS) si no es válido."""
+    parts = _parts(time_code)
+    if parts is None:
+        return INVALID_FRAMES, INVALID_MS
+    h, m, s, f = parts
+    seconds = h * 3600 + m * 60 + s
+    return seconds * int(fps) + f, _to_ms(seconds, f, fps)
+
+
+def parse_tc_to_frames(time_code: Any, fps: float = C.FPS) -> int:
+    """Frames de un timecode; INVALID_FRAMES si no es válido."""
+    return parse_tc(time_code, fps)[0]
+
+
+def tc_to_frames(time_code: Any, fps: float = C.FPS) -> Optional[int]:
+    parts = _parts(time_code)
+    if parts is None:
+        return None
+    h, m, s, f = parts
+    return (h * 3600 + m * 60 + s) * int(fps) + f
+
+
+def tc_to_ms(time_code: Any, fps: float = C.FPS) -> Optional[int]:
+    parts = _parts(time_code)
+    if parts is None:
+        return None
+    h, m, s, f = parts
+    return _to_ms(h * 3600 + m * 60 + s, f, fps)
+
+
+def tc_to_seconds(time_code: Any, fps: float = C.FPS) -> Optional[float]:
+    parts = _parts(time_code)
+    if parts is None:
+        return None
+    h, m, s, f = parts
+    return h * 3600 + m * 60 + s + f / fps
+
+
+def parse_tc_parts_array(values: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Desglose (n, 4) de una columna de timecodes y máscara de válidos."""
+    texts = values if isinstance(values, np.ndarray) and values.dtype == object else np.asarray(list(values), dtype=object)
+    parts = np.zeros((len(texts), 4), dtype=np.int64)
+    valid = np.zeros(len(texts), dtype=bool)
+    if len(texts) == 0:
+        return parts, valid
+
+    is_str = np.fromiter((isinstance(t, str) for t in texts), dtype=bool, count=len(texts))
+    lengths = np.fromiter((len(t) if ok else 0 for t, ok in zip(texts, is_str)), dtype=np.int64, count=len(texts))
+    candidates = np.flatnonzero(lengths == _TC_LEN)
+    if candidates.size:
+        codes = np.asarray(texts[candidates].astype(f'U{_TC_LEN}')).view(np.uint32).reshape(-1, _TC_LEN).astype(np.int64)
+        digits = codes[:, _DIGIT_POSITIONS] - ord('0')
+        exact = ((codes[:, _COLON_POSITIONS] == ord(':')).all(axis=1) & ((digits >= 0) & (digits <= 9)).all(axis=1))
+        pairs = digits[:, 0::2] * 10 + digits[:, 1::2]
+        exact &= (pairs[:, 1] < 60) & (pairs[:, 2] < 60)
+        parts[candidates[exact]] = pairs[exact]
+        valid[candidates[exact]] = True
+
+    # Lo que no tiene la forma exacta (espacios, horas de 3 cifras o más, basura...) por el camino escalar
+    for row in np.flatnonzero(~valid).tolist():
+        row_parts = _parts(texts[row])
+        if row_parts is not None:
+            parts[row] = row_parts
+            valid[row] = True
+    return parts, valid
+
+
+def parse_tc_array(values: Iterable[Any], fps: float = C.FPS) -> Tuple[np.ndarray, np.ndarray]:
+    """(frames, ms) de una columna; INVALID_FRAMES / INVALID_MS donde no es válido."""
+    parts, valid = parse_tc_parts_array(values)
+    seconds = parts[:, 0] * 3600 + parts[:, 1] * 60 + parts[:, 2]
+    frames = np.where(valid, seconds * int(fps) + parts[:, 3], INVALID_FRAMES)
+    ms = np.where(valid, seconds * 1000 + np.rint(parts[:, 3] / fps * 1000.0).astype(np.int64), INVALID_MS)
+    return frames, ms
+
+
+def tc_array_to_seconds(values: Iterable[Any], fps: float = C.FPS) -> np.ndarray:
+    """Segundos (float) de una columna; NaN donde no es válido."""
+    parts, valid = parse_tc_parts_array(values)
+    seconds = (parts[:, 0] * 3600 + parts[:, 1] * 60 + parts[:, 2]) + parts[:, 3] / fps
+    return np.where(valid, seconds, np.nan)
+
+
+# --- Valores -> texto ---
+
+def frames_to_tc(frames: Optional[int], fps: float = C.FPS) -> str:
+    """'HH:MM:SS:FF' de un número de frames (negativos como 0; las horas pueden pasar de 99)."""
+    if frames is None:
+        return ""
+    s_total, f = divmod(max(int(frames), 0), int(fps))
+    h, s_rem = divmod(s_total, 3600)
+    m, s = divmod(s_rem, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}:{f:02d}"
+
+
+def frames_to_tc_array(frames: np.ndarray, fps: float = C.FPS) -> np.ndarray:
+    s_total, f = np.divmod(np.maximum(np.asarray(frames, dtype=np.int64), 0), int(fps))
+    h, s_rem = np.divmod(s_total, 3600)
+    m, s = np.divmod(s_rem, 60)
+    out = np.empty(len(f), dtype=object)
+    out[:] = [f"{hh:02d}:{mm:02d}:{ss:02d}:{ff:02d}" for hh, mm, ss, ff in zip(h.tolist(), m.tolist(), s.tolist(), f.tolist())]
+    return out
+
+
+def ms_to_tc_parts(ms: int, fps: float = C.FPS) -> TcParts:
+    """(h, m, s, f) de una posición en ms; el frame se redondea y nunca llega a `fps`."""
+    total_seconds, rem_ms = divmod(max(int(ms), 0), 1000)
+    h, rem_seconds = divmod(total_seconds, 3600)
+    m, s = divmod(rem_seconds, 60)
+    f = min(int(round(rem_ms / (1000.0 / fps))), int(fps - 1))
+    return h, m, s, f
+
+
+def ms_to_tc(ms: int, fps: float = C.FPS) -> str:
+    h, m, s, f = ms_to_tc_parts(ms, fps)
+    return f"{h:02d}:{m:02d}:{s:02d}:{f:02d}"
+
+
+def ms_to_srt(ms: int) -> str:
+    """'HH:MM:SS,mmm' (formato SRT) de una posición en ms."""
+    s_total, mmm = divmod(max(int(ms), 0), 1000)
+    h, s_rem = divmod(s_total, 3600)
+    m, s = divmod(s_rem, 60)
+    return f"{h:02d}:{m:02d}:{s:02d},{mmm:03d}"
+
+
+def seconds_to_srt(seconds: Optional[float]) -> str:
+    """'HH:MM:SS,mmm' de una posición en segundos (negativos o None como 0)."""
+    if seconds is None or seconds < 0: seconds = 0.0
+    total_seconds_int = int(floor(seconds))
+    ms = int(round((seconds - total_seconds_int) * 1000))
+    if ms >= 1000:
+        total_seconds_int += 1
+        ms = 0
+    return ms_to_srt(total_seconds_int * 1000 + ms)
@@ -288,10 +288,7 @@ class CastWindow(QWidget):
     # --- FIN LÓGICA PERSISTENCIA ---
 
     def get_character_names_for_completer(self) -> list[str]:
-        df = self.pandas_model.dataframe()
-        if df is None or df.empty or C.COL_PERSONAJE not in df.columns: return []
-        unique_names = pd.Series(df[C.COL_PERSONAJE].unique()).astype(str).str.strip()
-        return sorted(list(unique_names[unique_names != ""]))
+        return self.pandas_model.character_names()
 
     def sort_by_column(self, logical_index):
         if self.current_sort_column == logical_index:
@@ -309,18 +306,18 @@ class CastWindow(QWidget):
             self.raise_()
 
     def populate_table(self):
-        df = self.pandas_model.dataframe()
-        if df is None or df.empty or C.COL_PERSONAJE not in df.columns:
+        if self.pandas_model.df_row_count() == 0:
             self.table_widget.setRowCount(0)
             return
             
-        # --- LIMPIEZA PREVIA DE DATOS EN MEMORIA DEL DATAFRAME ---
-        # Esto no modifica el guion original permanentemente, solo la vista de estadísticas
-        # Sin embargo, si usamos la función de limpieza global, mejoramos la calidad.
-        # Pero para esta vista, limpiaremos al vuelo:
-        char_series = df[C.COL_PERSONAJE].astype(str).apply(self.clean_text_data)
-        char_counts = char_series.value_counts()
-        char_counts = char_counts[char_counts.index != ""]
+        # --- LIMPIEZA PREVIA DE LOS NOMBRES ---
+        # Esto no modifica el guion original, solo la vista de estadísticas.
+        # El modelo ya lleva la cuenta por nombre: se limpia cada nombre distinto una sola vez.
+        char_counts: dict[str, int] = {}
+        for name, count in self.pandas_model.character_counts().items():
+            clean_name = self.clean_text_data(name)
+            if clean_name:
+                char_counts[clean_name] = char_counts.get(clean_name, 0) + count
         
         items_to_sort = [{'personaje': char, 'reparto': self.reparto_data.get(char, ""), 'count': count} for char, count in char_counts.items()]
         
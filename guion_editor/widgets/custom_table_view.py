@@ -1,15 +1,20 @@
 # guion_editor/widgets/custom_table_view.py
 from PyQt6.QtWidgets import QTableView, QApplication
 from PyQt6.QtCore import pyqtSignal, Qt, QModelIndex
-from PyQt6.QtGui import QMouseEvent
+from PyQt6.QtGui import QMouseEvent, QResizeEvent
 
 class CustomTableView(QTableView):
     cellCtrlClicked = pyqtSignal(int)  # Emits view row index
     cellAltClicked = pyqtSignal(int)   # Emits view row index
+    viewportResized = pyqtSignal()     # Cambia el número de filas visibles
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
+    def resizeEvent(self, event: QResizeEvent):
+        super().resizeEvent(event)
+        self.viewportResized.emit()
+
     def mousePressEvent(self, event: QMouseEvent):
         modifiers = QApplication.keyboardModifiers()
         index_at_click: QModelIndex = self.indexAt(event.pos())
@@ -2,8 +2,10 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout, QLineEdit, QHBoxLayout,
     QPushButton, QMessageBox, QCheckBox, QAbstractItemView
 )
-from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtCore import QSize
+import numpy as np
 from .. import constants as C
+from ..models.validation_status import FLAG_SEARCH_HIT
 
 class FindReplaceDialog(QDialog):
     def __init__(self, table_window, get_icon_func=None):
@@ -11,8 +13,9 @@ class FindReplaceDialog(QDialog):
         self.table_window = table_window
         self.get_icon = get_icon_func
         self.setWindowTitle("Find and Replace")
-        self.current_search_results = []
-        self.current_search_index = -1
+        # Los resultados se guardan como FLAG_SEARCH_HIT en el modelo: siguen a las filas al insertar/borrar
+        self.search_performed = False
+        self.current_search_row = -1
         self.setup_ui()
 
     def setup_ui(self):
@@ -93,12 +96,12 @@ class FindReplaceDialog(QDialog):
             QMessageBox.information(self, "Reemplazar", "Por favor, introduzca texto para buscar.")
             return
 
-        if not self.current_search_results or not (0 <= self.current_search_index < len(self.current_search_results)):
+        if self.current_search_row < 0:
             self.find_next()
             return
 
         replace_text = self.replace_text_input.text()
-        row_to_replace = self.current_search_results[self.current_search_index]
+        row_to_replace = self.current_search_row
 
         replaced = self.table_window.replace_in_current_match(
             row_to_replace,
@@ -121,43 +124,23 @@ class FindReplaceDialog(QDialog):
 
     def perform_search(self):
         search_text = self.find_text_input.text().lower()
-        self.current_search_results = []
+        model = self.table_window.pandas_model
+        model.clear_search_hits()
+        self.search_performed = bool(search_text)
         if not search_text:
             return
 
-        model = self.table_window.pandas_model
-        
-        # Obtener los índices de columna de la vista desde las constantes
-        col_char = C.VIEW_COL_CHARACTER
-        col_original = C.VIEW_COL_DIALOGUE
-        col_euskera = C.VIEW_COL_EUSKERA
-
-        for row in range(model.rowCount()):
-            found_in_row = False
-
-            if self.search_in_character.isChecked():
-                idx = model.index(row, col_char)
-                data = model.data(idx, Qt.ItemDataRole.DisplayRole)
-                text = ("" if data is None else str(data)).lower()
-                if search_text in text:
-                    found_in_row = True
-
-            if not found_in_row and self.search_in_original.isChecked():
-                idx = model.index(row, col_original)
-                data = model.data(idx, Qt.ItemDataRole.DisplayRole)
-                text = ("" if data is None else str(data)).lower()
-                if search_text in text:
-                    found_in_row = True
-
-            if not found_in_row and self.search_in_euskera.isChecked():
-                idx = model.index(row, col_euskera)
-                data = model.data(idx, Qt.ItemDataRole.DisplayRole)
-                text = ("" if data is None else str(data)).lower()
-                if search_text in text:
-                    found_in_row = True
-
-            if found_in_row:
-                self.current_search_results.append(row)
+        # Se busca en las columnas completas (incluidas las filas que la vista aún no ha cargado)
+        columns_to_search = []
+        if self.search_in_character.isChecked(): columns_to_search.append(C.COL_PERSONAJE)
+        if self.search_in_original.isChecked(): columns_to_search.append(C.COL_DIALOGO)
+        if self.search_in_euskera.isChecked(): columns_to_search.append(C.COL_EUSKERA)
+
+        found = np.zeros(model.df_row_count(), dtype=bool)
+        for col_name in columns_to_search:
+            found |= np.fromiter((search_text in text.lower() for text in model.get_column_values(col_name)),
+                                 dtype=bool, count=len(found))
+        model.set_search_hits(found)
 
     def find_next(self):
         search_text = self.find_text_input.text().lower()
@@ -165,15 +148,15 @@ class FindReplaceDialog(QDialog):
             QMessageBox.information(self, "Find", "Please enter text to search.")
             return
 
-        if not self.current_search_results and self.find_text_input.text():
+        model = self.table_window.pandas_model
+        if not self.search_performed or model.flagged_row_count(FLAG_SEARCH_HIT) == 0:
             self.perform_search()
 
-        if not self.current_search_results:
+        if model.flagged_row_count(FLAG_SEARCH_HIT) == 0:
             QMessageBox.information(self, "Find", "No matches found.")
             return
 
-        self.current_search_index = (self.current_search_index + 1) % len(self.current_search_results)
-        self.select_search_result()
+        self.select_search_result(self._search_start_row())
 
     def find_previous(self):
         search_text = self.find_text_input.text().lower()
@@ -181,21 +164,30 @@ class FindReplaceDialog(QDialog):
             QMessageBox.information(self, "Find", "Please enter text to search.")
             return
 
-        if not self.current_search_results and self.find_text_input.text():
+        model = self.table_window.pandas_model
+        if not self.search_performed or model.flagged_row_count(FLAG_SEARCH_HIT) == 0:
             self.perform_search()
 
-        if not self.current_search_results:
+        if model.flagged_row_count(FLAG_SEARCH_HIT) == 0:
             QMessageBox.information(self, "Find", "No matches found.")
             return
 
-        self.current_search_index = (self.current_search_index - 1 + len(self.current_search_results)) % len(self.current_search_results)
-        self.select_search_result()
+        self.select_search_result(self._search_start_row(), backwards=True)
+
+    def _search_start_row(self) -> int:
+        """Fila desde la que se busca el siguiente resultado: la fila actual de la tabla tras el primer salto."""
+        if self.current_search_row < 0:
+            return -1
+        current = self.table_window.table_view.currentIndex()
+        return current.row() if current.isValid() else self.current_search_row
 
-    def select_search_result(self):
-        if not self.current_search_results or not (0 <= self.current_search_index < len(self.current_search_results)):
+    def select_search_result(self, from_row: int, backwards: bool = False):
+        row_to_select = self.table_window.pandas_model.next_flagged_row(FLAG_SEARCH_HIT, from_row, backwards)
+        if row_to_select < 0:
             return
 
-        row_to_select = self.current_search_results[self.current_search_index]
+        self.current_search_row = row_to_select
+        self.table_window.pandas_model.ensure_rows_fetched(row_to_select)
         self.table_window.table_view.selectRow(row_to_select)
 
         model = self.table_window.pandas_model
@@ -204,8 +196,9 @@ class FindReplaceDialog(QDialog):
             self.table_window.table_view.scrollTo(index_to_scroll_to, QAbstractItemView.ScrollHint.EnsureVisible)
 
     def reset_search(self):
-        self.current_search_results = []
-        self.current_search_index = -1
+        self.search_performed = False
+        self.current_search_row = -1
+        self.table_window.pandas_model.clear_search_hits()
 
     def replace_all(self):
         find_text = self.find_text_input.text()
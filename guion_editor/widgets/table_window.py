@@ -3,10 +3,10 @@ import json
 import os
 import re
 from typing import Any, List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
-import bisect
 
-from PyQt6.QtCore import pyqtSignal, Qt, QSize, QModelIndex, QTimer, QPoint
+from PyQt6.QtCore import pyqtSignal, Qt, QSize, QModelIndex, QTimer, QPoint, QStringListModel
 from PyQt6.QtGui import QFont, QIntValidator, QIcon, QKeyEvent, QKeySequence, QAction
 from PyQt6.QtWidgets import (
     QWidget, QAbstractItemView, QMessageBox, QVBoxLayout, QHBoxLayout, QPushButton,
@@ -17,22 +17,28 @@ from PyQt6.QtGui import QUndoStack
 
 from guion_editor import constants as C
 from guion_editor.widgets.custom_table_view import CustomTableView
-from guion_editor.models.pandas_table_model import PandasTableModel
+from guion_editor.models.interval_index import IntervalIndex
+from guion_editor.models.pandas_table_model import LINE_ERROR_FLAGS, PandasTableModel
+from guion_editor.models.validation_status import FLAG_BOOKMARK, FLAG_SCENE_ERROR, FLAG_TIME_ERROR
 from guion_editor.delegates.custom_delegates import TimeCodeDelegate, CharacterDelegate
 from guion_editor.delegates.guion_delegate import DialogDelegate
-from guion_editor.utils.dialog_utils import ajustar_dialogo
+from guion_editor.utils.text_wrap import wrap_many
+from guion_editor.utils.timecode import ms_to_tc, tc_to_ms
 from guion_editor.utils.file_io_handler import FileIOHandler
 from guion_editor.utils.guion_manager import GuionManager
 from guion_editor.widgets.custom_text_edit import CustomTextEdit 
 from guion_editor.widgets.shift_timecode_dialog import ShiftTimecodeDialog
 from guion_editor.commands.undo_commands import (
-    EditCommand, AddRowCommand, RemoveRowsCommand, MoveRowCommand,
+    EditCommand, BulkColumnEditCommand, AddRowCommand, RemoveRowsCommand, MoveRowCommand,
     SplitInterventionCommand, MergeInterventionsCommand, ChangeSceneCommand, HeaderEditCommand,
     ToggleBookmarkCommand, UpdateMultipleCharactersCommand, SplitCharacterCommand,
     TrimAllCharactersCommand, ShiftTimecodesCommand, ResetTimecodesCommand, ResetScenesCommand,
     CopyInToPreviousOutCommand, AutoSplitInterventionCommand
 )
 
+# Filas por encima y por debajo de las visibles cuya altura se calcula maquetando el texto
+ROW_HEIGHT_MARGIN_ROWS = 20
+
 class TableWindow(QWidget):
     in_out_signal = pyqtSignal(str, int)
     character_name_changed = pyqtSignal()
@@ -114,18 +120,20 @@ class TableWindow(QWidget):
             self.icon_expand_less, self.icon_expand_more = self.get_icon("toggle_header_collapse_icon.svg"), self.get_icon("toggle_header_expand_icon.svg")
         else: self.icon_expand_less, self.icon_expand_more = QIcon(), QIcon()
         self.time_error_indicator_button: Optional[QPushButton] = None
-        self.error_df_indices: List[int] = []; self._current_error_nav_idx: int = -1
         self.scene_error_indicator_button: Optional[QPushButton] = None
-        self.scene_error_df_indices: List[int] = []; self._current_scene_error_nav_idx: int = -1
         self.line_error_indicator_button: Optional[QPushButton] = None
-        self.line_error_df_indices: List[int] = []; self._current_line_error_nav_idx: int = -1
         self.bookmark_indicator_button: Optional[QPushButton] = None
-        self.bookmark_df_indices: List[int] = []; self._current_bookmark_nav_idx: int = -1
         self._current_header_data_for_undo: Dict[str, Any] = {}
-        self.cached_subtitle_timeline: List[Tuple[int, int, str]] = []
-        self._time_cache: List[Tuple[int, int]] = []; self._currently_synced_row: int = -1
+        # Caché de sincronización con el vídeo y de subtítulos: intervalos (IN, OUT) en ms de cada fila, ordenados por IN
+        self._time_index = IntervalIndex()
+        self._time_cache_revision: int = -1
+        self._currently_synced_row: int = -1
         self._rows_pending_resize = set() # Almacena índices de filas visuales a redimensionar
-        self._global_resize_pending = False # Bandera para forzar redimensionado completo
+        self._global_resize_pending = False # Bandera para recalcular todas las alturas
+        # Filas con la altura ya calculada; el resto lleva una altura estimada hasta que se ven
+        self._row_heights_settled = np.zeros(0, dtype=bool)
+        # Nombres de personaje para el autocompletado, compartidos por todos los editores de PERSONAJE
+        self.character_names_model = QStringListModel(self)
 
     def _init_timers(self):
         self._resize_rows_timer = QTimer(self); self._resize_rows_timer.setSingleShot(True); self._resize_rows_timer.setInterval(100)
@@ -134,6 +142,7 @@ class TableWindow(QWidget):
         self._update_line_error_indicator_timer = QTimer(self); self._update_line_error_indicator_timer.setSingleShot(True); self._update_line_error_indicator_timer.setInterval(0)
         self._update_bookmark_indicator_timer = QTimer(self); self._update_bookmark_indicator_timer.setSingleShot(True); self._update_bookmark_indicator_timer.setInterval(0)
         self._recache_timer = QTimer(self); self._recache_timer.setSingleShot(True); self._recache_timer.setInterval(150)
+        self._character_names_timer = QTimer(self); self._character_names_timer.setSingleShot(True); self._character_names_timer.setInterval(250)
         self._header_change_timer: Optional[QTimer] = None
         self._heavy_validation_timer = QTimer(self)
         self._heavy_validation_timer.setSingleShot(True)
@@ -147,6 +156,7 @@ class TableWindow(QWidget):
         self._update_line_error_indicator_timer.timeout.connect(self.update_line_error_indicator)
         self._update_bookmark_indicator_timer.timeout.connect(self.update_bookmark_indicator)
         self._recache_timer.timeout.connect(self._recache_subtitle_timeline)
+        self._character_names_timer.timeout.connect(self._refresh_character_names)
         if self.video_player_widget:
             self.video_player_widget.in_out_signal.connect(self.update_in_out_from_player)
             self.video_player_widget.out_released.connect(self.select_next_row_after_out_release)
@@ -159,6 +169,23 @@ class TableWindow(QWidget):
             signal.connect(self._request_heavy_validation) 
         self.pandas_model.dataChanged.connect(self.on_model_data_changed)
         self.pandas_model.layoutChanged.connect(self.on_model_layout_changed)
+        # Insertar/borrar/mover filas desplaza los índices: las cachés de tiempos e indicadores se reconstruyen
+        for signal in [self.pandas_model.rowsInserted, self.pandas_model.rowsRemoved, self.pandas_model.rowsMoved]:
+            signal.connect(lambda *args: self._recache_times())
+            signal.connect(lambda *args: self._request_recache_subtitles())
+            signal.connect(lambda *args: self._request_error_indicator_update())
+            signal.connect(lambda *args: self._request_scene_error_indicator_update())
+            signal.connect(lambda *args: self._request_bookmark_indicator_update())
+        # Alturas de fila: se estiman para todas y solo se calculan las visibles (y al desplazarse)
+        self.pandas_model.rowsInserted.connect(self._on_rows_inserted_for_heights)
+        self.pandas_model.rowsRemoved.connect(self._on_rows_removed_for_heights)
+        self.pandas_model.rowsMoved.connect(self._on_rows_moved_for_heights)
+        self.pandas_model.modelReset.connect(self._on_model_reset_for_heights)
+        # Nombres del completer: basta con revisarlos (con espera) cuando cambian las filas o se carga otro guion
+        for signal in [self.pandas_model.modelReset, self.pandas_model.rowsInserted, self.pandas_model.rowsRemoved]:
+            signal.connect(lambda *args: self.update_character_completer_and_notify())
+        self.table_view.verticalScrollBar().valueChanged.connect(lambda *args: self._request_visible_row_heights())
+        self.table_view.viewportResized.connect(self._request_visible_row_heights)
         self.undo_stack.canUndoChanged.connect(self._update_undo_action_state)
         self.undo_stack.canRedoChanged.connect(self._update_redo_action_state)
         self.undo_stack.cleanChanged.connect(self._handle_clean_changed)
@@ -174,26 +201,26 @@ class TableWindow(QWidget):
     def _request_line_error_indicator_update(self): self._update_line_error_indicator_timer.start()
 
     def update_line_error_indicator(self):
-        if not hasattr(self, 'line_error_indicator_button') or self.line_error_indicator_button is None or not hasattr(self.pandas_model, '_line_validation_status'): return
-        all_errors, error_indices = self.pandas_model._line_validation_status, []
-        for idx, status_dict in all_errors.items():
-            if not status_dict.get(C.COL_DIALOGO, True) or not status_dict.get(C.COL_EUSKERA, True): error_indices.append(idx)
-        self.line_error_df_indices = sorted(error_indices)
-        has_errors = bool(self.line_error_df_indices)
-        if not has_errors: self._current_line_error_nav_idx = -1
-        self.line_error_indicator_button.setVisible(has_errors)
-        if has_errors:
+        if not hasattr(self, 'line_error_indicator_button') or self.line_error_indicator_button is None: return
+        num_rows = self.pandas_model.flagged_row_count(LINE_ERROR_FLAGS)
+        self.line_error_indicator_button.setVisible(num_rows > 0)
+        if num_rows > 0:
             self.line_error_indicator_button.setText("⚠️ LÍNEAS")
             self.line_error_indicator_button.setProperty("hasErrors", True)
-            self.line_error_indicator_button.setToolTip(f"Avisos de líneas detectados en DIÁLOGO o EUSKERA. Pulse para ir al siguiente.\nFilas: {', '.join(map(str, [i+1 for i in self.line_error_df_indices]))}")
+            self.line_error_indicator_button.setToolTip(f"Avisos de líneas en DIÁLOGO o EUSKERA en {num_rows} filas. Pulse para ir al siguiente.")
         if self.line_error_indicator_button.style():
             self.line_error_indicator_button.style().unpolish(self.line_error_indicator_button)
             self.line_error_indicator_button.style().polish(self.line_error_indicator_button)
 
+    def _next_flagged_row(self, mask: int) -> int:
+        """Siguiente fila marcada con `mask` a partir de la fila actual de la tabla (-1 si no hay)."""
+        current = self.table_view.currentIndex()
+        return self.pandas_model.next_flagged_row(mask, current.row() if current.isValid() else -1)
+
     def go_to_next_line_error(self):
-        if not self.line_error_df_indices: return
-        self._current_line_error_nav_idx = (self._current_line_error_nav_idx + 1) % len(self.line_error_df_indices)
-        target_df_idx = self.line_error_df_indices[self._current_line_error_nav_idx]
+        target_df_idx = self._next_flagged_row(LINE_ERROR_FLAGS)
+        if target_df_idx < 0: return
+        self.pandas_model.ensure_rows_fetched(target_df_idx)
         self.table_view.clearSelection(); self.table_view.selectRow(target_df_idx)
         self.table_view.scrollTo(self.pandas_model.index(target_df_idx, 0), QAbstractItemView.ScrollHint.PositionAtCenter)
         self.table_view.setFocus()
@@ -201,21 +228,28 @@ class TableWindow(QWidget):
     def _request_recache_subtitles(self): self._recache_timer.start()
 
     def _recache_subtitle_timeline(self):
-        self.cached_subtitle_timeline.clear()
-        df = self.pandas_model.dataframe()
-        if df.empty or self.subtitle_source_column not in df.columns: return
-        for i in range(len(df)):
-            try:
-                in_tc, out_tc, subtitle_text = str(df.at[i, C.COL_IN]), str(df.at[i, C.COL_OUT]), str(df.at[i, self.subtitle_source_column])
-                in_ms, out_ms = self.convert_time_code_to_milliseconds(in_tc), self.convert_time_code_to_milliseconds(out_tc)
-                if in_ms is not None and out_ms is not None and in_ms < out_ms: self.cached_subtitle_timeline.append((in_ms, out_ms, subtitle_text))
-            except (KeyError, ValueError, TypeError): continue
-        self.cached_subtitle_timeline.sort(key=lambda x: x[0])
+        # Los subtítulos salen del mismo índice de intervalos que la sincronización; solo se actualizan las filas cambiadas
+        self._sync_time_cache()
 
     def trigger_recache_with_source(self, source_column: str):
         if source_column in self.DF_COLUMN_ORDER: self.subtitle_source_column = source_column; self._request_recache_subtitles()
 
-    def get_subtitle_timeline(self) -> List[Tuple[int, int, str]]: return self.cached_subtitle_timeline
+    def active_subtitles(self, position_ms: int) -> Tuple[List[str], int]:
+        """
+        Textos de las intervenciones activas en `position_ms` (en orden de IN) y el instante
+        hasta el que no cambian. Si se solapan varias, cada línea lleva delante su personaje.
+        """
+        self._sync_time_cache()
+        rows, valid_until = self._time_index.active_span(position_ms)
+        if self.subtitle_source_column not in self.DF_COLUMN_ORDER: return [], valid_until
+        lines = []
+        for row in rows.tolist():
+            text = str(self.pandas_model.get_value(row, self.subtitle_source_column) or "")
+            if not text.strip(): continue
+            lines.append((row, text))
+        if len(lines) > 1:
+            return [f"{self.pandas_model.get_value(row, C.COL_PERSONAJE)}: {text}" for row, text in lines], valid_until
+        return [text for _, text in lines], valid_until
     
     def setup_ui(self) -> None:
         main_layout = QVBoxLayout(self)
@@ -406,60 +440,52 @@ class TableWindow(QWidget):
                 self._request_error_indicator_update()
 
     def update_time_error_indicator(self):
-        if not hasattr(self, 'time_error_indicator_button') or self.time_error_indicator_button is None or not hasattr(self.pandas_model, '_time_validation_status'): return
-        self.error_df_indices = sorted([idx for idx, status in self.pandas_model._time_validation_status.items() if status is not True])
-        has_errors = bool(self.error_df_indices)
-        if not has_errors: self._current_error_nav_idx = -1
-        self.time_error_indicator_button.setVisible(has_errors)
-        if has_errors:
+        if not hasattr(self, 'time_error_indicator_button') or self.time_error_indicator_button is None: return
+        num_rows = self.pandas_model.flagged_row_count(FLAG_TIME_ERROR)
+        self.time_error_indicator_button.setVisible(num_rows > 0)
+        if num_rows > 0:
             self.time_error_indicator_button.setText("⚠️ TIEMPOS")
             self.time_error_indicator_button.setProperty("hasErrors", True)
-            self.time_error_indicator_button.setToolTip(f"Errores de tiempo detectados. Pulse para ir al siguiente.\nFilas: {', '.join(map(str, [i+1 for i in self.error_df_indices]))}")
+            self.time_error_indicator_button.setToolTip(f"Errores de tiempo en {num_rows} filas. Pulse para ir al siguiente.")
         if self.time_error_indicator_button.style():
             self.time_error_indicator_button.style().unpolish(self.time_error_indicator_button)
             self.time_error_indicator_button.style().polish(self.time_error_indicator_button)
 
     def update_scene_error_indicator(self):
-        if not hasattr(self, 'scene_error_indicator_button') or self.scene_error_indicator_button is None or not hasattr(self.pandas_model, '_scene_validation_status'): return
-        self.scene_error_df_indices = sorted([idx for idx, status in self.pandas_model._scene_validation_status.items() if status is not True])
-        has_errors = bool(self.scene_error_df_indices)
-        if not has_errors: self._current_scene_error_nav_idx = -1
-        self.scene_error_indicator_button.setVisible(has_errors)
-        if has_errors:
+        if not hasattr(self, 'scene_error_indicator_button') or self.scene_error_indicator_button is None: return
+        num_rows = self.pandas_model.flagged_row_count(FLAG_SCENE_ERROR)
+        self.scene_error_indicator_button.setVisible(num_rows > 0)
+        if num_rows > 0:
             self.scene_error_indicator_button.setText("⚠️ ESCENAS")
             self.scene_error_indicator_button.setProperty("hasErrors", True)
-            self.scene_error_indicator_button.setToolTip(f"Errores de escena detectados. Pulse para ir al siguiente.\nFilas: {', '.join(map(str, [i+1 for i in self.scene_error_df_indices]))}")
+            self.scene_error_indicator_button.setToolTip(f"Errores de escena en {num_rows} filas. Pulse para ir al siguiente.")
         if self.scene_error_indicator_button.style():
             self.scene_error_indicator_button.style().unpolish(self.scene_error_indicator_button)
             self.scene_error_indicator_button.style().polish(self.scene_error_indicator_button)
 
     def update_bookmark_indicator(self):
         if not hasattr(self, 'bookmark_indicator_button') or self.bookmark_indicator_button is None: return
-        df = self.pandas_model.dataframe()
-        if df.empty or C.COL_BOOKMARK not in df.columns: self.bookmark_indicator_button.setVisible(False); return
-        self.bookmark_df_indices = df.index[df[C.COL_BOOKMARK]].tolist()
-        num_bookmarks = len(self.bookmark_df_indices)
+        num_bookmarks = self.pandas_model.flagged_row_count(FLAG_BOOKMARK)
         self.bookmark_indicator_button.setVisible(num_bookmarks > 0)
         if num_bookmarks > 0:
             self.bookmark_indicator_button.setText(f"🔖 {num_bookmarks}")
             self.bookmark_indicator_button.setToolTip(f"{num_bookmarks} marcapáginas. Pulse para ir al siguiente.")
-        if not self.bookmark_df_indices: self._current_bookmark_nav_idx = -1
 
     def go_to_next_bookmark(self):
-        if not self.bookmark_df_indices: return
-        self._current_bookmark_nav_idx = (self._current_bookmark_nav_idx + 1) % len(self.bookmark_df_indices)
-        target_df_idx = self.bookmark_df_indices[self._current_bookmark_nav_idx]
+        target_df_idx = self._next_flagged_row(FLAG_BOOKMARK)
+        if target_df_idx < 0: return
+        self.pandas_model.ensure_rows_fetched(target_df_idx)
         self.table_view.clearSelection(); self.table_view.selectRow(target_df_idx)
         self.table_view.scrollTo(self.pandas_model.index(target_df_idx, 0), QAbstractItemView.ScrollHint.PositionAtCenter)
         self.table_view.setFocus()
 
     def go_to_next_time_error(self):
-        if not self.error_df_indices: return
-        self._current_error_nav_idx = (self._current_error_nav_idx + 1) % len(self.error_df_indices)
-        target_df_idx = self.error_df_indices[self._current_error_nav_idx]
-        error_message = self.pandas_model._time_validation_status.get(target_df_idx, "Error desconocido.")
+        target_df_idx = self._next_flagged_row(FLAG_TIME_ERROR)
+        if target_df_idx < 0: return
+        error_message = self.pandas_model.get_time_validation_status(target_df_idx)
         if error_message is True: return
         view_col_to_highlight = C.VIEW_COL_OUT if "OUT" in str(error_message) else C.VIEW_COL_IN
+        self.pandas_model.ensure_rows_fetched(target_df_idx)
         self.table_view.clearSelection()
         self.table_view.selectRow(target_df_idx)
         self.table_view.setCurrentIndex(self.pandas_model.index(target_df_idx, view_col_to_highlight))
@@ -471,15 +497,15 @@ class TableWindow(QWidget):
         QToolTip.showText(tooltip_pos + QPoint(0, cell_rect.height()), str(error_message), self.table_view, cell_rect, 3000)
 
     def go_to_next_scene_error(self):
-        if not self.scene_error_df_indices: return
-        self._current_scene_error_nav_idx = (self._current_scene_error_nav_idx + 1) % len(self.scene_error_df_indices)
-        target_df_idx = self.scene_error_df_indices[self._current_scene_error_nav_idx]
+        target_df_idx = self._next_flagged_row(FLAG_SCENE_ERROR)
+        if target_df_idx < 0: return
+        self.pandas_model.ensure_rows_fetched(target_df_idx)
         self.table_view.clearSelection()
         self.table_view.selectRow(target_df_idx)
         self.table_view.setCurrentIndex(self.pandas_model.index(target_df_idx, C.VIEW_COL_SCENE))
         self.table_view.scrollTo(self.pandas_model.index(target_df_idx, C.VIEW_COL_SCENE), QAbstractItemView.ScrollHint.PositionAtCenter)
         self.table_view.setFocus()
-        error_message = self.pandas_model._scene_validation_status.get(target_df_idx, "Error de escena desconocido.")
+        error_message = self.pandas_model.get_scene_validation_status(target_df_idx)
         if error_message is True: return
         cell_index = self.pandas_model.index(target_df_idx, C.VIEW_COL_SCENE)
         cell_rect = self.table_view.visualRect(cell_index)
@@ -499,8 +525,9 @@ class TableWindow(QWidget):
         time_delegate = TimeCodeDelegate(parent=self.table_view, table_window_instance=self)
         self.table_view.setItemDelegateForColumn(C.VIEW_COL_IN, time_delegate)
         self.table_view.setItemDelegateForColumn(C.VIEW_COL_OUT, time_delegate)
-        char_delegate = CharacterDelegate(get_names_callback=self.get_character_names_from_model, parent=self.table_view)
-        self.table_view.setItemDelegateForColumn(C.VIEW_COL_CHARACTER, char_delegate)
+        # Un único delegado de PERSONAJE: su completer lee del modelo de nombres compartido
+        self.character_delegate = CharacterDelegate(parent=self.table_view, names_model=self.character_names_model)
+        self.table_view.setItemDelegateForColumn(C.VIEW_COL_CHARACTER, self.character_delegate)
         self.dialog_delegate = DialogDelegate(parent=self.table_view, font_size=self.current_font_size, table_window_instance=self)
         self.table_view.setItemDelegateForColumn(C.VIEW_COL_DIALOGUE, self.dialog_delegate)
         self.table_view.setItemDelegateForColumn(C.VIEW_COL_EUSKERA, self.dialog_delegate)
@@ -598,7 +625,7 @@ class TableWindow(QWidget):
         self._recache_times()
     
     def open_shift_timecodes_dialog(self):
-        if self.pandas_model.dataframe().empty: QMessageBox.information(self, "Desplazar Timecodes", "No hay datos en el guion para desplazar."); return
+        if self.pandas_model.df_row_count() == 0: QMessageBox.information(self, "Desplazar Timecodes", "No hay datos en el guion para desplazar."); return
         dialog = ShiftTimecodeDialog(default_fps=int(C.FPS), get_icon_func=self.get_icon, parent=self)
         if dialog.exec():
             values = dialog.get_values()
@@ -622,10 +649,10 @@ class TableWindow(QWidget):
             C.ACT_EDIT_DELETE_ROW: num_selected > 0, 
             C.ACT_EDIT_TOGGLE_BOOKMARK: num_selected > 0,
             C.ACT_EDIT_MOVE_UP: can_move and df_idx > 0, 
-            C.ACT_EDIT_MOVE_DOWN: can_move and df_idx < self.pandas_model.rowCount() - 1,
+            C.ACT_EDIT_MOVE_DOWN: can_move and df_idx < self.pandas_model.df_row_count() - 1,
             C.ACT_EDIT_SPLIT_INTERVENTION: can_move, 
             C.ACT_EDIT_MERGE_INTERVENTIONS: num_selected >= 1,
-            C.ACT_EDIT_COPY_IN_OUT: can_move and df_idx < self.pandas_model.rowCount() - 1, 
+            C.ACT_EDIT_COPY_IN_OUT: can_move and df_idx < self.pandas_model.df_row_count() - 1, 
             C.ACT_EDIT_INCREMENT_SCENE: can_move,
         }
         for name, is_enabled in actions_state.items():
@@ -646,26 +673,89 @@ class TableWindow(QWidget):
     def _perform_resize_rows_to_contents(self):
         if not self.table_view.isVisible() or self.pandas_model.rowCount() <= 0:
             return
+        row_count = self.pandas_model.rowCount()
+        if len(self._row_heights_settled) != row_count:
+            self._row_heights_settled = np.zeros(row_count, dtype=bool)
 
-        # Si hay una bandera global activada, hacemos el método pesado (antiguo)
+        # Redimensionado global: nada de resizeRowsToContents sobre todo el guion. Las alturas se
+        # estiman (exactas si el texto ya está maquetado) y solo se calculan las de la zona visible
         if self._global_resize_pending:
-            self.table_view.resizeRowsToContents()
             self._global_resize_pending = False
-            self._rows_pending_resize.clear() # Limpiamos la cola ya que redimensionamos todo
-        
-        # Si no es global, procesamos solo las filas específicas
-        elif self._rows_pending_resize:
-            # Desactivamos actualizaciones visuales momentáneamente para velocidad
-            self.table_view.setUpdatesEnabled(False) 
-            try:
-                for row_idx in self._rows_pending_resize:
-                    # Comprobamos que el índice sigue siendo válido
-                    if row_idx < self.pandas_model.rowCount():
-                        self.table_view.resizeRowToContents(row_idx)
-            finally:
-                self.table_view.setUpdatesEnabled(True)
-            
-            self._rows_pending_resize.clear()
+            self._row_heights_settled[:] = False
+            self._apply_estimated_row_heights(np.arange(row_count))
+
+        rows_to_resize = {row for row in self._rows_pending_resize if row < row_count}
+        self._rows_pending_resize.clear()
+        first, last = self._visible_row_window()
+        rows_to_resize.update((first + np.flatnonzero(~self._row_heights_settled[first:last + 1])).tolist())
+        self._resize_rows_keeping_anchor(sorted(rows_to_resize))
+
+        # Si las filas han encogido pueden haber entrado en pantalla otras sin calcular
+        first, last = self._visible_row_window()
+        if not self._row_heights_settled[first:last + 1].all():
+            self._resize_rows_timer.start()
+
+    def _visible_row_window(self) -> Tuple[int, int]:
+        """Primera y última fila visibles, ampliadas con ROW_HEIGHT_MARGIN_ROWS por cada lado."""
+        row_count = self.pandas_model.rowCount()
+        first = self.table_view.rowAt(0)
+        last = self.table_view.rowAt(self.table_view.viewport().height() - 1)
+        first = 0 if first < 0 else first
+        last = row_count - 1 if last < 0 else last
+        return max(0, first - ROW_HEIGHT_MARGIN_ROWS), min(row_count - 1, last + ROW_HEIGHT_MARGIN_ROWS)
+
+    def _resize_rows_keeping_anchor(self, rows: List[int]):
+        if not rows: return
+        view = self.table_view
+        anchor_row = view.rowAt(0)
+        anchor_offset = view.rowViewportPosition(anchor_row) if anchor_row >= 0 else 0
+        # Desactivamos actualizaciones visuales momentáneamente para velocidad
+        view.setUpdatesEnabled(False)
+        try:
+            for row_idx in rows:
+                view.resizeRowToContents(row_idx)
+        finally:
+            view.setUpdatesEnabled(True)
+        self._row_heights_settled[rows] = True
+        # Desplazando por píxeles, las filas de arriba que cambian de altura moverían lo que se está viendo
+        if anchor_row >= 0 and view.verticalScrollMode() == QAbstractItemView.ScrollMode.ScrollPerPixel:
+            drift = view.rowViewportPosition(anchor_row) - anchor_offset
+            if drift: view.verticalScrollBar().setValue(view.verticalScrollBar().value() + drift)
+
+    def _apply_estimated_row_heights(self, rows: np.ndarray):
+        if rows.size == 0 or not hasattr(self, 'dialog_delegate'): return
+        header = self.table_view.verticalHeader()
+        heights = np.full(rows.size, header.minimumSectionSize(), dtype=np.int64)
+        for view_col in (C.VIEW_COL_DIALOGUE, C.VIEW_COL_EUSKERA, C.VIEW_COL_OHARRAK):
+            if self.table_view.isColumnHidden(view_col): continue
+            texts = self.pandas_model.get_column_values(self.VIEW_TO_DF_COL_MAP[view_col])[rows]
+            column_heights = self.dialog_delegate.estimated_heights(texts, self.table_view.columnWidth(view_col))
+            heights = np.maximum(heights, column_heights)
+        for row_idx, height in zip(rows.tolist(), heights.tolist()):
+            if header.sectionSize(row_idx) != height: header.resizeSection(row_idx, height)
+
+    def _request_visible_row_heights(self):
+        # Al desplazarse no se reinicia la espera: las filas que entran se calculan como mucho cada 100 ms
+        if not self._resize_rows_timer.isActive(): self._resize_rows_timer.start()
+
+    def _on_rows_inserted_for_heights(self, parent: QModelIndex, first: int, last: int):
+        self._row_heights_settled = np.insert(self._row_heights_settled, min(first, len(self._row_heights_settled)),
+                                              np.zeros(last - first + 1, dtype=bool))
+        self._apply_estimated_row_heights(np.arange(first, last + 1))
+        self._request_visible_row_heights()
+
+    def _on_rows_removed_for_heights(self, parent: QModelIndex, first: int, last: int):
+        self._row_heights_settled = np.delete(self._row_heights_settled, np.s_[first:last + 1])
+
+    def _on_rows_moved_for_heights(self, parent: QModelIndex, start: int, end: int, destination: QModelIndex, row: int):
+        if end >= len(self._row_heights_settled): return
+        moved = self._row_heights_settled[start:end + 1].copy()
+        remaining = np.delete(self._row_heights_settled, np.s_[start:end + 1])
+        target = row if row < start else row - (end - start + 1)
+        self._row_heights_settled = np.insert(remaining, target, moved)
+
+    def _on_model_reset_for_heights(self):
+        self._row_heights_settled = np.zeros(self.pandas_model.rowCount(), dtype=bool)
 
     def _request_heavy_validation(self):
             # Reinicia la cuenta atrás cada vez que se llama.
@@ -673,9 +763,8 @@ class TableWindow(QWidget):
             self._heavy_validation_timer.start()
 
     def _perform_heavy_validation(self):
-        # Aquí es donde realmente llamamos al cálculo pesado del modelo
-        # Recuerda que le quitamos el guion bajo al método en el modelo
-        self.pandas_model.revalidate_all_lines()
+        # El modelo solo revalida los grupos (IN, OUT) que han cambiado desde la última vez
+        self.pandas_model.request_line_validation()
         
         # Una vez recalculado, pedimos actualizar los indicadores visuales
         self._request_line_error_indicator_update()
@@ -702,9 +791,7 @@ class TableWindow(QWidget):
         # Aquí forzamos el global explícitamente
         self.request_global_resize_deferred()
         
-        for row_idx in range(self.pandas_model.rowCount()):
-            self.pandas_model.force_time_validation_update_for_row(row_idx)
-            self.pandas_model.force_scene_validation_update_for_row(row_idx)
+        self.pandas_model.validate_all_times_and_scenes()
 
     def on_model_layout_changed(self): self.adjust_all_row_heights_and_validate(); self.update_character_completer_and_notify(); self._recache_times()
 
@@ -753,12 +840,28 @@ class TableWindow(QWidget):
         
         # Lógica existente para caché de tiempos
         if top_left_index.column() <= C.VIEW_COL_OUT and bottom_right_index.column() >= C.VIEW_COL_IN:
-            for row in range(top_left_index.row(), bottom_right_index.row() + 1): 
-                self._update_time_cache_for_row(row)
+            self._sync_time_cache()
 
     def update_character_completer_and_notify(self):
-        delegate = CharacterDelegate(get_names_callback=self.get_character_names_from_model, parent=self.table_view)
-        self.table_view.setItemDelegateForColumn(C.VIEW_COL_CHARACTER, delegate)
+        # Varios cambios seguidos (escribir en PERSONAJE, renombrados en bloque) se agrupan en una sola actualización
+        self._character_names_timer.start()
+
+    def _refresh_character_names(self):
+        """Lleva los nombres de personaje actuales al modelo del completer, quitando y añadiendo solo los que cambian."""
+        names = self.pandas_model.character_names()
+        current = self.character_names_model.stringList()
+        if names == current: return
+        new_names, old_names = set(names), set(current)
+        if len(new_names - old_names) + len(old_names - new_names) > len(names) // 2:
+            self.character_names_model.setStringList(names)
+        else:
+            for row in range(len(current) - 1, -1, -1):
+                if current[row] not in new_names: self.character_names_model.removeRows(row, 1)
+            # Lo que queda es una sublista ordenada de `names`: cada nombre nuevo entra en su posición final
+            for row, name in enumerate(names):
+                if name not in old_names:
+                    self.character_names_model.insertRows(row, 1)
+                    self.character_names_model.setData(self.character_names_model.index(row), name)
         self.character_name_changed.emit()
 
     def copy_selected_time(self) -> None:
@@ -773,22 +876,18 @@ class TableWindow(QWidget):
             if old_value != self.clipboard_text: self.undo_stack.push(EditCommand(self, idx.row(), idx.column(), old_value, self.clipboard_text))
 
     def adjust_dialogs(self, max_chars: int) -> None:
-        if self.pandas_model.dataframe().empty: return
+        if self.pandas_model.df_row_count() == 0: return
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         try:
-            self.undo_stack.beginMacro(f"Ajustar Diálogos ({C.COL_DIALOGO} y {C.COL_EUSKERA})")
-            for col_name in [C.COL_DIALOGO, C.COL_EUSKERA]:
-                view_col_idx = self.pandas_model.get_view_column_index(col_name)
-                if view_col_idx is not None:
-                    for df_idx in range(self.pandas_model.rowCount()):
-                        original_text = str(self.pandas_model.dataframe().at[df_idx, col_name])
-                        adjusted_text = ajustar_dialogo(original_text, max_chars)
-                        if original_text != adjusted_text: self.undo_stack.push(EditCommand(self, df_idx, view_col_idx, original_text, adjusted_text))
-            self.undo_stack.endMacro()
+            # Un único comando con solo las celdas que cambian: una asignación y una notificación por columna
+            adjusted = {col_name: wrap_many(self.pandas_model.get_column_values(col_name), max_chars)
+                        for col_name in [C.COL_DIALOGO, C.COL_EUSKERA] if self.pandas_model.get_view_column_index(col_name) is not None}
+            command = BulkColumnEditCommand.from_new_values(self, adjusted, f"Ajustar Diálogos ({C.COL_DIALOGO} y {C.COL_EUSKERA})")
+            if command is not None: self.undo_stack.push(command)
         finally:
             QApplication.restoreOverrideCursor()
             
-        if not self.undo_stack.isClean() and self.undo_stack.command(self.undo_stack.count() - 1).text().startswith("Ajustar"):
+        if command is not None:
             QMessageBox.information(self, "Éxito", "Diálogos y textos en Euskera ajustados.")
         else: QMessageBox.information(self, "Info", "No se encontraron textos que necesitaran ajuste.")
 
@@ -796,19 +895,20 @@ class TableWindow(QWidget):
         selected_rows = self.table_view.selectionModel().selectedRows()
         if len(selected_rows) != 1: return
         df_idx_selected = selected_rows[0].row()
-        if df_idx_selected >= self.pandas_model.rowCount() - 1: return
-        current_df, df_idx_next = self.pandas_model.dataframe(), df_idx_selected + 1
-        in_time, out_time = str(current_df.at[df_idx_selected, C.COL_IN]), str(current_df.at[df_idx_selected, C.COL_OUT])
-        self.undo_stack.beginMacro("Copiar IN/OUT a Siguiente")
-        old_in_next = str(current_df.at[df_idx_next, C.COL_IN])
-        if in_time != old_in_next: self.undo_stack.push(EditCommand(self, df_idx_next, C.VIEW_COL_IN, old_in_next, in_time))
-        old_out_next = str(current_df.at[df_idx_next, C.COL_OUT])
-        if out_time != old_out_next: self.undo_stack.push(EditCommand(self, df_idx_next, C.VIEW_COL_OUT, old_out_next, out_time))
-        self.undo_stack.endMacro()
+        if df_idx_selected >= self.pandas_model.df_row_count() - 1: return
+        model, df_idx_next = self.pandas_model, df_idx_selected + 1
+        in_time, out_time = model.get_value(df_idx_selected, C.COL_IN), model.get_value(df_idx_selected, C.COL_OUT)
+        with model.batch_changes():
+            self.undo_stack.beginMacro("Copiar IN/OUT a Siguiente")
+            old_in_next = model.get_value(df_idx_next, C.COL_IN)
+            if in_time != old_in_next: self.undo_stack.push(EditCommand(self, df_idx_next, C.VIEW_COL_IN, old_in_next, in_time))
+            old_out_next = model.get_value(df_idx_next, C.COL_OUT)
+            if out_time != old_out_next: self.undo_stack.push(EditCommand(self, df_idx_next, C.VIEW_COL_OUT, old_out_next, out_time))
+            self.undo_stack.endMacro()
 
     def add_new_row(self) -> None:
         selected_rows = self.table_view.selectionModel().selectedRows()
-        insert_at_view_row = selected_rows[0].row() + 1 if selected_rows else self.pandas_model.rowCount()
+        insert_at_view_row = selected_rows[0].row() + 1 if selected_rows else self.pandas_model.df_row_count()
         self.undo_stack.push(AddRowCommand(self, insert_at_view_row, insert_at_view_row))
 
     def remove_row(self) -> None:
@@ -829,7 +929,7 @@ class TableWindow(QWidget):
 
     def move_row_down(self) -> None:
         idx = self.table_view.currentIndex()
-        if idx.isValid() and idx.row() < self.pandas_model.rowCount() - 1: self.undo_stack.push(MoveRowCommand(self, idx.row(), idx.row() + 1))
+        if idx.isValid() and idx.row() < self.pandas_model.df_row_count() - 1: self.undo_stack.push(MoveRowCommand(self, idx.row(), idx.row() + 1))
 
     def handle_dialog_editor_state_on_focus_out(self, text: str, cursor_pos: int, index_edited: QModelIndex):
         self.last_focused_dialog_text, self.last_focused_dialog_cursor_pos, self.last_focused_dialog_index = text, cursor_pos, index_edited
@@ -847,7 +947,7 @@ class TableWindow(QWidget):
             df_col_name = C.COL_DIALOGO
         
         # Obtenemos el texto completo
-        full_text = str(self.pandas_model.dataframe().at[current_idx.row(), df_col_name])
+        full_text = self.pandas_model.get_value(current_idx.row(), df_col_name)
 
         # --- MODO AUTOMÁTICO ---
         if hasattr(self, 'auto_split_checkbox') and self.auto_split_checkbox.isChecked():
@@ -931,15 +1031,15 @@ class TableWindow(QWidget):
         df_idx_curr = selected_rows[0].row()
         df_idx_next = df_idx_curr + 1
         
-        if df_idx_next >= self.pandas_model.rowCount(): 
+        if df_idx_next >= self.pandas_model.df_row_count(): 
             QMessageBox.warning(self, "Juntar", "No se puede juntar la última fila.")
             return
             
-        df = self.pandas_model.dataframe()
+        model = self.pandas_model
         
         # Comprobación de personaje
-        char_curr = str(df.at[df_idx_curr, C.COL_PERSONAJE]).strip()
-        char_next = str(df.at[df_idx_next, C.COL_PERSONAJE]).strip()
+        char_curr = model.get_value(df_idx_curr, C.COL_PERSONAJE).strip()
+        char_next = model.get_value(df_idx_next, C.COL_PERSONAJE).strip()
         
         if char_curr != char_next: 
             QMessageBox.warning(self, "Juntar", "Solo se pueden juntar intervenciones del mismo personaje.")
@@ -959,11 +1059,11 @@ class TableWindow(QWidget):
             return txt
 
         # Obtener textos limpios
-        dlg1 = clean_cell_text(df.at[df_idx_curr, C.COL_DIALOGO])
-        dlg2 = clean_cell_text(df.at[df_idx_next, C.COL_DIALOGO])
+        dlg1 = clean_cell_text(model.get_value(df_idx_curr, C.COL_DIALOGO))
+        dlg2 = clean_cell_text(model.get_value(df_idx_next, C.COL_DIALOGO))
         
-        eusk1 = clean_cell_text(df.at[df_idx_curr, C.COL_EUSKERA])
-        eusk2 = clean_cell_text(df.at[df_idx_next, C.COL_EUSKERA])
+        eusk1 = clean_cell_text(model.get_value(df_idx_curr, C.COL_EUSKERA))
+        eusk2 = clean_cell_text(model.get_value(df_idx_next, C.COL_EUSKERA))
 
         # Unir solo si hay contenido (evita espacios extra si uno está vacío)
         merged_dialog = f"{dlg1} {dlg2}".strip()
@@ -977,22 +1077,12 @@ class TableWindow(QWidget):
             merged_dialog, 
             merged_euskera, 
             df_idx_next, 
-            str(df.at[df_idx_curr, C.COL_OUT])
+            model.get_value(df_idx_curr, C.COL_OUT)
         ))
 
-    def convert_time_code_to_milliseconds(self, time_code: str) -> Optional[int]:
-        try:
-            h, m, s, f = map(int, time_code.split(':'))
-            return (h * 3600 + m * 60 + s) * 1000 + int(round((f / C.FPS) * 1000.0))
-        except (ValueError, TypeError): return None
-
-    def convert_milliseconds_to_time_code(self, ms: int) -> str:
-        if ms < 0: ms = 0
-        total_seconds, rem_ms = divmod(ms, 1000)
-        h, rem_seconds = divmod(total_seconds, 3600)
-        m, s = divmod(rem_seconds, 60)
-        f = min(int(round(rem_ms / (1000.0 / C.FPS))), int(C.FPS - 1))
-        return f"{int(h):02d}:{int(m):02d}:{int(s):02d}:{int(f):02d}"
+    def convert_time_code_to_milliseconds(self, time_code: str) -> Optional[int]: return tc_to_ms(time_code)
+
+    def convert_milliseconds_to_time_code(self, ms: int) -> str: return ms_to_tc(ms)
 
     def update_in_out_from_player(self, action_type: str, position_ms: int) -> None:
         idx = self.table_view.currentIndex()
@@ -1019,11 +1109,12 @@ class TableWindow(QWidget):
         idx = self.table_view.currentIndex()
         if not idx.isValid(): return
         next_row = idx.row() + 1
-        if next_row >= self.pandas_model.rowCount(): return
+        if next_row >= self.pandas_model.df_row_count(): return
+        self.pandas_model.ensure_rows_fetched(next_row)
         self.table_view.selectRow(next_row)
         self.table_view.scrollTo(self.pandas_model.index(next_row, 0), QAbstractItemView.ScrollHint.PositionAtCenter)
         if self.link_out_to_next_in_enabled:
-            out_time, old_in_next = str(self.pandas_model.dataframe().at[idx.row(), C.COL_OUT]), str(self.pandas_model.dataframe().at[next_row, C.COL_IN])
+            out_time, old_in_next = self.pandas_model.get_value(idx.row(), C.COL_OUT), self.pandas_model.get_value(next_row, C.COL_IN)
             if out_time != old_in_next: self.undo_stack.push(EditCommand(self, next_row, C.VIEW_COL_IN, old_in_next, out_time))
 
     def change_scene(self) -> None:
@@ -1031,74 +1122,59 @@ class TableWindow(QWidget):
         if idx.isValid(): self.undo_stack.push(ChangeSceneCommand(self, idx.row()))
 
     def has_scene_numbers(self) -> bool:
-        df = self.pandas_model.dataframe()
-        if df.empty or C.COL_SCENE not in df.columns: return False
-        unique_scenes = set(str(s).strip() for s in df[C.COL_SCENE].unique() if pd.notna(s) and str(s).strip())
+        if self.pandas_model.df_row_count() == 0: return False
+        unique_scenes = set(s.strip() for s in set(self.pandas_model.get_column_values(C.COL_SCENE)) if s.strip())
         return len(unique_scenes) > 1 or (len(unique_scenes) == 1 and ("1" not in unique_scenes))
 
     def handle_ctrl_click_on_cell(self, view_row_idx: int) -> None:
-        if 0 <= view_row_idx < self.pandas_model.rowCount():
-            in_tc = str(self.pandas_model.dataframe().at[view_row_idx, C.COL_IN])
-            ms = self.convert_time_code_to_milliseconds(in_tc)
-            if ms is not None: self.in_out_signal.emit("IN", ms)
+        if 0 <= view_row_idx < self.pandas_model.df_row_count():
+            ms = int(self.pandas_model.get_time_ms(C.COL_IN)[view_row_idx])
+            if ms >= 0: self.in_out_signal.emit("IN", ms)
 
     def handle_alt_click_on_cell(self, view_row_idx: int) -> None:
-        if 0 <= view_row_idx < self.pandas_model.rowCount():
-            out_tc = str(self.pandas_model.dataframe().at[view_row_idx, C.COL_OUT])
-            ms = self.convert_time_code_to_milliseconds(out_tc)
-            if ms is not None: self.in_out_signal.emit("OUT", ms)
+        if 0 <= view_row_idx < self.pandas_model.df_row_count():
+            ms = int(self.pandas_model.get_time_ms(C.COL_OUT)[view_row_idx])
+            if ms >= 0: self.in_out_signal.emit("OUT", ms)
 
     def _recache_times(self):
-        self._time_cache.clear()
-        df = self.pandas_model.dataframe()
-        if df.empty: return
-        for position in range(len(df)):
-            in_tc = df.iloc[position][C.COL_IN]
-            start_ms = self.convert_time_code_to_milliseconds(str(in_tc))
-            if start_ms is not None: self._time_cache.append((start_ms, position))
-        self._time_cache.sort(key=lambda x: x[0])
-
-    def _update_time_cache_for_row(self, df_row_idx: int):
-        self._time_cache = [item for item in self._time_cache if item[1] != df_row_idx]
-        current_df = self.pandas_model.dataframe()
-        if df_row_idx >= len(current_df): return
-        new_in_tc = str(current_df.iloc[df_row_idx][C.COL_IN])
-        new_start_ms = self.convert_time_code_to_milliseconds(new_in_tc)
-        if new_start_ms is not None: bisect.insort(self._time_cache, (new_start_ms, df_row_idx))
+        self._time_cache_revision = self.pandas_model.revision()
+        self._time_index.rebuild(self.pandas_model.get_time_ms(C.COL_IN), self.pandas_model.get_time_ms(C.COL_OUT))
+
+    def _sync_time_cache(self):
+        """Actualiza la caché de tiempos solo con las filas modificadas desde la última sincronización."""
+        changed_rows = self.pandas_model.changed_rows_since(self._time_cache_revision)
+        if changed_rows is None:
+            self._recache_times()  # Filas insertadas, borradas o movidas: se reconstruye de una vez (vectorizado)
+            return
+        if changed_rows.size:
+            self._time_index.update_rows(changed_rows, self.pandas_model.get_time_ms(C.COL_IN)[changed_rows],
+                                         self.pandas_model.get_time_ms(C.COL_OUT)[changed_rows])
+        self._time_cache_revision = self.pandas_model.revision()
 
     def sync_with_video_position(self, position_ms: int):
-        if self._is_marking_out or not self.sync_video_checkbox.isChecked() or not self._time_cache: return
-        insertion_point = bisect.bisect_right([item[0] for item in self._time_cache], position_ms)
-        active_row_index = -1
-        if insertion_point > 0:
-            candidate_start_ms, candidate_row_index = self._time_cache[insertion_point - 1]
-            current_df = self.pandas_model.dataframe()
-            if candidate_row_index < len(current_df):
-                out_tc = current_df.iloc[candidate_row_index][C.COL_OUT]
-                end_ms = self.convert_time_code_to_milliseconds(str(out_tc))
-                if end_ms is not None and candidate_start_ms <= position_ms < end_ms: active_row_index = candidate_row_index
+        if self._is_marking_out or not self.sync_video_checkbox.isChecked() or len(self._time_index) == 0: return
+        # Si hay intervenciones solapadas se sigue la que ha empezado más tarde
+        active_row_index = self._time_index.latest_active_row(position_ms)
         if active_row_index != self._currently_synced_row:
             self._currently_synced_row = active_row_index
             self.table_view.selectionModel().clear()
             if active_row_index != -1:
+                self.pandas_model.ensure_rows_fetched(active_row_index)
                 self.table_view.selectRow(active_row_index)
                 self.table_view.scrollTo(self.pandas_model.index(active_row_index, 0), QAbstractItemView.ScrollHint.PositionAtCenter)
 
     def get_character_names_from_model(self) -> List[str]:
-        df = self.pandas_model.dataframe()
-        if df.empty or C.COL_PERSONAJE not in df.columns: return []
-        return sorted(list(set(str(name).strip() for name in df[C.COL_PERSONAJE].unique() if pd.notna(name) and str(name).strip())))
+        return self.pandas_model.character_names()
 
     def update_multiple_character_names(self, old_names_list: List[str], new_name: str):
         if not new_name.strip(): QMessageBox.warning(self, "Nombre Inválido", "El nombre del personaje no puede estar vacío."); return
         self.undo_stack.push(UpdateMultipleCharactersCommand(self, old_names_list, new_name))
 
     def trim_all_character_names(self):
-        df = self.pandas_model.dataframe()
-        if df.empty or C.COL_PERSONAJE not in df.columns: return
+        if self.pandas_model.df_row_count() == 0: return
         
         # 1. Simular la limpieza para ver si vale la pena ejecutar el comando
-        current_series = df[C.COL_PERSONAJE].astype(str)
+        current_series = pd.Series(self.pandas_model.get_column_values(C.COL_PERSONAJE), dtype=object)
         
         # USAMOS EXACTAMENTE LA MISMA REGEX QUE EN EL COMANDO
         cleaned_series = current_series.str.replace(C.REGEX_PARENTHETICALS, '', regex=True).str.strip()
@@ -1120,39 +1196,39 @@ class TableWindow(QWidget):
         QMessageBox.information(self, "Limpieza Completa", "Se han eliminado paréntesis y espacios de los nombres.")
 
     def find_and_replace(self, find_text: str, replace_text: str, search_in_character: bool, search_in_dialogue: bool, search_in_euskera: bool) -> None:
-        if self.pandas_model.dataframe().empty or not find_text: return
+        if self.pandas_model.df_row_count() == 0 or not find_text: return
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         changed_count = 0
         try:
-            self.undo_stack.beginMacro("Buscar y Reemplazar Todo")
             cols_to_search = []
             if search_in_character: cols_to_search.append(C.COL_PERSONAJE)
             if search_in_dialogue: cols_to_search.append(C.COL_DIALOGO)
             if search_in_euskera: cols_to_search.append(C.COL_EUSKERA)
             
+            pattern = re.compile(re.escape(find_text), flags=re.IGNORECASE)
+            replaced = {}
             for col_name in cols_to_search:
-                view_col_idx = self.pandas_model.get_view_column_index(col_name)
-                if view_col_idx is not None:
-                    for df_idx in range(self.pandas_model.rowCount()):
-                        original_text = str(self.pandas_model.dataframe().at[df_idx, col_name])
-                        new_text, num_subs = re.subn(re.escape(find_text), replace_text, original_text, flags=re.IGNORECASE)
-                        if num_subs > 0: 
-                            self.undo_stack.push(EditCommand(self, df_idx, view_col_idx, original_text, new_text))
-                            changed_count += num_subs
-            self.undo_stack.endMacro()
+                if self.pandas_model.get_view_column_index(col_name) is None: continue
+                texts = pd.Series(self.pandas_model.get_column_values(col_name), dtype=object)
+                num_subs = texts.str.count(pattern)
+                if num_subs.sum() == 0: continue
+                changed_count += int(num_subs.sum())
+                replaced[col_name] = texts.str.replace(pattern, replace_text, regex=True).to_numpy(dtype=object)
+            command = BulkColumnEditCommand.from_new_values(self, replaced, "Buscar y Reemplazar Todo")
+            if command is not None: self.undo_stack.push(command)
         finally:
             QApplication.restoreOverrideCursor()
             
         QMessageBox.information(self, "Reemplazar Todo", f"{changed_count} reemplazo(s) realizado(s).")
 
     def replace_in_current_match(self, df_idx: int, find_text: str, replace_text: str, in_char: bool, in_dialogue: bool, in_euskera: bool) -> bool:
-        if self.pandas_model.dataframe().empty or not find_text or not (0 <= df_idx < self.pandas_model.rowCount()): return False
+        if self.pandas_model.df_row_count() == 0 or not find_text or not (0 <= df_idx < self.pandas_model.df_row_count()): return False
         cols_to_check = []
         if in_char: cols_to_check.append(C.COL_PERSONAJE)
         if in_dialogue: cols_to_check.append(C.COL_DIALOGO)
         if in_euskera: cols_to_check.append(C.COL_EUSKERA)
         for col_name in cols_to_check:
-            original_text = str(self.pandas_model.dataframe().at[df_idx, col_name])
+            original_text = self.pandas_model.get_value(df_idx, col_name)
             if re.search(re.escape(find_text), original_text, flags=re.IGNORECASE):
                 new_text, _ = re.subn(re.escape(find_text), replace_text, original_text, count=1, flags=re.IGNORECASE)
                 view_col_idx = self.pandas_model.get_view_column_index(col_name)
@@ -1191,24 +1267,20 @@ class TableWindow(QWidget):
         if self.get_icon: self.toggle_header_button.setIcon(icon)
 
     def convert_all_characters_to_uppercase(self):
-        if self.pandas_model.dataframe().empty: return
+        if self.pandas_model.df_row_count() == 0: return
         
         # CAMBIO: Feedback visual
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         try:
-            self.undo_stack.beginMacro("Convertir Personajes a Mayúsculas")
-            view_col_char = self.pandas_model.get_view_column_index(C.COL_PERSONAJE)
-            if view_col_char is not None:
-                for df_idx in range(self.pandas_model.rowCount()):
-                    old_name = str(self.pandas_model.dataframe().at[df_idx, C.COL_PERSONAJE])
-                    new_name = old_name.upper()
-                    if old_name != new_name: self.undo_stack.push(EditCommand(self, df_idx, view_col_char, old_name, new_name))
-            self.undo_stack.endMacro()
+            names = pd.Series(self.pandas_model.get_column_values(C.COL_PERSONAJE), dtype=object)
+            command = BulkColumnEditCommand.from_new_values(self, {C.COL_PERSONAJE: names.str.upper().to_numpy(dtype=object)},
+                                                            "Convertir Personajes a Mayúsculas")
+            if command is not None: self.undo_stack.push(command)
         finally:
             # Siempre restaurar el cursor
             QApplication.restoreOverrideCursor()
 
-        if not self.undo_stack.isClean() and self.undo_stack.command(self.undo_stack.count()-1).text().startswith("Convertir"):
+        if command is None:
             QMessageBox.information(self, "Información", "Todos los nombres de personaje ya estaban en mayúsculas.")
 
 
@@ -1217,25 +1289,24 @@ class TableWindow(QWidget):
         self.undo_stack.push(SplitCharacterCommand(self, old_name, new_name1, new_name2))
 
     def reset_all_scenes(self):
-        if self.pandas_model.dataframe().empty: return
+        if self.pandas_model.df_row_count() == 0: return
         reply = QMessageBox.question(self, "Confirmar Acción", "¿Cambiar TODAS las escenas a '1'?\n(Se puede deshacer con Ctrl+Z)", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes: self.undo_stack.push(ResetScenesCommand(self))
 
     def reset_all_timecodes(self):
-        if self.pandas_model.dataframe().empty: return
+        if self.pandas_model.df_row_count() == 0: return
         reply = QMessageBox.question(self, "Confirmar Acción", "¿Reiniciar TODOS los IN/OUT a 00:00:00:00?\n(Se puede deshacer con Ctrl+Z)", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes: self.undo_stack.push(ResetTimecodesCommand(self))
 
     def delete_all_interventions_by_character(self, character_name: str):
-        df = self.pandas_model.dataframe()
-        if df.empty: return
-        indices_to_remove = df.index[df[C.COL_PERSONAJE] == character_name].tolist()
+        if self.pandas_model.df_row_count() == 0: return
+        indices_to_remove = np.flatnonzero(self.pandas_model.get_column_values(C.COL_PERSONAJE) == character_name).tolist()
         if not indices_to_remove: QMessageBox.information(self, "Eliminar Personaje", f"No se encontraron intervenciones para '{character_name}'."); return
         reply = QMessageBox.question(self, "Confirmar Eliminación Masiva", f"¿Eliminar las {len(indices_to_remove)} intervenciones de '{character_name}'?\n(Reversible con Ctrl+Z)", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel, QMessageBox.StandardButton.Cancel)
         if reply == QMessageBox.StandardButton.Yes: self.undo_stack.push(RemoveRowsCommand(self, indices_to_remove))
 
     def copy_in_to_previous_out(self):
-        if self.pandas_model.dataframe().empty: QMessageBox.information(self, "Operación no posible", "No hay datos en el guion."); return
+        if self.pandas_model.df_row_count() == 0: QMessageBox.information(self, "Operación no posible", "No hay datos en el guion."); return
         reply = QMessageBox.question(self, "Confirmar Operación", "Esto sobrescribirá todos los valores de la columna 'OUT' (excepto el de la última fila) con los valores 'IN' de la fila siguiente.\n\n¿Desea continuar?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel, QMessageBox.StandardButton.Cancel)
         if reply == QMessageBox.StandardButton.Yes:
             self.undo_stack.push(CopyInToPreviousOutCommand(self))
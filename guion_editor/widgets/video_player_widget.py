@@ -1,6 +1,5 @@
 # guion_editor/widgets/video_player_widget.py
 import os
-import bisect 
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QSlider, QLabel,
@@ -16,6 +15,7 @@ from .time_code_edit import TimeCodeEdit
 from guion_editor.widgets.waveform_widget import WaveformWidget
 from guion_editor import constants as C
 from guion_editor.utils.theme_manager import theme_manager
+from guion_editor.utils.timecode import ms_to_tc, ms_to_tc_parts, tc_to_ms
 
 class VideoPlayerWidget(QWidget):
     in_out_signal = pyqtSignal(str, int)
@@ -38,9 +38,9 @@ class VideoPlayerWidget(QWidget):
 
         self.table_window_ref = None
         
-        self.subtitle_timeline = [] 
-        self.subtitle_start_times = [] 
-        self.current_subtitle_timeline_idx = -1 
+        # Tramo [desde, hasta) en el que el subtítulo mostrado sigue siendo válido
+        self._subtitle_span = (0, -1)
+        self._subtitle_text = ""
         self.subtitle_source_column = 'DIÁLOGO'
 
         if self.get_icon:
@@ -375,7 +375,7 @@ class VideoPlayerWidget(QWidget):
             self._handle_subtitle_source_change() 
             self._trigger_subtitle_update(self.media_player.position())
         else:
-            self.subtitle_display_label.setText("")
+            self._clear_subtitle()
 
     def _handle_subtitle_source_change(self):
         if not self.table_window_ref:
@@ -386,32 +386,32 @@ class VideoPlayerWidget(QWidget):
         elif selected_text == "Euskera":
             self.subtitle_source_column = 'EUSKERA' 
         self.table_window_ref.trigger_recache_with_source(self.subtitle_source_column)
+        self._subtitle_span = (0, -1)
+
+    def _clear_subtitle(self):
+        self.subtitle_display_label.setText("")
+        self._subtitle_text = ""
+        self._subtitle_span = (0, -1)
 
     def _refresh_subtitle_timeline(self):
+        # El guion ha cambiado: el tramo guardado deja de valer
+        self._subtitle_span = (0, -1)
         if not self.table_window_ref:
-            self.subtitle_timeline = []
-            self.subtitle_start_times = []
             return
-        self.subtitle_timeline = self.table_window_ref.get_subtitle_timeline()
-        self.subtitle_start_times = [item[0] for item in self.subtitle_timeline]
-        self.current_subtitle_timeline_idx = -1
         self._trigger_subtitle_update(self.media_player.position())
 
     def _trigger_subtitle_update(self, position_ms: int):
-        if not self.subtitle_toggle_checkbox.isChecked() or not self.subtitle_timeline:
+        if not self.subtitle_toggle_checkbox.isChecked() or not self.table_window_ref:
+            return
+        span_from, span_until = self._subtitle_span
+        if span_from <= position_ms < span_until:
             return
-        idx = bisect.bisect_right(self.subtitle_start_times, position_ms)
-        found_subtitle_idx = -1
-        text_to_display = ""
-        if idx > 0:
-            candidate_idx = idx - 1
-            start_ms, end_ms, dialogue = self.subtitle_timeline[candidate_idx]
-            if start_ms <= position_ms < end_ms:
-                found_subtitle_idx = candidate_idx
-                text_to_display = dialogue
-        if self.current_subtitle_timeline_idx != found_subtitle_idx:
+        lines, valid_until = self.table_window_ref.active_subtitles(position_ms)
+        self._subtitle_span = (position_ms, valid_until)
+        text_to_display = "\n".join(lines)
+        if text_to_display != self._subtitle_text:
             self.subtitle_display_label.setText(text_to_display)
-            self.current_subtitle_timeline_idx = found_subtitle_idx
+            self._subtitle_text = text_to_display
 
     def load_video(self, video_path: str) -> None:
         try:
@@ -541,11 +541,10 @@ class VideoPlayerWidget(QWidget):
             if self.me_player and not self.me_player.source().isEmpty():
                 self.me_player.setPosition(0)
                 self.me_player.pause()
-            self.subtitle_display_label.setText("") 
-            self.current_subtitle_timeline_idx = -1
+            self._clear_subtitle()
         elif status == QMediaPlayer.MediaStatus.InvalidMedia:
             QMessageBox.warning(self, "Error de Medio", "El archivo de video es inválido o no soportado.")
-            self.subtitle_display_label.setText("")
+            self._clear_subtitle()
             self._refresh_subtitle_timeline()
         elif status == QMediaPlayer.MediaStatus.NoMedia: 
             self.time_code_label.setText("00:00:00:00")
@@ -555,7 +554,7 @@ class VideoPlayerWidget(QWidget):
             self.me_toggle_checkbox.setEnabled(False)
             self.me_toggle_checkbox.setChecked(False)
             self.use_me_audio = False
-            self.subtitle_display_label.setText("") 
+            self._clear_subtitle()
             self._refresh_subtitle_timeline()
             self._update_audio_outputs()
 
@@ -651,8 +650,7 @@ class VideoPlayerWidget(QWidget):
             if not (0 <= m < 60 and 0 <= s < 60 and 0 <= f < C.FPS):
                 raise ValueError(f"Valores de tiempo inválidos (MM:SS deben ser < 60, FF < {int(C.FPS)}).")
 
-            msecs_per_frame = 1000.0 / C.FPS
-            target_msecs = int(round(((h * 3600 + m * 60 + s) * 1000) + (f * msecs_per_frame)))
+            target_msecs = tc_to_ms(new_tc_str)
 
             duration_msecs = self.media_player.duration()
 
@@ -748,15 +746,7 @@ class VideoPlayerWidget(QWidget):
         self.slider.setRange(0, duration if duration > 0 else 0)
 
     def _convert_ms_to_tc_parts(self, position_ms: int) -> tuple[int, int, int, int]:
-        hours, minutes, seconds, frames = 0, 0, 0, 0
-        if position_ms >= 0:
-            msecs_per_frame = 1000.0 / C.FPS
-            total_seconds, msecs = divmod(position_ms, 1000)
-            hours, rem_seconds = divmod(total_seconds, 3600)
-            minutes, seconds = divmod(rem_seconds, 60)
-            frames = int(round(msecs / msecs_per_frame))
-            if frames >= C.FPS: frames = int(C.FPS - 1)
-        return int(hours), int(minutes), int(seconds), int(frames)
+        return ms_to_tc_parts(position_ms)
 
     def update_time_code_display(self) -> None:
         if self.time_code_display_stack.currentWidget() == self.time_code_label:
@@ -787,9 +777,7 @@ class VideoPlayerWidget(QWidget):
         except Exception as e: print(f"Error en mark_out_continuous (timer): {str(e)}")
 
     def convert_milliseconds_to_time_code_str(self, ms: int) -> str:
-        if ms < 0: ms = 0
-        h, m, s, f = self._convert_ms_to_tc_parts(ms)
-        return f"{h:02}:{m:02}:{s:02}:{f:02}"
+        return ms_to_tc(ms)
 
     def setup_timers(self) -> None:
         self.display_update_timer = QTimer(self)
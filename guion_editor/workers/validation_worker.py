@@ -1,81 +1,105 @@
+import threading
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
-import pandas as pd
-from typing import Dict, List, Set
+import numpy as np
+from typing import Dict, List, Optional, Tuple
 from guion_editor import constants_logic as C
+from guion_editor.models.column_store import ColumnSnapshot
+from guion_editor.models.validation_status import validate_line_limits
+
+# Filas por tramo de validación: entre tramos se comprueba si el trabajo se ha cancelado
+VALIDATION_CHUNK_ROWS = 4096
+
+
+class ValidationJob:
+    """
+    One line validation request: the dirty (IN, OUT) groups and the snapshot they refer to.
+    `generation` grows with every job sent by the model; `cancel()` may be called from any thread.
+    """
+    def __init__(self, generation: int, snapshot: ColumnSnapshot, dirty_groups: Dict[Tuple[str, str], np.ndarray]):
+        self.generation = generation
+        self.snapshot = snapshot
+        self.dirty_groups = dirty_groups
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
 
 class ValidationWorker(QObject):
     """
     Worker class to perform heavy validation checks on the dataframe in a background thread.
+    Only the (IN, OUT) groups marked dirty by the model are revalidated.
     """
-    validation_finished = pyqtSignal(dict)  # Returns the new validation status dictionary
+    # (job, slots, dialogo_errors, euskera_errors): resultado solo de las filas revalidadas
+    validation_finished = pyqtSignal(object, object, object, object)
 
-    @pyqtSlot(pd.DataFrame)
-    def validate(self, df: pd.DataFrame):
-        """
-        Performs the heavy line count validation logic.
-        """
-        new_status: Dict[int, Dict[str, bool]] = {}
-        
-        if not df.empty:
-            # Filter rows that have at least one timecode set (optimization)
-            # Actually, the original logic checks rows where IN != default OR OUT != default
-            # But here we act on the passed copy
-            
-            # Note: We must respect the original logic's grouping
-            df_valid_times = df[(df[C.COL_IN] != C.DEFAULT_TIMECODE) | (df[C.COL_OUT] != C.DEFAULT_TIMECODE)]
-            
-            if not df_valid_times.empty:
-                # Group by IN and OUT to find simultaneous subtitles
-                for _, group_df in df_valid_times.groupby([C.COL_IN, C.COL_OUT]):
-                    group_indices = group_df.index.tolist()
-                    
-                    dialogo_error_indices = self._check_group_for_column(df, group_indices, C.COL_DIALOGO)
-                    euskera_error_indices = self._check_group_for_column(df, group_indices, C.COL_EUSKERA)
-                    
-                    for idx in group_indices:
-                        new_status[idx] = {
-                            C.COL_DIALOGO: idx not in dialogo_error_indices,
-                            C.COL_EUSKERA: idx not in euskera_error_indices
-                        }
+    # Únicas columnas que lee la validación: el modelo solo comparte estas en la instantánea
+    REQUIRED_COLUMNS = [C.COL_IN, C.COL_OUT, C.COL_PERSONAJE, C.COL_DIALOGO, C.COL_EUSKERA]
 
-        # Emit the result back to the main thread
-        self.validation_finished.emit(new_status)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Solo se guarda el trabajo pendiente más reciente: los anteriores sin empezar se descartan
+        self._pending_job: Optional[ValidationJob] = None
+        self._pending_lock = threading.Lock()
 
-    def _check_group_for_column(self, df: pd.DataFrame, group_indices: List[int], col_to_check: str) -> Set[int]:
+    def submit(self, job: ValidationJob) -> None:
+        """Called from the model's thread before emitting the signal connected to `run_pending`."""
+        with self._pending_lock:
+            self._pending_job = job
+
+    @pyqtSlot()
+    def run_pending(self):
+        """Runs the latest submitted job, if any (several queued requests collapse into one run)."""
+        with self._pending_lock:
+            job, self._pending_job = self._pending_job, None
+        if job is not None and not job.is_cancelled():
+            self.validate(job)
+
+    def validate(self, job: ValidationJob):
         """
-        Checks line constraints for a group of simultaneous subtitles.
+        Performs the line count validation for the job's dirty groups on its read-only snapshot.
+        Groups are checked columnar, in chunks of whole groups; a cancelled job emits nothing.
         """
-        total_lines_in_group = 0
-        lines_per_char: Dict[str, int] = {}
-        rows_per_char: Dict[str, List[int]] = {}
-        error_indices_for_this_column = set()
+        snapshot = job.snapshot
+        # Las filas sin tiempos (IN y OUT por defecto) no forman un bloque simultáneo: siempre válidas
+        default_key = (C.DEFAULT_TIMECODE, C.DEFAULT_TIMECODE)
+        untimed_slots = job.dirty_groups.get(default_key, np.zeros(0, dtype=np.int64))
+        groups = [slots for key, slots in job.dirty_groups.items() if key != default_key and len(slots)]
 
-        for idx in group_indices:
-            # Access data safely from the dataframe copy
-            text_val = df.at[idx, col_to_check]
-            char_val = df.at[idx, C.COL_PERSONAJE]
-            
-            text = str(text_val) if pd.notna(text_val) else ""
-            char = str(char_val) if pd.notna(char_val) else ""
+        slot_chunks: List[np.ndarray] = [untimed_slots]
+        dialogo_chunks: List[np.ndarray] = [np.zeros(len(untimed_slots), dtype=bool)]
+        euskera_chunks: List[np.ndarray] = [np.zeros(len(untimed_slots), dtype=bool)]
+        for chunk in self._chunk_groups(groups):
+            if job.is_cancelled():
+                return
+            slots = np.concatenate(chunk)
+            group_codes = np.repeat(np.arange(len(chunk)), [len(g) for g in chunk])
+            characters = snapshot.values_at_slots(C.COL_PERSONAJE, slots)
+            slot_chunks.append(slots)
+            dialogo_chunks.append(validate_line_limits(group_codes, characters, snapshot.values_at_slots(C.COL_DIALOGO, slots)))
+            euskera_chunks.append(validate_line_limits(group_codes, characters, snapshot.values_at_slots(C.COL_EUSKERA, slots)))
 
-            line_count = (text.count('\n') + 1) if text.strip() else 0
-            
-            total_lines_in_group += line_count
-            
-            lines_per_char[char] = lines_per_char.get(char, 0) + line_count
-            if char not in rows_per_char: rows_per_char[char] = []
-            rows_per_char[char].append(idx)
+        if job.is_cancelled():
+            return
+        # Emit the result back to the main thread
+        self.validation_finished.emit(job, np.concatenate(slot_chunks),
+                                      np.concatenate(dialogo_chunks), np.concatenate(euskera_chunks))
 
-        character_error_found = False
-        
-        # Rule 1: A single character cannot have 6 or more lines in a simultaneous block
-        for char, count in lines_per_char.items():
-            if count >= 6:
-                character_error_found = True
-                error_indices_for_this_column.update(rows_per_char[char])
-        
-        # Rule 2: Total lines in the simultaneous block cannot be 11 or more
-        if not character_error_found and total_lines_in_group >= 11:
-            error_indices_for_this_column.update(group_indices)
-            
-        return error_indices_for_this_column
+    @staticmethod
+    def _chunk_groups(groups: List[np.ndarray]) -> List[List[np.ndarray]]:
+        """Reparte los grupos en tramos de unas VALIDATION_CHUNK_ROWS filas sin partir ningún grupo."""
+        chunks: List[List[np.ndarray]] = []
+        current: List[np.ndarray] = []
+        current_rows = 0
+        for group in groups:
+            current.append(group)
+            current_rows += len(group)
+            if current_rows >= VALIDATION_CHUNK_ROWS:
+                chunks.append(current)
+                current, current_rows = [], 0
+        if current:
+            chunks.append(current)
+        return chunks
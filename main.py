@@ -286,7 +286,7 @@ class MainWindow(QMainWindow):
         else:
             TARGET_DIR = self.SAVE_DIR
 
-        if self.tableWindow.pandas_model.dataframe().empty:
+        if self.tableWindow.pandas_model.df_row_count() == 0:
             QMessageBox.information(self, "Guardar", "No hay datos para guardar.")
             return False
 
@@ -325,6 +325,7 @@ class MainWindow(QMainWindow):
             self.tableWindow.current_script_path = full_path
             self.tableWindow.current_script_name = filename
             self.tableWindow.undo_stack.setClean()
+            self.tableWindow.pandas_model.compact_storage()
             
             self._delete_recovery_file()
 
@@ -348,7 +349,7 @@ class MainWindow(QMainWindow):
         4. Guarda esa versión como un NUEVO archivo Excel con sufijo _SUB en la carpeta SUBS.
         5. Carga ese nuevo archivo en el editor.
         """
-        if self.tableWindow.pandas_model.dataframe().empty:
+        if self.tableWindow.pandas_model.df_row_count() == 0:
             QMessageBox.information(self, "Crear Versión SUB", "No hay datos para procesar.")
             return
 
@@ -486,7 +487,7 @@ class MainWindow(QMainWindow):
             self.save_script_directly()
 
     def export_to_srt(self) -> None:
-        if self.tableWindow.pandas_model.dataframe().empty:
+        if self.tableWindow.pandas_model.df_row_count() == 0:
             QMessageBox.information(self, "Exportar a SRT", "No hay datos en el guion para exportar.")
             return
 
@@ -823,7 +824,7 @@ class MainWindow(QMainWindow):
         self.tableWindow.change_scene()
 
     def open_takeo_dialog(self):
-        if self.tableWindow.pandas_model.dataframe().empty:
+        if self.tableWindow.pandas_model.df_row_count() == 0:
             QMessageBox.information(self, "Optimizar Takes", "No hay datos en el guion para optimizar.")
             return
             
@@ -857,11 +858,13 @@ class MainWindow(QMainWindow):
 
     def undo_action(self):
         if self.tableWindow and hasattr(self.tableWindow, 'undo_stack'):
-            self.tableWindow.undo_stack.undo()
+            with self.tableWindow.pandas_model.batch_changes():
+                self.tableWindow.undo_stack.undo()
 
     def redo_action(self):
         if self.tableWindow and hasattr(self.tableWindow, 'undo_stack'):
-            self.tableWindow.undo_stack.redo()
+            with self.tableWindow.pandas_model.batch_changes():
+                self.tableWindow.undo_stack.redo()
 
     def _load_settings(self):
         settings = QSettings("TuEmpresa", "EditorDeGuion")
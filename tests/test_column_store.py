@@ -0,0 +1,240 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from guion_editor import constants_logic as C
+from guion_editor.models.column_store import ColumnStore, INVALID_FRAMES, INVALID_MS, parse_tc_to_frames
+
+
+class TestColumnStore:
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({
+            C.COL_ID: [0, 1, None],
+            C.COL_SCENE: ["1", "1", "2"],
+            C.COL_IN: ["00:00:01:00", "00:00:02:10", "bad"],
+            C.COL_OUT: ["00:00:02:00", "00:00:03:00", "00:00:04:00"],
+            C.COL_PERSONAJE: ["ANA", None, "JON"],
+            C.COL_DIALOGO: ["Hola", "Adiós", float("nan")],
+            C.COL_EUSKERA: ["", "", ""],
+            C.COL_OHARRAK: ["", "", ""],
+            C.COL_BOOKMARK: [False, True, None],
+            C.COL_REPARTO: ["Actor A", "", "Actor J"],
+        })
+
+    def test_roundtrip_keeps_values_and_extra_columns(self, df):
+        store = ColumnStore.from_dataframe(df)
+        out = store.to_dataframe()
+
+        assert len(store) == 3
+        assert list(out.columns[:len(C.DF_COLUMN_ORDER)]) == C.DF_COLUMN_ORDER
+        assert out[C.COL_REPARTO].tolist() == ["Actor A", "", "Actor J"]
+        assert out[C.COL_PERSONAJE].tolist() == ["ANA", "", "JON"]
+        assert out[C.COL_BOOKMARK].tolist() == [False, True, False]
+        assert pd.isna(out.at[2, C.COL_ID])
+        assert store.display_text(2, C.COL_ID) == ""
+
+    def test_time_columns_keep_text_and_frames(self, df):
+        store = ColumnStore.from_dataframe(df)
+
+        assert store.frames(C.COL_IN).tolist() == [25, 60, INVALID_FRAMES]
+        assert store.ms(C.COL_IN).tolist() == [1000, 2400, INVALID_MS]
+        store.set(2, C.COL_IN, "00:00:03:05")
+        assert store.get(2, C.COL_IN) == "00:00:03:05"
+        assert store.frames(C.COL_IN)[2] == 80
+        assert store.ms(C.COL_IN)[2] == 3200
+
+    def test_duration_cache_is_invalidated_only_for_edited_row(self, df):
+        store = ColumnStore.from_dataframe(df)
+        store.cache_duration_text(0, "1.0s")
+        store.cache_duration_text(1, "0.6s")
+
+        store.set(1, C.COL_OUT, "00:00:05:00")
+        store.set(0, C.COL_DIALOGO, "Otro texto")
+        assert store.cached_duration_text(0) == "1.0s"
+        assert store.cached_duration_text(1) is None
+
+        store.move(0, 2)
+        assert store.cached_duration_text(2) == "1.0s"
+
+    def test_insert_remove_and_move(self, df):
+        store = ColumnStore.from_dataframe(df)
+        row = store.row(0)
+        row[C.COL_ID] = 7
+        store.insert(1, row)
+        assert store.column(C.COL_ID).tolist() == [0, 7, 1, -1]
+        assert store.get(1, C.COL_REPARTO) == "Actor A"
+
+        removed = store.remove(1)
+        assert removed[C.COL_ID] == 7
+        assert len(store) == 3
+
+        store.move(0, 2)
+        assert store.column(C.COL_PERSONAJE).tolist() == ["", "JON", "ANA"]
+        assert store.frames(C.COL_IN).tolist() == [60, INVALID_FRAMES, 25]
+
+    def test_block_insert_and_remove(self, df):
+        store = ColumnStore.from_dataframe(df)
+        rows = [store.row(0), store.row(2)]
+        rows[0][C.COL_ID], rows[1][C.COL_ID] = 10, 11
+        store.insert_block(1, rows)
+        assert store.column(C.COL_ID).tolist() == [0, 10, 11, 1, -1]
+        assert store.frames(C.COL_IN).tolist() == [25, 25, INVALID_FRAMES, 60, INVALID_FRAMES]
+        assert store.row_of_id(1) == 3
+        assert store.next_id() == 12
+
+        removed = store.remove_block(1, 3)
+        assert [r[C.COL_ID] for r in removed] == [10, 11]
+        assert store.column(C.COL_PERSONAJE).tolist() == ["ANA", "", "JON"]
+        assert store.row_of_id(10) is None
+        assert store.row_of_id(1) == 1
+
+    def test_reordering_touches_only_the_row_order_until_compacted(self, df):
+        store = ColumnStore.from_dataframe(df)
+        store.move(2, 0)
+        row = store.row(1)
+        row[C.COL_ID] = 5
+        store.insert(1, row)
+        store.remove(3)
+
+        assert store.column(C.COL_ID).tolist() == [-1, 5, 0]
+        assert store.ms(C.COL_IN, [0, 2]).tolist() == [INVALID_MS, 1000]
+        assert store.row_of_id(0) == 2
+        assert store._used == 4
+
+        epoch = store.slot_epoch
+        out = store.to_dataframe()
+        # Materializar solo lee: ni compacta ni invalida los huecos
+        assert store._used == 4 and store.slot_epoch == epoch
+        assert out[C.COL_ID].tolist()[1:] == [5, 0]
+        assert out[C.COL_PERSONAJE].tolist() == ["JON", "ANA", "ANA"]
+        assert out[C.COL_REPARTO].tolist() == ["Actor J", "Actor A", "Actor A"]
+
+        slots = store.slots_of()
+        slot_map = store.compact()
+        assert store._used == 3
+        assert slot_map[slots].tolist() == [0, 1, 2]
+        assert store.to_dataframe().equals(out)
+        assert store.get(1, C.COL_ID) == 5
+
+    def test_snapshot_shares_columns_until_they_are_written(self, df):
+        store = ColumnStore.from_dataframe(df)
+        snap = store.snapshot([C.COL_IN, C.COL_DIALOGO, C.COL_PERSONAJE])
+        assert np.shares_memory(snap.column(C.COL_PERSONAJE), store.column(C.COL_PERSONAJE))
+
+        store.set(0, C.COL_DIALOGO, "Cambiado")
+        store.move(2, 0)
+        # PERSONAJE no se ha escrito: se sigue compartiendo
+        assert np.shares_memory(snap.column(C.COL_PERSONAJE), store._text[C.COL_PERSONAJE])
+        store.insert(0, store.row(1))
+
+        assert snap.version < store.version
+        assert snap.column(C.COL_DIALOGO).tolist() == ["Hola", "Adiós", ""]
+        assert snap.column(C.COL_IN).tolist() == ["00:00:01:00", "00:00:02:10", "bad"]
+        assert snap.column(C.COL_PERSONAJE).tolist() == ["ANA", "", "JON"]
+
+    def test_slots_are_stable_keys_until_the_epoch_changes(self, df):
+        store = ColumnStore.from_dataframe(df)
+        slots = store.slots_of(np.array([0, 2]))
+        epoch = store.slot_epoch
+
+        store.move(0, 2)
+        store.insert(0, store.row(1))
+        assert store.slot_epoch == epoch
+        assert store.rows_of_slots(slots).tolist() == [3, 2]
+
+        store.remove(3)
+        assert store.rows_of_slots(slots).tolist() == [-1, 2]
+        store.compact()
+        assert store.slot_epoch != epoch
+
+    def test_removing_trailing_rows_keeps_slot_keys(self, df):
+        store = ColumnStore.from_dataframe(df)
+        epoch = store.slot_epoch
+        removed_slot = store.slots_of(np.array([2]))
+
+        store.remove_block(1, 3)
+        assert store.slot_epoch == epoch and store._is_compact
+        store.insert(1, store.row(0))
+        # La fila nueva no reutiliza los huecos liberados: siguen sin corresponder a ninguna fila
+        assert store.rows_of_slots(removed_slot).tolist() == [-1]
+        assert store.slot_epoch == epoch
+        assert store.to_dataframe()[C.COL_PERSONAJE].tolist() == ["ANA", "ANA"]
+
+    def test_id_index_follows_inserts_removes_and_moves(self, df):
+        store = ColumnStore.from_dataframe(df)
+        assert store.next_id() == 2
+        assert store.row_of_id(1) == 1
+
+        row = store.row(0)
+        row[C.COL_ID] = store.next_id()
+        store.insert(0, row)
+        assert store.row_of_id(2) == 0
+        assert store.row_of_id(0) == 1
+        assert store.next_id() == 3
+
+        store.move(0, 3)
+        assert [store.row_of_id(i) for i in (0, 1, 2)] == [0, 1, 3]
+
+        store.remove(3)
+        assert store.row_of_id(2) is None
+        # El contador es monótono: no reutiliza IDs de filas borradas
+        assert store.next_id() == 3
+
+        store.set(0, C.COL_ID, 7)
+        store.set_column(C.COL_ID, [8], np.array([2]))
+        assert store.row_of_id(0) is None and store.row_of_id(1) == 1
+        assert [store.row_of_id(i) for i in (7, 8)] == [0, 2]
+        assert store.next_id() == 9
+
+    def test_duplicate_ids_resolve_to_the_first_row_like_a_reload(self, df):
+        store = ColumnStore.from_dataframe(df)
+        store.set(2, C.COL_ID, 1)
+        assert store.row_of_id(1) == 1
+
+        store.move(2, 0)
+        assert store.row_of_id(1) == 0
+        store.set(0, C.COL_ID, 4)
+        assert store.row_of_id(1) == 2
+        store.set_column(C.COL_ID, [1], np.array([1]))
+        assert store.row_of_id(1) == 1
+        store.remove(1)
+
+        reloaded = ColumnStore.from_dataframe(store.to_dataframe())
+        assert [store.row_of_id(i) for i in (0, 1, 4)] == [reloaded.row_of_id(i) for i in (0, 1, 4)] == [None, 1, 0]
+
+    def test_character_counts_follow_edits_inserts_and_removes(self, df):
+        store = ColumnStore.from_dataframe(df)
+        assert store.character_counts() == {"ANA": 1, "": 1, "JON": 1}
+
+        store.set(1, C.COL_PERSONAJE, "JON")
+        row = store.row(0)
+        store.insert_block(0, [row, dict(row)])
+        store.set_column(C.COL_PERSONAJE, ["MIREN", "JON"], np.array([3, 4]))
+        assert store.character_counts() == {"ANA": 3, "JON": 1, "MIREN": 1}
+        # Las celdas con el mismo nombre comparten la cadena internada
+        assert store.get(0, C.COL_PERSONAJE) is store.get(2, C.COL_PERSONAJE)
+
+        store.remove_block(0, 2)
+        store.compact()
+        assert store.character_counts() == {"ANA": 1, "JON": 1, "MIREN": 1}
+        assert store.column(C.COL_PERSONAJE).tolist() == ["ANA", "MIREN", "JON"]
+
+    def test_set_column_on_subset_bumps_version(self, df):
+        store = ColumnStore.from_dataframe(df)
+        version = store.version
+        store.set_column(C.COL_OUT, "00:00:00:00", [0, 2])
+
+        assert store.version > version
+        assert store.column(C.COL_OUT).tolist() == ["00:00:00:00", "00:00:03:00", "00:00:00:00"]
+        assert store.frames(C.COL_OUT).tolist() == [0, 75, 0]
+
+    @pytest.mark.parametrize("tc, expected", [
+        ("00:00:00:00", 0),
+        ("01:00:00:01", 90001),
+        ("00:60:00:00", INVALID_FRAMES),
+        ("00:00:00", INVALID_FRAMES),
+        ("aa:00:00:00", INVALID_FRAMES),
+    ])
+    def test_parse_tc_to_frames(self, tc, expected):
+        assert parse_tc_to_frames(tc) == expected
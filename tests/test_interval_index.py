@@ -0,0 +1,91 @@
+import numpy as np
+
+from guion_editor.models.interval_index import IntervalIndex
+
+
+def brute_force(starts, ends, position):
+    return sorted(r for r, (s, e) in enumerate(zip(starts, ends)) if 0 <= s <= position < e)
+
+
+def test_active_rows_include_overlapping_interventions():
+    index = IntervalIndex()
+    starts = np.array([0, 1000, 1500, -1, 4000, 1200])
+    ends = np.array([5000, 2000, 1600, 3000, 4500, 1100])  # la fila 3 no es válida y la 5 acaba antes de empezar
+    index.rebuild(starts, ends)
+
+    assert len(index) == 4
+    assert index.active_rows(1550).tolist() == [0, 1, 2]
+    assert index.latest_active_row(1550) == 2
+    assert index.latest_active_row(4200) == 4
+    assert index.active_rows(6000).tolist() == []
+    assert index.latest_active_row(-5) == -1
+
+
+def test_update_rows_matches_a_full_rebuild():
+    rng = np.random.default_rng(1)
+    starts = rng.integers(0, 10_000, 300)
+    ends = starts + rng.integers(-50, 800, 300)
+    index = IntervalIndex()
+    index.rebuild(starts, ends)
+
+    rows = np.array([3, 10, 150, 299])
+    starts[rows] = [20, 9_000, -1, 20]
+    ends[rows] = [5_000, 9_500, 100, 10]
+    index.update_rows(rows, starts[rows], ends[rows])
+
+    rebuilt = IntervalIndex()
+    rebuilt.rebuild(starts, ends)
+    assert index.rows.tolist() == rebuilt.rows.tolist()
+    for position in range(0, 11_000, 97):
+        assert sorted(index.active_rows(position).tolist()) == brute_force(starts, ends, position)
+
+
+def test_active_span_reports_when_the_active_set_changes():
+    index = IntervalIndex()
+    index.rebuild(np.array([0, 1000, 3000]), np.array([2000, 1500, 4000]))
+
+    rows, until = index.active_span(1200)
+    assert rows.tolist() == [0, 1] and until == 1500
+    rows, until = index.active_span(2500)
+    assert rows.tolist() == [] and until == 3000
+    rows, until = index.active_span(3500)
+    assert rows.tolist() == [2] and until == 4000
+
+
+def test_latest_active_row_with_a_long_interval():
+    # La fila 0 dura todo el guion: el resto sigue resolviéndose sin recorrer las anteriores
+    starts = np.arange(0, 50_000, 10)
+    ends = starts + 5
+    ends[0] = 1_000_000
+    ends[300] = 4_000
+    index = IntervalIndex()
+    index.rebuild(starts, ends)
+
+    assert index.latest_active_row(1002) == 100
+    assert index.latest_active_row(1007) == 0
+    assert index.latest_active_row(3_010) == 301
+    # La 301 ya terminó; de las activas (0 y 300), la que acaba más tarde
+    assert index.latest_active_row(3_017) == 0
+    assert index.latest_active_row(3_000) == 300
+    rows, until = index.active_span(3_017)
+    assert rows.tolist() == [0, 300] and until == 3_020
+
+
+def test_single_row_edits_move_only_their_entry():
+    rng = np.random.default_rng(3)
+    starts = rng.integers(0, 100_000, 2_000)
+    ends = starts + rng.integers(1, 5_000, 2_000)
+    ends[7] = 10**9
+    index = IntervalIndex()
+    index.rebuild(starts, ends)
+
+    for row in rng.integers(0, 2_000, 200).tolist():
+        starts[row] = rng.integers(0, 100_000)
+        ends[row] = starts[row] + rng.integers(1, 5_000)
+        index.update_rows(np.array([row]), starts[[row]], ends[[row]])
+    rebuilt = IntervalIndex()
+    rebuilt.rebuild(starts, ends)
+    assert index.rows.tolist() == rebuilt.rows.tolist()
+    assert index._max_ends.tolist() == rebuilt._max_ends.tolist()
+    for position in range(0, 110_000, 997):
+        assert index.latest_active_row(position) == rebuilt.latest_active_row(position)
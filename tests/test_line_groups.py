@@ -0,0 +1,49 @@
+import numpy as np
+
+from guion_editor.models.line_groups import LineGroupIndex
+
+A = ("00:00:01:00", "00:00:02:00")
+B = ("00:00:03:00", "00:00:04:00")
+
+
+class TestLineGroupIndex:
+    def build(self):
+        index = LineGroupIndex()
+        index.rebuild(0, np.array([0, 1, 2]), np.array([A[0], A[0], B[0]]), np.array([A[1], A[1], B[1]]))
+        return index
+
+    def test_rebuild_keeps_nothing_dirty_until_marked(self):
+        index = self.build()
+        assert len(index) == 2
+        assert not index.has_dirty()
+        index.mark_all_dirty()
+        dirty = index.take_dirty()
+        assert sorted(dirty[A].tolist()) == [0, 1]
+        assert dirty[B].tolist() == [2]
+        assert not index.has_dirty()
+
+    def test_moving_a_row_dirties_old_and_new_group(self):
+        index = self.build()
+        index.discard([1], [A[0]], [A[1]])
+        index.add([1], [B[0]], [B[1]])
+        dirty = index.take_dirty()
+        assert dirty[A].tolist() == [0]
+        assert sorted(dirty[B].tolist()) == [1, 2]
+
+    def test_emptied_group_is_reported_without_rows(self):
+        index = self.build()
+        index.discard([2], [B[0]], [B[1]])
+        index.mark_dirty([A[0]], [A[1]])
+        dirty = index.take_dirty()
+        assert len(index) == 1
+        assert dirty[B].size == 0
+        assert sorted(dirty[A].tolist()) == [0, 1]
+
+    def test_remap_translates_slots_after_compaction(self):
+        index = self.build()
+        index.remap(1, np.array([2, 0, 1, -1]))
+        assert index.epoch == 1 and not index.has_dirty()
+        index.mark_all_dirty()
+        dirty = index.take_dirty()
+        assert sorted(dirty[A].tolist()) == [0, 2]
+        assert dirty[B].tolist() == [1]
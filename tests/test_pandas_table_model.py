@@ -0,0 +1,158 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from guion_editor import constants as C  # noqa: E402
+from guion_editor.commands.undo_commands import BulkColumnEditCommand  # noqa: E402
+from guion_editor.models.pandas_table_model import FETCH_CHUNK_ROWS, LAZY_FETCH_MIN_ROWS, PandasTableModel  # noqa: E402
+
+# Mismo mapeo vista -> columna que TableWindow (sin importar los widgets, que arrastran QtMultimedia)
+VIEW_TO_DF_COL_MAP = {
+    C.VIEW_COL_NUM_INTERV: C.ROW_NUMBER_COL_IDENTIFIER, C.VIEW_COL_ID: C.COL_ID,
+    C.VIEW_COL_SCENE: C.COL_SCENE, C.VIEW_COL_IN: C.COL_IN, C.VIEW_COL_OUT: C.COL_OUT,
+    C.VIEW_COL_DURATION: C.DURATION_COL_IDENTIFIER, C.VIEW_COL_CHARACTER: C.COL_PERSONAJE,
+    C.VIEW_COL_DIALOGUE: C.COL_DIALOGO, C.VIEW_COL_EUSKERA: C.COL_EUSKERA,
+    C.VIEW_COL_OHARRAK: C.COL_OHARRAK, C.VIEW_COL_BOOKMARK: C.COL_BOOKMARK
+}
+
+
+def make_df(num_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        C.COL_ID: range(num_rows),
+        C.COL_SCENE: ["1"] * num_rows,
+        C.COL_IN: [f"00:00:{i % 60:02d}:00" for i in range(num_rows)],
+        C.COL_OUT: [f"00:00:{i % 60:02d}:10" for i in range(num_rows)],
+        C.COL_PERSONAJE: ["ANA" if i % 2 else "JON" for i in range(num_rows)],
+        C.COL_DIALOGO: [f"Frase {i}" for i in range(num_rows)],
+    })
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def model(app):
+    model = PandasTableModel(VIEW_TO_DF_COL_MAP, C.VIEW_COLUMN_NAMES)
+    yield model
+    model.cleanup()
+
+
+def test_time_cells_accept_every_timecode_the_parser_accepts(model):
+    model.set_dataframe(make_df(3))
+    assert model.set_cell_data(0, C.VIEW_COL_IN, "100:00:00:05")
+    assert model.get_value(0, C.COL_IN) == "100:00:00:05"
+    assert model.get_time_ms(C.COL_IN)[0] == 360_000_200
+    assert not model.set_cell_data(1, C.VIEW_COL_IN, "00:60:00:00")
+    assert not model.set_cell_data(1, C.VIEW_COL_OUT, "1:2:3")
+    assert model.get_value(1, C.COL_IN) == "00:00:01:00"
+
+
+class TestLazyFetch:
+    @pytest.fixture
+    def lazy(self, model):
+        model.set_dataframe(make_df(LAZY_FETCH_MIN_ROWS + 1000))
+        self.inserted, self.removed = [], []
+        model.rowsInserted.connect(lambda parent, first, last: self.inserted.append((first, last)))
+        model.rowsRemoved.connect(lambda parent, first, last: self.removed.append((first, last)))
+        return model
+
+    def test_rows_are_exposed_in_chunks(self, lazy):
+        total = LAZY_FETCH_MIN_ROWS + 1000
+        assert lazy.rowCount() == FETCH_CHUNK_ROWS and lazy.df_row_count() == total
+        assert lazy.canFetchMore()
+
+        lazy.fetchMore()
+        assert self.inserted == [(FETCH_CHUNK_ROWS, 2 * FETCH_CHUNK_ROWS - 1)]
+        lazy.ensure_rows_fetched(total - 2)
+        assert lazy.rowCount() == total and not lazy.canFetchMore()
+
+    def test_inserts_past_the_fetched_rows_wait_for_fetch_more(self, lazy):
+        assert lazy.insert_rows([3000], [{C.COL_DIALOGO: "Nueva"}])
+        assert self.inserted == [] and lazy.rowCount() == FETCH_CHUNK_ROWS
+        assert lazy.get_value(3000, C.COL_DIALOGO) == "Nueva"
+
+        assert lazy.insert_rows([500], [{C.COL_DIALOGO: "Visible"}])
+        assert self.inserted == [(500, 500)] and lazy.rowCount() == FETCH_CHUNK_ROWS + 1
+        assert lazy.get_value(3001, C.COL_DIALOGO) == "Nueva"
+
+    def test_removing_across_the_fetched_boundary(self, lazy):
+        total = lazy.df_row_count()
+        lazy.remove_rows(list(range(990, 1011)))
+        # Solo se notifican las filas que la vista conocía
+        assert self.removed == [(990, 999)]
+        assert lazy.rowCount() == 990 and lazy.df_row_count() == total - 21
+        assert lazy.get_value(990, C.COL_DIALOGO) == "Frase 1011"
+
+    def test_removing_every_fetched_row_keeps_the_rest(self, lazy):
+        lazy.remove_rows(list(range(FETCH_CHUNK_ROWS)))
+        assert lazy.rowCount() == 0 and lazy.df_row_count() == LAZY_FETCH_MIN_ROWS
+        assert lazy.canFetchMore()
+        lazy.fetchMore()
+        assert lazy.get_value(0, C.COL_DIALOGO) == f"Frase {FETCH_CHUNK_ROWS}"
+
+
+def test_batch_changes_coalesces_contiguous_edits(model):
+    model.set_dataframe(make_df(20))
+    emitted = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles: emitted.append(
+        (top_left.row(), bottom_right.row(), top_left.column(), bottom_right.column())))
+
+    with model.batch_changes():
+        for row in [6, 2, 4, 3, 5]:
+            assert model.set_cell_data(row, C.VIEW_COL_DIALOGUE, f"Editada {row}")
+        assert model.set_cell_data(4, C.VIEW_COL_CHARACTER, "MIKEL")
+        assert emitted == []
+
+    # Un único rango: filas 2-6 con la unión de las columnas tocadas
+    assert emitted == [(2, 6, C.VIEW_COL_CHARACTER, C.VIEW_COL_DIALOGUE)]
+    assert model.get_value(6, C.COL_DIALOGO) == "Editada 6"
+
+
+class FakeTableWindow:
+    """Lo mínimo de TableWindow que usan los comandos de edición en bloque."""
+    def __init__(self, model):
+        self.pandas_model = model
+        self.unsaved = False
+        self.completer_updates = 0
+
+    def set_unsaved_changes(self, changed):
+        self.unsaved = changed
+
+    def update_character_completer_and_notify(self):
+        self.completer_updates += 1
+
+
+def test_bulk_column_edit_undo_restores_every_value(model):
+    model.set_dataframe(make_df(50))
+    tw = FakeTableWindow(model)
+    old_in = model.get_column_values(C.COL_IN).copy()
+    old_characters = model.get_column_values(C.COL_PERSONAJE).copy()
+    old_in_ms = model.get_time_ms(C.COL_IN).copy()
+
+    new_in = old_in.copy()
+    new_in[10:20] = "01:00:00:00"
+    new_characters = old_characters.copy()
+    new_characters[::7] = "MIKEL"
+    command = BulkColumnEditCommand.from_new_values(
+        tw, {C.COL_IN: new_in, C.COL_PERSONAJE: new_characters, C.COL_DIALOGO: model.get_column_values(C.COL_DIALOGO)},
+        "Edición en bloque")
+    # Las columnas sin cambios no se guardan
+    assert set(command.changes) == {C.COL_IN, C.COL_PERSONAJE}
+
+    command.redo()
+    assert np.array_equal(model.get_column_values(C.COL_IN), new_in)
+    assert np.array_equal(model.get_column_values(C.COL_PERSONAJE), new_characters)
+    assert model.get_time_ms(C.COL_IN)[10] == 3_600_000
+
+    command.undo()
+    assert np.array_equal(model.get_column_values(C.COL_IN), old_in)
+    assert np.array_equal(model.get_column_values(C.COL_PERSONAJE), old_characters)
+    assert np.array_equal(model.get_time_ms(C.COL_IN), old_in_ms)
+    assert tw.unsaved and tw.completer_updates == 2
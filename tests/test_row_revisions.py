@@ -0,0 +1,35 @@
+import numpy as np
+
+from guion_editor.models.row_revisions import RowRevisions
+
+
+def test_changed_since_returns_only_rows_touched_after_the_revision():
+    revisions = RowRevisions()
+    revisions.reset(5)
+    start = revisions.revision
+    assert revisions.changed_since(start).tolist() == []
+
+    revisions.touch(np.array([3]))
+    middle = revisions.revision
+    revisions.touch(np.array([1, 4]))
+    assert revisions.changed_since(start).tolist() == [1, 3, 4]
+    assert revisions.changed_since(middle).tolist() == [1, 4]
+    assert revisions[4] == revisions.revision
+
+
+def test_structural_changes_invalidate_older_revisions():
+    revisions = RowRevisions()
+    revisions.reset(4)
+    before = revisions.revision
+
+    revisions.insert(1, 2)
+    assert revisions.changed_since(before) is None
+    after_insert = revisions.revision
+    revisions.touch(np.array([0]))
+    assert revisions.changed_since(after_insert).tolist() == [0]
+
+    revisions.move(0, 2)
+    assert revisions.changed_since(after_insert) is None
+    revisions.remove(0, 1)
+    assert len(revisions) == 5
+    assert revisions.changed_since(revisions.revision).tolist() == []
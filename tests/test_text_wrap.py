@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from guion_editor.utils.text_wrap import (
+    PARENS_AS_ONE, PARENS_IGNORED, PARENS_LITERAL, count_lines_many, wrap_lines, wrap_many, wrap_text
+)
+
+
+@pytest.mark.parametrize("parens, expected", [
+    # La acotación y su espacio previo no cuentan: "uno dos (se ríe) tres" mide 13
+    (PARENS_IGNORED, ("uno dos (se ríe) tres", "cuatro")),
+    # La acotación cuenta como un carácter: "uno dos (se ríe)" mide 9
+    (PARENS_AS_ONE, ("uno dos (se ríe)", "tres cuatro")),
+    (PARENS_LITERAL, ("uno dos (se", "ríe) tres", "cuatro")),
+])
+def test_parenthetical_rules(parens, expected):
+    assert wrap_lines("uno dos (se ríe) tres cuatro", 13, parens) == expected
+
+
+def test_parenthetical_split_across_lines_counts_in_full():
+    # El '(' queda en una línea y el ')' en la siguiente: ninguna de las dos lo descuenta
+    assert wrap_lines("aa (b cccccc dd)", 6) == ("aa (b", "cccccc", "dd)")
+    assert wrap_lines("aa (b cc) dd", 6) == ("aa (b cc) dd",)
+
+
+def test_wrap_text_normalizes_whitespace_and_keeps_long_words():
+    assert wrap_text("  hola\n\tmundo  ", 60) == "hola mundo"
+    assert wrap_text("a palabrademasiadolarga b", 5) == "a\npalabrademasiadolarga\nb"
+    assert wrap_text(None, 10) == ""
+
+
+def test_batch_api_matches_scalar_wrap():
+    texts = pd.Series(["uno dos tres", "", None, "uno dos tres", "(ríe) sí"], dtype=object)
+    wrapped = wrap_many(texts, 7)
+
+    assert wrapped.tolist() == ["uno dos\ntres", "", "", "uno dos\ntres", "(ríe) sí"]
+    assert count_lines_many(texts, 7).tolist() == [2, 0, 0, 2, 1]
+    assert wrap_many([], 7).dtype == object and count_lines_many(np.array([], dtype=object), 7).size == 0
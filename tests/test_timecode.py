@@ -0,0 +1,59 @@
+import math
+
+import numpy as np
+import pytest
+
+from guion_editor.utils.timecode import (
+    INVALID_FRAMES, INVALID_MS, frames_to_tc, frames_to_tc_array, ms_to_srt, ms_to_tc,
+    parse_tc, parse_tc_array, tc_array_to_seconds, tc_to_frames, tc_to_seconds
+)
+
+VALUES = [
+    "00:00:01:05",
+    " 01:02:03:04 ",   # espacios alrededor: válido, por el camino escalar
+    "100:00:00:00",    # horas de 3 cifras: válido, por el camino escalar
+    "00:60:00:00",
+    "00:00:00",
+    "00: 00:00:00",    # espacio dentro de un campo: inválido
+    "ab:cd:ef:gh",
+    "",
+    None,
+    12.5,
+]
+
+
+def test_array_matches_scalar():
+    frames, ms = parse_tc_array(VALUES)
+    assert list(zip(frames.tolist(), ms.tolist())) == [parse_tc(v) for v in VALUES]
+    assert frames.tolist()[:4] == [30, (3723 * 25) + 4, 100 * 3600 * 25, INVALID_FRAMES]
+    assert ms[0] == 1200 and ms[3] == INVALID_MS
+
+
+def test_seconds_array_uses_nan_for_invalid():
+    seconds = tc_array_to_seconds(VALUES)
+    for value, got in zip(VALUES, seconds.tolist()):
+        expected = tc_to_seconds(value)
+        assert math.isnan(got) if expected is None else got == expected
+
+
+@pytest.mark.parametrize("frames", [0, 24, 25, 89999, 90000, 8_999_999, 100 * 3600 * 25 + 5])
+def test_frames_round_trip(frames):
+    tc = frames_to_tc(frames)
+    assert tc_to_frames(tc) == frames
+    assert frames_to_tc_array(np.array([frames]))[0] == tc
+
+
+def test_ms_formatting():
+    assert ms_to_tc(3_723_160) == "01:02:03:04"
+    assert ms_to_tc(999) == "00:00:00:24"   # el frame nunca llega a 25
+    assert ms_to_srt(3_723_160) == "01:02:03,160"
+    assert ms_to_srt(INVALID_MS) == "00:00:00,000"
+    assert frames_to_tc(-5) == "00:00:00:00"
+
+
+def test_shifting_past_99_hours_stays_parseable():
+    frames, _ = parse_tc_array(["99:59:59:24"])
+    shifted = frames_to_tc_array(frames + 6)
+    assert shifted.tolist() == ["100:00:00:05"]
+    assert parse_tc_array(shifted)[0].tolist() == [frames[0] + 6]
+    assert tc_to_frames(ms_to_tc(360_000_200)) == 100 * 3600 * 25 + 5
@@ -0,0 +1,100 @@
+import numpy as np
+
+from guion_editor.models.column_store import INVALID_MS
+from guion_editor.models.validation_status import (
+    FLAG_BOOKMARK, FLAG_SEARCH_HIT, FLAG_TIME_ERROR, MSG_BOTH_TIMES_ZERO, MSG_EMPTY_SCENE, MSG_INVALID_TIME_FORMAT,
+    RowFlagArray, ValidationStatusArray, validate_line_limits, validate_scenes, validate_times,
+)
+
+
+def test_status_array_shifts_on_insert_and_remove():
+    status = ValidationStatusArray(5)
+    status.set(1, "Error A")
+    status.set(3, "Error A")
+    status.set(4, "Error B")
+    assert status.error_rows().tolist() == [1, 3, 4]
+
+    status.insert(2, 2)
+    assert len(status) == 7
+    assert status.error_rows().tolist() == [1, 5, 6]
+    assert status.get(5) == "Error A"
+    assert status.get(2) is True
+
+    status.remove(0, 2)
+    assert status.error_rows().tolist() == [3, 4]
+    assert status.get(4) == "Error B"
+    assert status.error_count() == 2
+
+    status.set(3, True)
+    assert status.is_valid(3)
+    assert status.get(99, "fuera") == "fuera"
+
+
+def test_validate_times_rules():
+    in_tc = np.array(["bad", "00:00:00:00", "00:00:05:00", "00:00:00:00", "00:00:01:00"], dtype=object)
+    out_tc = np.array(["00:00:01:00", "00:00:00:00", "00:00:04:00", "00:00:31:00", "00:00:02:00"], dtype=object)
+    in_ms = np.array([INVALID_MS, 0, 5000, 0, 1000])
+    out_ms = np.array([1000, 0, 4000, 31000, 2000])
+
+    rows, messages = validate_times(in_ms, out_ms, in_tc, out_tc)
+    assert rows.tolist() == [0, 1, 2, 3]
+    assert messages[0] == MSG_INVALID_TIME_FORMAT
+    assert messages[1] == MSG_BOTH_TIMES_ZERO
+    assert "OUT (00:00:04:00) es anterior a IN (00:00:05:00)" in messages[2]
+    assert "excede el máximo" in messages[3]
+
+
+def test_validate_scenes_and_assign_reports_changes():
+    rows, messages = validate_scenes(np.array(["1", " 2 ", "", "nan", "3b"], dtype=object))
+    assert rows.tolist() == [2, 3, 4]
+    assert messages[:2] == [MSG_EMPTY_SCENE, MSG_EMPTY_SCENE]
+
+    status = ValidationStatusArray(5)
+    assert status.assign(None, rows, messages).tolist() == [2, 3, 4]
+    assert status.assign(None, rows, messages).tolist() == []
+    assert status.assign(np.array([3, 4]), np.array([1]), [messages[2]]).tolist() == [3]
+
+
+def test_validate_line_limits_per_character_and_per_group():
+    four, three, two = "a\nb\nc\nd", "a\nb\nc", "a\nb"
+    groups = np.array([0, 0, 0, 1, 1, 1, 1, 2])
+    characters = np.array(["ANA", "ANA", "JON", "ANA", "JON", "MIREN", "PELLO", "ANA"], dtype=object)
+    texts = np.array([four, two, "x", three, three, three, two, "   "], dtype=object)
+
+    errors = validate_line_limits(groups, characters, texts)
+    # Grupo 0: ANA llega a 6 líneas (solo sus filas). Grupo 1: 11 líneas en total. Grupo 2: texto vacío
+    assert errors.tolist() == [True, True, False, True, True, True, True, False]
+    assert validate_line_limits(np.zeros(0), np.zeros(0), np.zeros(0)).size == 0
+
+
+def test_row_flags_follow_row_edits():
+    flags = RowFlagArray(4)
+    flags.assign(FLAG_BOOKMARK, np.array([True, False, False, True]))
+    flags.assign(FLAG_TIME_ERROR, np.array([True]), np.array([1]))
+    flags.move(3, 0)
+    flags.insert(1, 1)
+    flags.remove(4, 5)
+
+    assert flags.rows_with(FLAG_BOOKMARK).tolist() == [0, 2]
+    assert flags.rows_with(FLAG_TIME_ERROR).tolist() == [3]
+    assert flags[2] == FLAG_BOOKMARK
+
+
+def test_row_flags_count_and_next_row_stay_in_sync_with_row_edits():
+    flags = RowFlagArray(6)
+    flags.assign(FLAG_BOOKMARK, np.array([False, True, False, False, True, False]))
+    flags.assign(FLAG_SEARCH_HIT, np.array([True, True]), np.array([1, 3]))
+    assert flags.next_row(FLAG_BOOKMARK, 1) == 4
+    assert flags.next_row(FLAG_BOOKMARK, 4) == 1  # da la vuelta
+    assert flags.next_row(FLAG_SEARCH_HIT, -1, backwards=True) == 3
+
+    flags.insert(2, 2)
+    flags.move(0, 7)
+    flags.remove(4, 5)
+    expected = [np.flatnonzero(flags._flags & mask).tolist() for mask in (FLAG_BOOKMARK, FLAG_SEARCH_HIT)]
+    assert flags.rows_with(FLAG_BOOKMARK).tolist() == expected[0] == [0, 4]
+    assert flags.rows_with(FLAG_SEARCH_HIT).tolist() == expected[1] == [0]
+    assert flags.count(FLAG_BOOKMARK | FLAG_SEARCH_HIT) == 2
+    assert flags.count(FLAG_TIME_ERROR) == 0
+    assert flags.next_row(FLAG_BOOKMARK, 0) == 4
+    assert flags.next_row(FLAG_BOOKMARK, 2, backwards=True) == 0
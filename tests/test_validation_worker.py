@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from guion_editor import constants_logic as C
+from guion_editor.models.column_store import ColumnStore
+from guion_editor.workers.validation_worker import ValidationJob, ValidationWorker
+
+GROUP = ("00:00:01:00", "00:00:02:00")
+
+
+def make_job(generation, dialogo):
+    store = ColumnStore.from_dataframe(pd.DataFrame({
+        C.COL_IN: [GROUP[0]] * 2 + [C.DEFAULT_TIMECODE],
+        C.COL_OUT: [GROUP[1]] * 2 + [C.DEFAULT_TIMECODE],
+        C.COL_PERSONAJE: ["ANA", "ANA", "ANA"],
+        C.COL_DIALOGO: dialogo,
+        C.COL_EUSKERA: ["", "", ""],
+    }))
+    snapshot = store.snapshot(ValidationWorker.REQUIRED_COLUMNS)
+    groups = {GROUP: np.array([0, 1]), (C.DEFAULT_TIMECODE, C.DEFAULT_TIMECODE): np.array([2])}
+    return ValidationJob(generation, snapshot, groups)
+
+
+def collect(worker):
+    results = []
+    worker.validation_finished.connect(lambda job, slots, dlg, eus: results.append((job.generation, slots, dlg, eus)))
+    return results
+
+
+def test_queued_jobs_collapse_to_the_latest():
+    worker = ValidationWorker()
+    results = collect(worker)
+    worker.submit(make_job(1, ["a", "b", "c"]))
+    worker.submit(make_job(2, ["a\nb\nc", "d\ne\nf", "a\nb\nc\nd\ne\nf"]))
+    worker.run_pending()
+    worker.run_pending()
+
+    assert len(results) == 1
+    generation, slots, dialogo_errors, euskera_errors = results[0]
+    assert generation == 2
+    # La fila sin tiempos nunca tiene error, aunque supere el límite
+    assert dict(zip(slots.tolist(), dialogo_errors.tolist())) == {0: True, 1: True, 2: False}
+    assert not euskera_errors.any()
+
+
+def test_cancelled_job_emits_nothing():
+    worker = ValidationWorker()
+    results = collect(worker)
+    job = make_job(1, ["a", "b", "c"])
+    worker.submit(job)
+    job.cancel()
+    worker.run_pending()
+    assert results == []